@@ -0,0 +1,61 @@
+"""Compare the latency of small `find_unique()` queries when connecting to the query engine over TCP and a unix socket.
+
+Usage: python benchmarks/engine_transport.py [--iterations N] [--warmup N]
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import argparse
+import statistics
+from typing import List
+
+from prisma import Prisma
+from prisma.types import EngineTransport
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def measure(transport: EngineTransport, *, iterations: int, warmup: int) -> List[float]:
+    client = Prisma(engine_transport=transport)
+    await client.connect()
+    try:
+        user = await client.user.create(data={'name': 'Robert'})
+
+        for _ in range(warmup):
+            await client.user.find_unique(where={'id': user.id})
+
+        samples: List[float] = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await client.user.find_unique(where={'id': user.id})
+            samples.append((time.perf_counter() - start) * 1000)
+
+        await client.user.delete(where={'id': user.id})
+        return samples
+    finally:
+        await client.disconnect()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--warmup', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f'{"transport":<10} {"p50 (ms)":>10} {"p99 (ms)":>10} {"mean (ms)":>10}')
+    for transport in ('tcp', 'uds'):
+        samples = await measure(transport, iterations=args.iterations, warmup=args.warmup)
+        print(
+            f'{transport:<10} {percentile(samples, 50):>10.3f} {percentile(samples, 99):>10.3f} '
+            f'{statistics.mean(samples):>10.3f}'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Compare the time it takes to create models from a large `find_many()` result with and without pydantic validation.
+
+The query engine is not used, the results are generated so that only the time spent creating the models is measured.
+Models are created with `model_parse()`, the hydrator that is built at runtime and the hydrator that is generated
+for the model. The difference is much larger with pydantic v1 as pydantic v2 validates the data in Rust.
+
+Usage: python benchmarks/hydration.py [--rows N] [--posts N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import time
+import argparse
+import statistics
+from typing import Any, Dict, List, Callable, cast
+
+from pydantic.version import VERSION as PYDANTIC_VERSION
+
+from prisma.models import User
+from prisma._compat import model_parse
+from prisma.hydrators import HYDRATORS
+from prisma._hydration import get_hydrator
+
+
+def generate(*, rows: int, posts: int) -> List[Dict[str, Any]]:
+    """Generate the result of `find_many(include={'posts': {'include': {'categories': True}}, 'profile': True})`"""
+    return [
+        {
+            'id': f'user{index}',
+            'name': f'User {index}',
+            'email': f'user{index}@example.com',
+            'created_at': '2022-11-10T16:53:25.584Z',
+            'profile': {
+                'id': index,
+                'user_id': f'user{index}',
+                'bio': 'Hello!',
+                'city': None,
+                'country': 'Scotland',
+                'views': index,
+            },
+            'posts': [
+                {
+                    'id': f'post{index}-{post}',
+                    'created_at': '2022-11-10T16:53:25.584Z',
+                    'updated_at': '2022-11-10T16:53:25.584Z',
+                    'title': 'My first post',
+                    'published': post % 2 == 0,
+                    'views': post,
+                    'desc': None,
+                    'author_id': f'user{index}',
+                    'categories': [
+                        {'id': post, 'name': 'Python'},
+                        {'id': post + 1, 'name': 'Databases'},
+                    ],
+                }
+                for post in range(posts)
+            ],
+        }
+        for index in range(rows)
+    ]
+
+
+def measure(parse: Callable[[Any], User], results: List[Dict[str, Any]], *, repeat: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for result in results:
+            parse(result)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--posts', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = generate(rows=args.rows, posts=args.posts)
+    parsers: Dict[str, Callable[[Any], User]] = {
+        'validated': lambda data: model_parse(User, data),
+        'runtime': get_hydrator(User),
+        'generated': cast(Callable[[Any], User], HYDRATORS[User]),
+    }
+    for parse in parsers.values():
+        assert parse(results[0]) == parsers['validated'](results[0])
+
+    means: Dict[str, float] = {}
+    print(f'{"mode":<10} {"min (ms)":>10} {"mean (ms)":>10}')
+    for name, parse in parsers.items():
+        samples = measure(parse, results, repeat=args.repeat)
+        means[name] = statistics.mean(samples)
+        print(f'{name:<10} {min(samples):>10.1f} {means[name]:>10.1f}')
+
+    print(f'\npydantic {PYDANTIC_VERSION}')
+    for name in ('runtime', 'generated'):
+        print(f'{name} speedup: {means["validated"] / means[name]:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Compare the CPU time and memory used by eager models and lazy records when only a few fields are accessed.
+
+The query engine is not used, the results are generated for a model with 30 fields so that only the time
+spent creating the records and accessing two of their fields is measured.
+
+Usage: python benchmarks/lazy_records.py [--rows N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import gc
+import time
+import argparse
+import datetime
+import statistics
+import tracemalloc
+from typing import Any, Dict, List, Callable, Optional
+
+from pydantic import BaseModel, create_model
+
+from prisma._compat import model_parse
+from prisma._records import get_record_class
+
+FIELDS = 30
+
+Record = create_model(  # type: ignore
+    'Record',
+    id=(str, ...),
+    name=(str, ...),
+    created_at=(datetime.datetime, ...),
+    updated_at=(Optional[datetime.datetime], None),
+    **{f'string_{index}': (str, ...) for index in range(10)},
+    **{f'int_{index}': (int, ...) for index in range(8)},
+    **{f'float_{index}': (float, ...) for index in range(5)},
+    **{f'bool_{index}': (bool, ...) for index in range(FIELDS - 26)},
+)
+
+
+def generate(rows: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': f'record{row}',
+            'name': f'Record {row}',
+            'created_at': '2022-11-10T16:53:25.584Z',
+            'updated_at': None,
+            **{f'string_{index}': f'value {row}-{index}' for index in range(10)},
+            **{f'int_{index}': row + index for index in range(8)},
+            **{f'float_{index}': row / (index + 1) for index in range(5)},
+            **{f'bool_{index}': bool((row + index) % 2) for index in range(FIELDS - 26)},
+        }
+        for row in range(rows)
+    ]
+
+
+def eager(data: Dict[str, Any]) -> Any:
+    return model_parse(Record, data)
+
+
+def lazy(data: Dict[str, Any]) -> Any:
+    return get_record_class(Record)(data)
+
+
+def measure_cpu(create: Callable[[Dict[str, Any]], Any], *, rows: int, repeat: int) -> List[float]:
+    """The time taken to create every record and access two of its fields, in microseconds per row"""
+    samples: List[float] = []
+    for _ in range(repeat):
+        results = generate(rows)
+        start = time.perf_counter()
+        for record in map(create, results):
+            record.id  # noqa: B018
+            record.name  # noqa: B018
+        samples.append((time.perf_counter() - start) * 1_000_000 / rows)
+    return samples
+
+
+def measure_memory(create: Callable[[Dict[str, Any]], Any], *, rows: int) -> float:
+    """The memory held by the records after two of their fields have been accessed, in bytes per row"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        # the decoded response is included as lazy records hold on to it
+        records = [create(data) for data in generate(rows)]
+        for record in records:
+            record.id  # noqa: B018
+            record.name  # noqa: B018
+
+        current, _ = tracemalloc.get_traced_memory()
+        return current / rows
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    modes: Dict[str, Callable[[Dict[str, Any]], BaseModel]] = {
+        'eager': eager,
+        'lazy': lazy,
+    }
+
+    print(f'{"mode":<10} {"min (us/row)":>14} {"mean (us/row)":>14} {"memory (B/row)":>15}')
+    for name, create in modes.items():
+        samples = measure_cpu(create, rows=args.rows, repeat=args.repeat)
+        memory = measure_memory(create, rows=args.rows)
+        print(f'{name:<10} {min(samples):>14.2f} {statistics.mean(samples):>14.2f} {memory:>15.0f}')
+
+
+if __name__ == '__main__':
+    main()
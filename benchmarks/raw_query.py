@@ -0,0 +1,120 @@
+"""Measure the time it takes to deserialize a large `query_raw()` result.
+
+The query engine is not used, a raw result with the same shape as the one returned by the query engine
+is generated so that only the time spent deserializing the rows is measured. The rows are deserialized
+into dictionaries, as `query_raw()` does without a model, and into models.
+
+Usage: python benchmarks/raw_query.py [--rows N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import time
+import argparse
+import statistics
+from typing import Any, Dict, List, Callable, Optional
+
+from pydantic import BaseModel
+
+from prisma.fields import Json
+from prisma._raw_query import deserialize_raw_results
+
+
+class Row(BaseModel):
+    id: str
+    name: str
+    views: int
+    rating: float
+    balance: float
+    total: int
+    published: bool
+    created_at: str
+    tags: List[str]
+    scores: List[int]
+    meta: Json
+    desc: Optional[str] = None
+
+
+COLUMNS = [
+    'id',
+    'name',
+    'views',
+    'rating',
+    'balance',
+    'total',
+    'published',
+    'created_at',
+    'tags',
+    'scores',
+    'meta',
+    'desc',
+]
+TYPES = [
+    'string',
+    'string',
+    'int',
+    'double',
+    'decimal',
+    'bigint',
+    'bool',
+    'datetime',
+    'string-array',
+    'bigint-array',
+    'json',
+    'string',
+]
+
+
+def generate(rows: int) -> Dict[str, Any]:
+    return {
+        'columns': COLUMNS,
+        'types': TYPES,
+        'rows': [
+            [
+                f'row{index}',
+                f'Row {index}',
+                index,
+                index / 3,
+                f'{index}.25',
+                str(2**40 + index),
+                index % 2 == 0,
+                '2022-11-10T16:53:25.584+00:00',
+                ['foo', 'bar'],
+                [str(index), str(index + 1)],
+                {'index': index},
+                None,
+            ]
+            for index in range(rows)
+        ],
+    }
+
+
+def measure(deserialize: Callable[[Dict[str, Any]], object], result: Dict[str, Any], *, repeat: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        deserialize(result)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    modes: Dict[str, Callable[[Dict[str, Any]], object]] = {
+        'dict': deserialize_raw_results,
+        'model': lambda result: deserialize_raw_results(result, Row),
+    }
+
+    result = generate(args.rows)
+    print(f'{"mode":<10} {"min (ms)":>10} {"mean (ms)":>10}')
+    for name, deserialize in modes.items():
+        samples = measure(deserialize, result, repeat=args.repeat)
+        print(f'{name:<10} {min(samples):>10.1f} {statistics.mean(samples):>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
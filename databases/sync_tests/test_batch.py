@@ -263,3 +263,82 @@ def test_create_many_skip_duplicates_unsupported(
             batcher.user.create_many([{'name': 'Robert'}], skip_duplicates=True)
 
     assert exc.match(r'skip_duplicates is not supported')
+
+
+def test_commit_results(client: Prisma) -> None:
+    """The result of every operation is returned in the order they were added"""
+    batcher = client.batch_()
+    created = batcher.user.create({'id': 'abc', 'name': 'Robert'})
+    batcher.user.create_many([{'name': 'Tegan'}, {'name': 'Tegan 2'}])
+    updated = batcher.user.update(where={'id': 'abc'}, data={'name': 'Roberto'})
+    count = batcher.user.update_many(where={'name': {'startswith': 'Tegan'}}, data={'name': 'Tegan'})
+
+    with pytest.raises(prisma.errors.BatchNotCommittedError):
+        created.result()
+
+    results = batcher.commit()
+    assert len(results) == 4
+    assert isinstance(results[0], prisma.models.User)
+    assert results[0].name == 'Robert'
+    assert results[1] == 2
+    assert isinstance(results[2], prisma.models.User)
+    assert results[2].name == 'Roberto'
+    assert results[3] == 2
+
+    assert created.result().id == 'abc'
+    assert updated.result().name == 'Roberto'
+    assert count.result() == 2
+    assert count.exception() is None
+
+
+def test_read_operations(client: Prisma) -> None:
+    """Read operations can be batched and see the writes made before them"""
+    client.user.create({'id': 'abc', 'name': 'Robert'})
+
+    with client.batch_() as batcher:
+        batcher.user.create({'name': 'Tegan'})
+        found = batcher.user.find_unique(where={'id': 'abc'})
+        missing = batcher.user.find_unique(where={'id': 'unknown'})
+        users = batcher.user.find_many(order={'name': 'asc'})
+        total = batcher.user.count()
+        counts = batcher.user.count(select={'_all': True, 'name': True})
+
+    user = found.result()
+    assert user is not None
+    assert user.name == 'Robert'
+    assert missing.result() is None
+    assert [u.name for u in users.result()] == ['Robert', 'Tegan']
+    assert total.result() == 2
+    assert counts.result() == {'_all': 2, 'name': 2}
+
+
+def test_non_transactional(client: Prisma) -> None:
+    """Errors only affect the query that caused them when the batch is not executed within a transaction"""
+    with client.batch_(transaction=False) as batcher:
+        first = batcher.user.create({'id': 'abc', 'name': 'Robert'})
+        second = batcher.user.create({'id': 'abc', 'name': 'Robert 2'})
+        other = batcher.user.create({'id': 'def', 'name': 'Tegan'})
+
+    # the queries may run concurrently so either of the conflicting queries could fail
+    failed = [op for op in (first, second) if op.exception() is not None]
+    assert len(failed) == 1
+    assert isinstance(failed[0].exception(), prisma.errors.UniqueViolationError)
+    with pytest.raises(prisma.errors.UniqueViolationError):
+        failed[0].result()
+
+    assert other.result().name == 'Tegan'
+    assert client.user.count() == 2
+
+
+def test_non_transactional_commit_results(client: Prisma) -> None:
+    """Queries that did not succeed are represented by their error"""
+    client.user.create({'id': 'abc', 'name': 'Robert'})
+
+    batcher = client.batch_(transaction=False)
+    batcher.user.create({'id': 'abc', 'name': 'Robert'})
+    batcher.user.create({'name': 'Tegan'})
+    error, user = batcher.commit()
+
+    assert isinstance(error, prisma.errors.UniqueViolationError)
+    assert isinstance(user, prisma.models.User)
+    assert user.name == 'Tegan'
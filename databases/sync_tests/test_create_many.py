@@ -1,4 +1,9 @@
-from prisma import Prisma
+from typing import List
+
+import pytest
+
+from prisma import Prisma, errors
+from prisma.types import CreateManyProgress
 
 
 def test_create_many(client: Prisma) -> None:
@@ -60,3 +65,33 @@ def test_required_relation_key_field(client: Prisma) -> None:
     assert found is not None
     assert found.profile is not None
     assert found.profile.description == 'Foo 2'
+
+
+def test_create_many_chunked(client: Prisma) -> None:
+    """Records from a generator can be created in multiple chunks concurrently"""
+    progress: List[CreateManyProgress] = []
+    total = client.user.create_many(
+        ({'name': f'User {i}'} for i in range(25)),
+        chunk_size=10,
+        concurrency=2,
+        on_progress=progress.append,
+    )
+    assert total == 25
+    assert client.user.count() == 25
+    assert [p.chunks for p in progress] == [1, 2, 3]
+    assert progress[-1].rows == 25
+    assert progress[-1].created == 25
+
+
+def test_create_many_chunked_transaction(client: Prisma) -> None:
+    """No records are created when a chunk fails within a transaction"""
+    user = client.user.create({'name': 'Robert'})
+
+    with pytest.raises(errors.UniqueViolationError):
+        client.user.create_many(
+            [{'name': 'Tegan'}, {'name': 'Alfie'}, {'id': user.id, 'name': 'Robert'}],
+            chunk_size=2,
+            transaction=True,
+        )
+
+    assert client.user.count() == 1
@@ -0,0 +1,52 @@
+import pytest
+
+from prisma import Prisma
+from prisma.types import UpsertManyResult
+
+
+def test_upsert_many(client: Prisma) -> None:
+    """Existing records are updated and missing records are created"""
+    client.user.create({'id': 'a', 'name': 'Robert'})
+
+    result = client.user.upsert_many(
+        [
+            {'id': 'a', 'name': 'Bob'},
+            {'id': 'b', 'name': 'Tegan'},
+            {'id': 'c', 'name': 'Alfie'},
+        ],
+        chunk_size=2,
+    )
+    assert result == UpsertManyResult(created=2, updated=1)
+
+    users = client.user.find_many(order={'id': 'asc'})
+    assert [(user.id, user.name) for user in users] == [('a', 'Bob'), ('b', 'Tegan'), ('c', 'Alfie')]
+
+
+def test_upsert_many_generator(client: Prisma) -> None:
+    """Records can be given by a generator"""
+    result = client.user.upsert_many(({'id': str(i), 'name': f'User {i}'} for i in range(5)), chunk_size=2)
+    assert result == UpsertManyResult(created=5, updated=0)
+    assert client.user.count() == 5
+
+
+def test_upsert_many_skip_duplicates(client: Prisma) -> None:
+    """Existing records are left unchanged"""
+    client.user.create({'id': 'a', 'name': 'Robert'})
+
+    result = client.user.upsert_many(
+        [{'id': 'a', 'name': 'Bob'}, {'id': 'b', 'name': 'Tegan'}],
+        skip_duplicates=True,
+    )
+    assert result == UpsertManyResult(created=1, updated=0)
+
+    user = client.user.find_unique(where={'id': 'a'})
+    assert user is not None
+    assert user.name == 'Robert'
+
+
+def test_upsert_many_missing_key(client: Prisma) -> None:
+    """Every record must contain the where key"""
+    with pytest.raises(TypeError, match='`id`'):
+        client.user.upsert_many([{'name': 'Robert'}])
+
+    assert client.user.count() == 0
@@ -1,6 +1,10 @@
+from typing import Any, List
+from datetime import timedelta
+
 import pytest
 
-from prisma import Prisma
+from prisma import Prisma, errors
+from prisma.types import CreateManyProgress
 
 
 @pytest.mark.asyncio
@@ -64,3 +68,57 @@ async def test_required_relation_key_field(client: Prisma) -> None:
     assert found is not None
     assert found.profile is not None
     assert found.profile.description == 'Foo 2'
+
+
+@pytest.mark.asyncio
+async def test_create_many_chunked(client: Prisma) -> None:
+    """Records from a generator can be created in multiple chunks concurrently"""
+    progress: List[CreateManyProgress] = []
+    total = await client.user.create_many(
+        ({'name': f'User {i}'} for i in range(25)),
+        chunk_size=10,
+        concurrency=2,
+        on_progress=progress.append,
+    )
+    assert total == 25
+    assert await client.user.count() == 25
+    assert [p.chunks for p in progress] == [1, 2, 3]
+    assert progress[-1].rows == 25
+    assert progress[-1].created == 25
+
+
+@pytest.mark.asyncio
+async def test_create_many_chunked_transaction(client: Prisma) -> None:
+    """No records are created when a chunk fails within a transaction"""
+    user = await client.user.create({'name': 'Robert'})
+
+    with pytest.raises(errors.UniqueViolationError):
+        await client.user.create_many(
+            [{'name': 'Tegan'}, {'name': 'Alfie'}, {'id': user.id, 'name': 'Robert'}],
+            chunk_size=2,
+            transaction=True,
+        )
+
+    assert await client.user.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_create_many_transaction_timeout(client: Prisma, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The timeout of the transaction started by `transaction=True` can be changed"""
+    timeouts: List[Any] = []
+    tx = Prisma.tx
+
+    def spy(self: Prisma, **kwargs: Any) -> Any:
+        timeouts.append(kwargs.get('timeout'))
+        return tx(self, **kwargs)
+
+    monkeypatch.setattr(Prisma, 'tx', spy)
+
+    total = await client.user.create_many(
+        [{'name': 'Robert'}, {'name': 'Tegan'}, {'name': 'Alfie'}],
+        chunk_size=1,
+        transaction=True,
+        transaction_timeout=timedelta(seconds=30),
+    )
+    assert total == 3
+    assert timeouts == [timedelta(seconds=30)]
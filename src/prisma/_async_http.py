@@ -1,5 +1,6 @@
 import json
-from typing import Any
+from typing import Any, AsyncIterator
+from contextlib import asynccontextmanager
 from typing_extensions import override
 
 import httpx
@@ -25,9 +26,19 @@ class AsyncHTTP(AbstractHTTP[httpx.AsyncClient, httpx.Response]):
     async def request(self, method: Method, url: str, **kwargs: Any) -> 'Response':
         return Response(await self.session.request(method, url, **kwargs))
 
+    @asynccontextmanager
+    async def stream(self, method: Method, url: str, **kwargs: Any) -> AsyncIterator['Response']:
+        """Send a request without reading the response body upfront"""
+        async with self.session.stream(method, url, **kwargs) as response:
+            yield Response(response)
+
     @override
     def open(self) -> None:
-        self.session = httpx.AsyncClient(**self.session_kwargs)
+        kwargs = self.session_kwargs
+        if self.uds is not None:
+            kwargs = {**kwargs, 'transport': httpx.AsyncHTTPTransport(**self._transport_kwargs())}
+
+        self.session = httpx.AsyncClient(**kwargs)
 
     @override
     async def close(self) -> None:
@@ -59,6 +70,13 @@ class Response(AbstractResponse[httpx.Response]):
     def headers(self) -> httpx.Headers:
         return self.original.headers
 
+    @override
+    async def read(self) -> bytes:
+        return await self.original.aread()
+
+    def aiter_bytes(self) -> AsyncIterator[bytes]:
+        return self.original.aiter_bytes()
+
     @override
     async def json(self, **kwargs: Any) -> Any:
         return json.loads(await self.original.aread(), **kwargs)
@@ -3,26 +3,50 @@ from __future__ import annotations
 import logging
 import warnings
 from types import TracebackType
-from typing import Any, Generic, TypeVar, overload
+from typing import Any, Generic, TypeVar, Callable, Iterator, AsyncIterator, overload
 from pathlib import Path
 from datetime import timedelta
 from typing_extensions import Self, Literal
 
 from pydantic import BaseModel
 
-from ._types import Datasource, HttpConfig, PrismaMethod, MetricsFormat, TransactionId, DatasourceOverride
+from ._cache import READ_METHODS, MUTATION_METHODS, QueryCache, get_query_tags
+from ._types import (
+    CacheStats,
+    Datasource,
+    HttpConfig,
+    CacheConfig,
+    LimiterStats,
+    PrismaMethod,
+    JsonCodecName,
+    MetricsFormat,
+    TransactionId,
+    CoalesceConfig,
+    EngineProtocol,
+    EngineTransport,
+    DatasourceOverride,
+    DeduplicationStats,
+    ConcurrencyLimitConfig,
+)
 from .engine import (
     SyncQueryEngine,
     AsyncQueryEngine,
     BaseAbstractEngine,
     SyncAbstractEngine,
     AsyncAbstractEngine,
+    AsyncQueryEnginePool,
 )
 from .errors import ClientNotConnectedError, ClientNotRegisteredError
 from ._compat import model_parse, removeprefix
 from ._builder import QueryBuilder
+from ._limiter import ConcurrencyLimiter
 from ._metrics import Metrics
 from ._registry import get_client
+from ._hydration import get_model_parser
+from ._coalescing import FindUniqueCoalescer
+from ._json_codec import JsonCodec, get_json_codec
+from ._json_builder import JsonQueryBuilder
+from ._single_flight import SingleFlight
 from .generator.models import EngineType
 
 log: logging.Logger = logging.getLogger(__name__)
@@ -66,6 +90,7 @@ def load_env(*, override: bool = False, **kwargs: Any) -> None:
 
 
 _EngineT = TypeVar('_EngineT', bound=BaseAbstractEngine)
+_ModelT = TypeVar('_ModelT', bound=BaseModel)
 
 
 class BasePrisma(Generic[_EngineT]):
@@ -74,6 +99,17 @@ class BasePrisma(Generic[_EngineT]):
     _connect_timeout: int | timedelta
     _tx_id: TransactionId | None
     _http_config: HttpConfig
+    _engine_protocol: EngineProtocol
+    _json_codec: JsonCodec
+    _engine_transport: EngineTransport
+    _engine_pool_size: int
+    _shared_engine: bool
+    _coalesce_find_unique: CoalesceConfig | None
+    _coalescer: FindUniqueCoalescer | None
+    _cache: QueryCache | None
+    _single_flight: SingleFlight | None
+    _limiter: ConcurrencyLimiter | None
+    _validate_results: bool
     _internal_engine: _EngineT | None
     _copied: bool
 
@@ -85,6 +121,7 @@ class BasePrisma(Generic[_EngineT]):
     _preview_features: set[str]
     _default_datasource_name: str
     _relational_field_mappings: dict[str, dict[str, str]]
+    _hydrators: dict[type[BaseModel], Callable[[Any], BaseModel]]
 
     __slots__ = (
         '_copied',
@@ -97,11 +134,23 @@ class BasePrisma(Generic[_EngineT]):
         '_prisma_models',
         '_active_provider',
         '_connect_timeout',
+        '_json_codec',
+        '_engine_protocol',
+        '_engine_transport',
+        '_engine_pool_size',
+        '_shared_engine',
+        '_coalesce_find_unique',
+        '_coalescer',
+        '_cache',
+        '_single_flight',
+        '_limiter',
+        '_validate_results',
         '_internal_engine',
         '_packaged_schema_path',
         '_preview_features',
         '_default_datasource_name',
         '_relational_field_mappings',
+        '_hydrators',
     )
 
     def __init__(
@@ -112,6 +161,16 @@ class BasePrisma(Generic[_EngineT]):
         datasource: DatasourceOverride | None,
         connect_timeout: int | timedelta,
         http: HttpConfig | None,
+        engine_protocol: EngineProtocol = 'graphql',
+        json_codec: JsonCodec | JsonCodecName = 'stdlib',
+        engine_transport: EngineTransport = 'tcp',
+        engine_pool_size: int = 1,
+        shared_engine: bool = False,
+        coalesce_find_unique: bool | CoalesceConfig = False,
+        cache: bool | CacheConfig = False,
+        deduplicate_queries: bool = False,
+        concurrency_limit: int | ConcurrencyLimitConfig | None = None,
+        validate_results: bool = True,
     ) -> None:
         # NOTE: if you add any more properties here then you may also need to forward
         # them in the `_copy()` method.
@@ -130,6 +189,36 @@ class BasePrisma(Generic[_EngineT]):
 
         self._connect_timeout = connect_timeout
         self._http_config: HttpConfig = http or {}
+        self._engine_protocol = engine_protocol
+        self._json_codec = get_json_codec(json_codec)
+        self._engine_transport = engine_transport
+
+        if engine_pool_size < 1:
+            raise ValueError(f'Expected `engine_pool_size` to be at least 1 but got {engine_pool_size}')
+
+        if shared_engine and engine_pool_size > 1:
+            raise ValueError('The `shared_engine` and `engine_pool_size` options cannot be used together')
+
+        self._engine_pool_size = engine_pool_size
+        self._shared_engine = shared_engine
+
+        if coalesce_find_unique is True:
+            coalesce_find_unique = {}
+
+        self._coalesce_find_unique = coalesce_find_unique or None
+        self._coalescer = None
+
+        if cache is True:
+            cache = {}
+
+        self._cache = QueryCache(cache) if cache is not False else None
+        self._single_flight = SingleFlight() if deduplicate_queries else None
+
+        if isinstance(concurrency_limit, int):
+            concurrency_limit = {'max_in_flight': concurrency_limit}
+
+        self._limiter = ConcurrencyLimiter(concurrency_limit) if concurrency_limit is not None else None
+        self._validate_results = validate_results
         self._tx_id: TransactionId | None = None
         self._copied: bool = False
 
@@ -147,6 +236,7 @@ class BasePrisma(Generic[_EngineT]):
         preview_features: set[str],
         relational_field_mappings: dict[str, dict[str, str]],
         default_datasource_name: str,
+        hydrators: dict[type[BaseModel], Callable[[Any], BaseModel]],
     ) -> None:
         """We pass through generated metadata using this method
         instead of the `__init__()` because that causes weirdness
@@ -161,6 +251,7 @@ class BasePrisma(Generic[_EngineT]):
         self._preview_features = preview_features
         self._relational_field_mappings = relational_field_mappings
         self._default_datasource_name = default_datasource_name
+        self._hydrators = hydrators
 
     @property
     def _default_datasource(self) -> Datasource:
@@ -181,6 +272,20 @@ class BasePrisma(Generic[_EngineT]):
         """Returns True if the client is connected to the query engine, False otherwise."""
         return self._internal_engine is not None
 
+    def get_cache_stats(self) -> CacheStats:
+        """Returns statistics for the query result cache.
+
+        Every statistic will be zero if the client was not created with `cache=True`.
+        """
+        if self._cache is None:
+            return CacheStats(hits=0, misses=0, evictions=0, expirations=0, invalidations=0, size=0)
+        return self._cache.stats()
+
+    def clear_cache(self) -> None:
+        """Remove every result from the query result cache"""
+        if self._cache is not None:
+            self._cache.clear()
+
     def __del__(self) -> None:
         # Note: as the transaction manager holds a reference to the original
         # client as well as the transaction client the original client cannot
@@ -214,9 +319,21 @@ class BasePrisma(Generic[_EngineT]):
             datasource=self._datasource,
             log_queries=self._log_queries,
             connect_timeout=self._connect_timeout,
+            engine_protocol=self._engine_protocol,
+            json_codec=self._json_codec,
+            engine_transport=self._engine_transport,
+            engine_pool_size=self._engine_pool_size,
+            shared_engine=self._shared_engine,
+            coalesce_find_unique=self._coalesce_find_unique or False,
+            validate_results=self._validate_results,
         )
         new._copied = True
 
+        # the cache must be shared so that writes from transactions invalidate the results
+        new._cache = self._cache
+        new._single_flight = self._single_flight
+        new._limiter = self._limiter
+
         if self._internal_engine is not None:
             new._engine = self._internal_engine
 
@@ -286,15 +403,21 @@ class BasePrisma(Generic[_EngineT]):
         log.debug('datasources: %s', datasources)
         return timeout, datasources
 
+    @property
+    def _query_builder_class(self) -> type[QueryBuilder]:
+        if self._engine_protocol == 'json':
+            return JsonQueryBuilder
+        return QueryBuilder
+
     def _make_query_builder(
         self,
         *,
         method: PrismaMethod,
         arguments: dict[str, Any],
-        model: type[BaseModel] | None,
-        root_selection: list[str] | None,
+        model: type[BaseModel] | None = None,
+        root_selection: list[str] | None = None,
     ) -> QueryBuilder:
-        return QueryBuilder(
+        return self._query_builder_class(
             method=method,
             model=model,
             arguments=arguments,
@@ -303,6 +426,32 @@ class BasePrisma(Generic[_EngineT]):
             relational_field_mappings=self._relational_field_mappings,
         )
 
+    def _get_model_parser(self, model: type[_ModelT], validate: bool | None = None) -> Callable[[Any], _ModelT]:
+        """Returns the function to create model instances from query results with, `validate` defaults to the client option"""
+        return get_model_parser(
+            model,
+            validate=self._validate_results if validate is None else validate,
+            hydrators=self._hydrators,
+        )
+
+    def _get_cache_tags(self, builder: QueryBuilder) -> frozenset[str] | None:
+        return get_query_tags(
+            builder.method,
+            builder.model.__prisma_model__ if builder.model is not None else None,
+            builder.arguments,
+            self._relational_field_mappings,
+            include=builder.include,
+        )
+
+    def _is_cacheable(self, builder: QueryBuilder) -> bool:
+        # queries within a transaction may see writes that have not been committed yet
+        return self._cache is not None and self._tx_id is None and builder.method in READ_METHODS
+
+    def _invalidate_cache(self, builder: QueryBuilder) -> None:
+        """Remove the cached results that could be affected by the given query"""
+        if self._cache is not None and builder.method in MUTATION_METHODS:
+            self._cache.invalidate(self._get_cache_tags(builder), tx_id=self._tx_id)
+
 
 class SyncBasePrisma(BasePrisma[SyncAbstractEngine]):
     __slots__ = ()
@@ -398,6 +547,10 @@ class SyncBasePrisma(BasePrisma[SyncAbstractEngine]):
                 dml_path=dml_path or self._packaged_schema_path,
                 log_queries=self._log_queries,
                 http_config=self._http_config,
+                engine_protocol=self._engine_protocol,
+                json_codec=self._json_codec,
+                transport=self._engine_transport,
+                shared=self._shared_engine,
             )
 
         raise NotImplementedError(f'Unsupported engine type: {self._engine_type}')
@@ -420,7 +573,39 @@ class SyncBasePrisma(BasePrisma[SyncAbstractEngine]):
         builder = self._make_query_builder(
             method=method, model=model, arguments=arguments, root_selection=root_selection
         )
-        return self._engine.query(builder.build(), tx_id=self._tx_id)
+        content = self._json_codec.dumps(builder.build_payload())
+
+        cache = self._cache
+        if cache is not None and self._is_cacheable(builder):
+            try:
+                return cache.get(content)
+            except KeyError:
+                pass
+
+            generation = cache.generation
+            result = builder.process_response(self._engine.query(content, tx_id=self._tx_id))
+            tags = self._get_cache_tags(builder)
+            if tags is not None:
+                cache.set(content, result, tags=tags, generation=generation)
+            return result
+
+        try:
+            return builder.process_response(self._engine.query(content, tx_id=self._tx_id))
+        finally:
+            self._invalidate_cache(builder)
+
+    def _execute_stream(
+        self,
+        *,
+        method: PrismaMethod,
+        arguments: dict[str, Any],
+        model: type[BaseModel] | None = None,
+    ) -> Iterator[Any]:
+        """Execute a query that returns a list, yielding each raw result as it is received"""
+        builder = self._make_query_builder(method=method, model=model, arguments=arguments)
+        content = self._json_codec.dumps(builder.build_payload())
+        for item in self._engine.stream_query(content, tx_id=self._tx_id):
+            yield builder.process_result_item(item)
 
 
 class AsyncBasePrisma(BasePrisma[AsyncAbstractEngine]):
@@ -502,22 +687,64 @@ class AsyncBasePrisma(BasePrisma[AsyncAbstractEngine]):
         You can retrieve metrics in either JSON or Prometheus formats.
 
         For more details see https://www.prisma.io/docs/concepts/components/prisma-client/metrics.
+
+        If the client was created with a `concurrency_limit` then the current state of the limiter
+        is included as `prisma_client_queries_*` gauges.
         """
         response = await self._engine.metrics(format=format, global_labels=global_labels)
+        limiter = self._limiter
         if format == 'prometheus':
             # For the prometheus format we return the response as-is
             assert isinstance(response, str)
+            if limiter is not None:
+                if response and not response.endswith('\n'):
+                    response += '\n'
+                response += limiter.prometheus_gauges(global_labels)
             return response
 
-        return model_parse(Metrics, response)
+        metrics = model_parse(Metrics, response)
+        if limiter is not None:
+            metrics.gauges.extend(limiter.gauges(global_labels))
+        return metrics
+
+    def get_deduplication_stats(self) -> DeduplicationStats:
+        """Returns statistics for read queries that were deduplicated.
+
+        Every statistic will be zero if the client was not created with `deduplicate_queries=True`.
+        """
+        if self._single_flight is None:
+            return DeduplicationStats(requests=0, deduplicated=0)
+        return self._single_flight.stats()
+
+    def get_limiter_stats(self) -> LimiterStats | None:
+        """Returns statistics for the query concurrency limiter.
+
+        Returns None if the client was not created with a `concurrency_limit`.
+        """
+        if self._limiter is None:
+            return None
+        return self._limiter.stats()
 
     def _create_engine(self, dml_path: Path | None = None) -> AsyncAbstractEngine:
         if self._engine_type == EngineType.binary:
-            return AsyncQueryEngine(
-                dml_path=dml_path or self._packaged_schema_path,
-                log_queries=self._log_queries,
-                http_config=self._http_config,
-            )
+            engines = [
+                AsyncQueryEngine(
+                    dml_path=dml_path or self._packaged_schema_path,
+                    log_queries=self._log_queries,
+                    http_config=self._http_config,
+                    engine_protocol=self._engine_protocol,
+                    json_codec=self._json_codec,
+                    transport=self._engine_transport,
+                    shared=self._shared_engine,
+                    # the limiter is shared between every engine in the pool
+                    limiter=self._limiter,
+                )
+                for _ in range(self._engine_pool_size)
+            ]
+            if len(engines) == 1:
+                return engines[0]
+
+            return AsyncQueryEnginePool(engines)
 
         raise NotImplementedError(f'Unsupported engine type: {self._engine_type}')
 
@@ -540,4 +767,62 @@ class AsyncBasePrisma(BasePrisma[AsyncAbstractEngine]):
         builder = self._make_query_builder(
             method=method, model=model, arguments=arguments, root_selection=root_selection
         )
-        return await self._engine.query(builder.build(), tx_id=self._tx_id)
+
+        cache = self._cache
+        if cache is not None and self._is_cacheable(builder):
+            content = self._json_codec.dumps(builder.build_payload())
+            try:
+                return cache.get(content)
+            except KeyError:
+                pass
+
+            generation = cache.generation
+            result = await self._execute_builder(builder, content)
+            tags = self._get_cache_tags(builder)
+            if tags is not None:
+                cache.set(content, result, tags=tags, generation=generation)
+            return result
+
+        try:
+            return await self._execute_builder(builder)
+        finally:
+            self._invalidate_cache(builder)
+
+    async def _execute_builder(self, builder: QueryBuilder, content: str | None = None) -> Any:
+        single_flight = self._single_flight
+        if single_flight is None or builder.method not in READ_METHODS:
+            return await self._send_builder(builder, content)
+
+        if content is None:
+            content = self._json_codec.dumps(builder.build_payload())
+
+        return await single_flight.execute((content, self._tx_id), lambda: self._send_builder(builder, content))
+
+    async def _send_builder(self, builder: QueryBuilder, content: str | None = None) -> Any:
+        if builder.method == 'find_unique' and self._tx_id is None and self._coalesce_find_unique is not None:
+            return await self._find_unique_coalescer.execute(builder)
+
+        if content is None:
+            content = self._json_codec.dumps(builder.build_payload())
+
+        return builder.process_response(await self._engine.query(content, tx_id=self._tx_id))
+
+    @property
+    def _find_unique_coalescer(self) -> FindUniqueCoalescer:
+        coalescer = self._coalescer
+        if coalescer is None:
+            coalescer = self._coalescer = FindUniqueCoalescer(self, self._coalesce_find_unique)
+        return coalescer
+
+    async def _execute_stream(
+        self,
+        *,
+        method: PrismaMethod,
+        arguments: dict[str, Any],
+        model: type[BaseModel] | None = None,
+    ) -> AsyncIterator[Any]:
+        """Execute a query that returns a list, yielding each raw result as it is received"""
+        builder = self._make_query_builder(method=method, model=model, arguments=arguments)
+        content = self._json_codec.dumps(builder.build_payload())
+        async for item in self._engine.stream_query(content, tx_id=self._tx_id):
+            yield builder.process_result_item(item)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import Any, List, Generic, TypeVar, Callable, Optional
+
+from pydantic import BaseModel
+
+from .errors import BatchNotCommittedError
+from ._compat import model_parse
+from ._builder import QueryBuilder
+from .engine.utils import get_batch_item_error
+
+__all__ = (
+    'BatchOperation',
+    'process_batch_response',
+    'model_parser',
+    'optional_model_parser',
+    'model_list_parser',
+    'parse_count',
+    'parse_aggregate_count',
+    'parse_aggregate_counts',
+    'parse_raw_count',
+)
+
+_T = TypeVar('_T')
+_ModelT = TypeVar('_ModelT', bound=BaseModel)
+
+# parsers are given the normalised response for a single operation, i.e. `{'data': {'result': ...}}`
+Parser = Callable[[Any], _T]
+
+
+class BatchOperation(Generic[_T]):
+    """A single operation that has been added to a batch.
+
+    The result of the operation is available once the batch has been committed, e.g.
+
+    ```py
+    async with client.batch_() as batcher:
+        user = batcher.user.create({'name': 'Robert'})
+
+    print(user.result().id)
+    ```
+    """
+
+    __slots__ = ('builder', '_parse', '_done', '_result', '_exception')
+
+    builder: QueryBuilder
+    """The query builder for this operation"""
+
+    def __init__(self, builder: QueryBuilder, parse: Parser[_T]) -> None:
+        self.builder = builder
+        self._parse = parse
+        self._done = False
+        self._result: Optional[_T] = None
+        self._exception: Optional[Exception] = None
+
+    def done(self) -> bool:
+        """Returns True if the batch this operation belongs to has been committed"""
+        return self._done
+
+    def result(self) -> _T:
+        """Returns the result of this operation, raising the error if the operation did not succeed"""
+        if not self._done:
+            raise BatchNotCommittedError()
+
+        if self._exception is not None:
+            raise self._exception
+
+        return self._result  # type: ignore[return-value]
+
+    def exception(self) -> Optional[Exception]:
+        """Returns the error if the operation did not succeed, otherwise None"""
+        if not self._done:
+            raise BatchNotCommittedError()
+
+        return self._exception
+
+    def _set_response(self, data: Any) -> None:
+        try:
+            self._result = self._parse(self.builder.process_response(data))
+        except Exception as exc:
+            self._exception = exc
+        self._done = True
+
+    def _set_exception(self, exc: Exception) -> None:
+        self._exception = exc
+        self._done = True
+
+    def _value(self) -> Any:
+        if self._exception is not None:
+            return self._exception
+        return self._result
+
+
+def process_batch_response(operations: List[BatchOperation[Any]], response: Any) -> List[Any]:
+    """Store the result of each operation from a batched query engine response.
+
+    Returns the result of each operation in the order they were added, operations that did not
+    succeed are represented by their error.
+    """
+    results = response['batchResult']
+    for operation, data in zip(operations, results):
+        errors = data.get('errors')
+        if errors:
+            operation._set_exception(get_batch_item_error(errors))
+        else:
+            operation._set_response(data)
+
+    return [operation._value() for operation in operations]
+
+
+def model_parser(model: type[_ModelT]) -> Parser[_ModelT]:
+    def parse(response: Any) -> _ModelT:
+        return model_parse(model, response['data']['result'])
+
+    return parse
+
+
+def optional_model_parser(model: type[_ModelT]) -> Parser[Optional[_ModelT]]:
+    def parse(response: Any) -> Optional[_ModelT]:
+        result = response['data']['result']
+        if result is None:
+            return None
+        return model_parse(model, result)
+
+    return parse
+
+
+def model_list_parser(model: type[_ModelT]) -> Parser[List[_ModelT]]:
+    def parse(response: Any) -> List[_ModelT]:
+        return [model_parse(model, r) for r in response['data']['result']]
+
+    return parse
+
+
+def parse_count(response: Any) -> int:
+    """Parse the response of a bulk operation, e.g. `update_many()`"""
+    return int(response['data']['result']['count'])
+
+
+def parse_aggregate_count(response: Any) -> int:
+    """Parse the response of a `count()` query"""
+    return int(response['data']['result']['_count']['_all'])
+
+
+def parse_aggregate_counts(response: Any) -> Any:
+    """Parse the response of a `count()` query that selected specific fields"""
+    return response['data']['result']['_count']
+
+
+def parse_raw_count(response: Any) -> int:
+    """Parse the response of an `execute_raw()` query"""
+    return int(response['data']['result'])
@@ -1,21 +1,26 @@
 from __future__ import annotations
 
+import re
+import copy
 import json
 import decimal
 import inspect
 import logging
 import datetime
+import threading
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Union, Mapping, Iterable, ForwardRef, cast
+from typing import TYPE_CHECKING, Any, Union, Mapping, Callable, Hashable, Iterable, ForwardRef, NamedTuple, cast
 from datetime import timezone
 from textwrap import indent
 from functools import singledispatch
+from collections import OrderedDict
 from typing_extensions import Literal, TypeGuard, override
 
 from pydantic import BaseModel
 from pydantic.fields import FieldInfo
 
 from . import fields
+from .utils import DEBUG, _env_bool
 from ._types import PrismaMethod
 from .errors import InvalidModelError, UnknownModelError, UnknownRelationalFieldError
 from ._compat import get_args, is_union, get_origin, model_fields, model_field_type
@@ -73,9 +78,17 @@ METHOD_FORMAT_MAPPING: dict[PrismaMethod, str] = {
     'find_unique_or_raise': 'findUnique{model}OrThrow',
 }
 
+RAW_METHODS: set[PrismaMethod] = {'query_raw', 'query_first', 'execute_raw'}
+
 MISSING = object()
 Operation = Literal['query', 'mutation']
 
+DEFAULT_QUERY_CACHE_SIZE = 512
+
+# templates with more slots than this are not worth keeping around as they
+# are very unlikely to be re-used, e.g. `create_many()` with thousands of records
+MAX_CACHED_TEMPLATE_SLOTS = 1000
+
 
 class QueryBuilder:
     method: PrismaMethod
@@ -155,17 +168,21 @@ class QueryBuilder:
 
     def build(self) -> str:
         """Build the payload that should be sent to the QueryEngine"""
-        data: dict[str, object] = {
+        return dumps(self.build_payload())
+
+    def build_payload(self) -> dict[str, Any]:
+        """Build the object that should be serialised & sent to the QueryEngine"""
+        return {
             'variables': {},
             'operation_name': self.operation,
-            'query': self.build_query(),
+            'query': self.build_query(pretty=DEBUG),
         }
-        return dumps(data)
 
-    def build_query(self) -> str:
+    def build_query(self, *, pretty: bool = True) -> str:
         """Build the GraphQL query
 
-        Example query:
+        If `pretty` is True, the query is rendered from a tree of nodes with every
+        argument and selection on its own line, e.g.
 
         query {
           result: findUniqueUser
@@ -184,11 +201,84 @@ class QueryBuilder:
             }
           }
         }
+
+        Otherwise the query is emitted in a single pass with no insignificant whitespace, e.g.
+
+        query{result:findUniqueUser(where:{id:"ckq23ky3003510r8zll5m2hma"}){id name profile{id user_id bio}}}
         """
-        query = self._create_root_node().render()
+        cache = query_cache
+        if cache.enabled:
+            query = self._build_cached_query(cache, pretty=pretty)
+        else:
+            query = self._render_query(pretty=pretty)
+
         log.debug('Generated query: \n%s', query)
         return query
 
+    def build_batch_item(self) -> dict[str, Any]:
+        """Build the representation of this query within a batched request"""
+        return {
+            'query': self.build_query(pretty=DEBUG),
+            'variables': {},
+        }
+
+    @classmethod
+    def build_batch_payload(cls, items: list[dict[str, Any]], *, transaction: bool = True) -> dict[str, Any]:
+        """Build the payload for a batched request from the items returned by `build_batch_item()`"""
+        return {'batch': items, 'transaction': transaction}
+
+    def process_response(self, data: Any) -> Any:
+        """Normalise the QueryEngine response for this query to `{'data': {'result': ...}}`"""
+        return data
+
+    def process_result_item(self, item: Any) -> Any:
+        """Normalise a single element of a list result that was streamed from the QueryEngine"""
+        return item
+
+    def _render_query(self, *, pretty: bool) -> str:
+        if pretty:
+            return self._create_root_node().render()
+        return QueryEmitter(self).emit()
+
+    def _build_cached_query(self, cache: QueryTemplateCache, *, pretty: bool) -> str:
+        """Build the query using a compiled template for the shape of the current arguments.
+
+        The template is keyed by everything that influences the structure of the rendered query,
+        the method, the model, the argument keys, the include tree and the root selection. Every
+        other value is rendered into a slot that is filled in for each call.
+        """
+        shape = _QueryShape(raw=self.method in RAW_METHODS)
+        try:
+            arguments_key = shape.arguments(self.arguments)
+            include_key = shape.include(self.include)
+        except _UncacheableQuery:
+            return self._render_query(pretty=pretty)
+
+        key = (
+            pretty,
+            self.method,
+            self.model,
+            tuple(self.root_selection) if self.root_selection is not None else None,
+            arguments_key,
+            include_key,
+        )
+        template = cache.get(key)
+        if template is None:
+            if len(shape.values) > MAX_CACHED_TEMPLATE_SLOTS:
+                return self._render_query(pretty=pretty)
+
+            template = self._compile_template(pretty=pretty)
+            cache.set(key, template)
+
+        return template.render(shape.values)
+
+    def _compile_template(self, *, pretty: bool) -> QueryTemplate:
+        shape = _QueryShape(raw=self.method in RAW_METHODS, slots=True)
+        builder = copy.copy(self)
+        builder.arguments = shape.arguments(self.arguments)
+        builder.include = shape.include(self.include)
+        return QueryTemplate.compile(builder._render_query(pretty=pretty), encoders=shape.encoders)
+
     def _create_root_node(self) -> 'RootNode':
         root = RootNode(builder=self)
         root.add(ResultNode.create(self))
@@ -325,6 +415,234 @@ def _is_prisma_model_type(type_: type[BaseModel]) -> TypeGuard[type[PrismaModel]
     return issubclass(type_, _PrismaModel)
 
 
+class _UncacheableQuery(Exception):
+    """Raised when the shape of a query cannot be determined, e.g. invalid include values.
+
+    In this case we fallback to rendering the query directly so that the standard errors are raised.
+    """
+
+
+class _Slot:
+    """Placeholder for a value in a query template"""
+
+    index: int
+
+    __slots__ = ('index',)
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+
+SLOT_MARKER = '\x00'
+
+# `json.dumps()` always escapes control characters so a rendered `_Slot` looks like "\u00001\u0000"
+SLOT_PATTERN = re.compile(r'"\\u0000(\d+)\\u0000"')
+
+
+def _dumps_raw_parameters(value: Any) -> str:
+    # NOTE: prisma expects raw query parameters to be passed as a json string
+    # value like "[\"John\",\"123\"]", see `Arguments.create_children()`
+    return dumps(dumps(value))
+
+
+class _QueryShape:
+    """Walks query arguments to build a hashable key representing their structure.
+
+    Every value that does not influence the structure of the rendered query is
+    collected in `values`. If `slots` is True, copies of the arguments are returned
+    instead of the key, with every collected value replaced by a `_Slot`.
+
+    This *must* mirror the rendering logic of the `Arguments`, `Data`, `ListNode` and `Selection` nodes.
+    """
+
+    raw: bool
+    slots: bool
+    values: list[object]
+    encoders: list[Callable[[Any], str]]
+
+    __slots__ = ('raw', 'slots', 'values', 'encoders')
+
+    def __init__(self, *, raw: bool, slots: bool = False) -> None:
+        self.raw = raw
+        self.slots = slots
+        self.values = []
+        self.encoders = []
+
+    def _slot(self, value: object, encoder: Callable[[Any], str] | None = None) -> Any:
+        if encoder is None:
+            encoder = dumps
+
+        index = len(self.values)
+        self.values.append(value)
+        if self.slots:
+            self.encoders.append(encoder)
+            return _Slot(index)
+        return encoder
+
+    def arguments(self, arguments: dict[str, Any]) -> Any:
+        shape: list[Any] = []
+        for arg, value in arguments.items():
+            if value is None:
+                continue
+
+            if isinstance(value, dict):
+                shape.append((arg, self.data(value)))
+            elif isinstance(value, ITERABLES):
+                if self.raw:
+                    shape.append((arg, self._slot(value, _dumps_raw_parameters)))
+                else:
+                    shape.append((arg, self.list(value)))
+            else:
+                shape.append((arg, self._slot(value)))
+
+        if self.slots:
+            return dict(shape)
+        return tuple(shape)
+
+    def data(self, data: Mapping[str, Any]) -> Any:
+        shape: list[Any] = []
+        for key, value in data.items():
+            if isinstance(value, dict):
+                shape.append((key, self.data(value)))
+            elif isinstance(value, (list, tuple, set)):
+                shape.append((key, self.list(value)))
+            else:
+                shape.append((key, self._slot(value)))
+
+        if self.slots:
+            return dict(shape)
+        return ('data', tuple(shape))
+
+    def list(self, data: Iterable[Any]) -> Any:
+        shape = [self.data(item) if isinstance(item, dict) else self._slot(item) for item in data]
+        if self.slots:
+            return shape
+        return ('list', tuple(shape))
+
+    def include(self, include: dict[str, Any] | None) -> Any:
+        if include is None:
+            return None
+
+        if not isinstance(include, dict):
+            raise _UncacheableQuery()
+
+        shape: list[Any] = []
+        for key, value in include.items():
+            if isinstance(value, bool):
+                shape.append((key, value))
+            elif isinstance(value, dict):
+                args = value.copy()
+                nested = self.include(args.pop('include', None))
+                arguments = self.arguments(args)
+                if self.slots:
+                    if nested is not None:
+                        arguments['include'] = nested
+                    shape.append((key, arguments))
+                else:
+                    shape.append((key, arguments, nested))
+            else:
+                raise _UncacheableQuery()
+
+        if self.slots:
+            return dict(shape)
+        return tuple(shape)
+
+
+class QueryTemplate:
+    """A compiled query with slots that values are serialized into"""
+
+    parts: list[str]
+    slots: list[tuple[int, Callable[[Any], str]]]
+
+    __slots__ = ('parts', 'slots')
+
+    def __init__(self, *, parts: list[str], slots: list[tuple[int, Callable[[Any], str]]]) -> None:
+        self.parts = parts
+        self.slots = slots
+
+    @classmethod
+    def compile(cls, query: str, *, encoders: list[Callable[[Any], str]]) -> QueryTemplate:
+        split = SLOT_PATTERN.split(query)
+        indexes = [int(index) for index in split[1::2]]
+        return cls(
+            parts=split[::2],
+            slots=[(index, encoders[index]) for index in indexes],
+        )
+
+    def render(self, values: list[object]) -> str:
+        parts = self.parts
+        strings = [parts[0]]
+        for i, (index, encoder) in enumerate(self.slots, start=1):
+            strings.append(encoder(values[index]))
+            strings.append(parts[i])
+        return ''.join(strings)
+
+
+class QueryCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class QueryTemplateCache:
+    """Bounded LRU cache of compiled query templates.
+
+    The cache can be turned off by setting `enabled` to False or by setting
+    the `PRISMA_PY_DISABLE_QUERY_CACHE` environment variable.
+    """
+
+    enabled: bool
+    maxsize: int
+    hits: int
+    misses: int
+
+    def __init__(self, maxsize: int = DEFAULT_QUERY_CACHE_SIZE, *, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._templates: OrderedDict[Hashable, QueryTemplate] = OrderedDict()
+
+    def get(self, key: Hashable) -> QueryTemplate | None:
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._templates.move_to_end(key)
+            return template
+
+    def set(self, key: Hashable, template: QueryTemplate) -> None:
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached templates and reset the hit / miss counters"""
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> QueryCacheInfo:
+        with self._lock:
+            return QueryCacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                maxsize=self.maxsize,
+                currsize=len(self._templates),
+            )
+
+
 class AbstractNode(ABC):
     __slots__ = ()
 
@@ -571,7 +889,7 @@ class Arguments(Node):
                 # here as prisma expects parameters to be passed as a json string
                 # value like "[\"John\",\"123\"]", and we encode twice to ensure
                 # that only the inner quotes are escaped
-                if self.builder.method in {'query_raw', 'query_first', 'execute_raw'}:
+                if self.builder.method in RAW_METHODS:
                     children.append(f'{arg}: {dumps(dumps(value))}')
                 else:
                     children.append(Key(arg, node=ListNode.create(self.builder, data=value)))
@@ -815,6 +1133,155 @@ class Key(AbstractNode):
         return f'{self.key}{self.sep}'
 
 
+class QueryEmitter:
+    """Renders a query in a single pass into one buffer.
+
+    This produces the same query as the `Node` tree renderer but without any
+    insignificant whitespace and without allocating a node for every argument,
+    list item and selected field.
+
+    This *must* mirror the rendering logic of the `Arguments`, `Data`, `ListNode` and `Selection` nodes.
+    """
+
+    builder: QueryBuilder
+    buffer: list[str]
+
+    __slots__ = ('builder', 'buffer')
+
+    def __init__(self, builder: QueryBuilder) -> None:
+        self.builder = builder
+        self.buffer = []
+
+    def emit(self) -> str:
+        builder = self.builder
+        model = builder.model
+        model_name = model.__prisma_model__ if model is not None else ''
+
+        write = self.buffer.append
+        write(builder.operation)
+        write('{result:')
+        write(builder.method_format.format(model=model_name))
+        self.arguments(builder.arguments)
+        self.selection(model=model, include=builder.include, root_selection=builder.root_selection)
+        write('}')
+        return ''.join(self.buffer)
+
+    def arguments(self, arguments: dict[str, Any]) -> None:
+        write = self.buffer.append
+        raw = self.builder.method in RAW_METHODS
+        sep = '('
+        for arg, value in arguments.items():
+            if value is None:
+                # ignore None values for convenience
+                continue
+
+            write(sep)
+            write(arg)
+            write(':')
+            sep = ','
+
+            if isinstance(value, dict):
+                self.data(value)
+            elif isinstance(value, ITERABLES):
+                if raw:
+                    write(dumps(dumps(value)))
+                else:
+                    self.list(value)
+            else:
+                write(dumps(value))
+
+        if sep == ',':
+            write(')')
+
+    def data(self, data: Mapping[str, Any]) -> None:
+        write = self.buffer.append
+        write('{')
+        sep = ''
+        for key, value in data.items():
+            write(sep)
+            write(key)
+            write(':')
+            sep = ','
+
+            if isinstance(value, dict):
+                self.data(value)
+            elif isinstance(value, (list, tuple, set)):
+                self.list(value)
+            else:
+                write(dumps(value))
+
+        write('}')
+
+    def list(self, data: Iterable[Any]) -> None:
+        write = self.buffer.append
+        write('[')
+        sep = ''
+        for item in data:
+            write(sep)
+            sep = ','
+
+            if isinstance(item, dict):
+                self.data(item)
+            else:
+                write(dumps(item))
+
+        write(']')
+
+    def selection(
+        self,
+        *,
+        model: type[PrismaModel] | None,
+        include: dict[str, Any] | None,
+        root_selection: list[str] | None = None,
+    ) -> None:
+        builder = self.builder
+        fields: list[str] = []
+
+        # root_selection, if present overrides the default fields
+        # for a model as it is used by methods such as count()
+        # that do not support returning model fields
+        if root_selection is not None:
+            fields.extend(root_selection)
+        elif model is not None:
+            fields.extend(builder.get_default_fields(model))
+
+        if include is None:
+            if fields:
+                self.buffer.append('{' + ' '.join(fields) + '}')
+            return
+
+        if model is None:
+            raise ValueError('Cannot include fields when model is None.')
+
+        write = self.buffer.append
+        write('{')
+        write(' '.join(fields))
+        sep = ' ' if fields else ''
+        for key, value in include.items():
+            if value is True:
+                write(sep)
+                write(key)
+                self.selection(model=builder.get_relational_model(current_model=model, field=key), include=None)
+            elif isinstance(value, dict):
+                args = value.copy()
+                nested_include = args.pop('include', None)
+                write(sep)
+                write(key)
+                self.arguments(args)
+                self.selection(
+                    model=builder.get_relational_model(current_model=model, field=key),
+                    include=nested_include,
+                )
+            elif value is False:
+                continue
+            else:
+                raise TypeError(f'Expected `bool` or `dict` include value but got {type(value)} instead.')
+
+            sep = ' '
+
+        write('}')
+
+
 @singledispatch
 def serializer(obj: Any) -> Serializable:
     """Single dispatch generic function for serializing objects to JSON"""
@@ -868,11 +1335,20 @@ def serialize_decimal(obj: decimal.Decimal) -> str:
     return str(obj)
 
 
+@serializer.register(_Slot)
+def serialize_slot(slot: _Slot) -> str:
+    """Serialize a template slot to a marker that can be found after rendering"""
+    return f'{SLOT_MARKER}{slot.index}{SLOT_MARKER}'
+
+
 def dumps(obj: Any, **kwargs: Any) -> str:
     kwargs.setdefault('default', serializer)
     kwargs.setdefault('ensure_ascii', False)
     return json.dumps(obj, **kwargs)
 
 
+query_cache: QueryTemplateCache = QueryTemplateCache(enabled=not _env_bool('PRISMA_PY_DISABLE_QUERY_CACHE'))
+
+
 # black does not respect the fmt: off comment without this
 # fmt: on
@@ -0,0 +1,267 @@
+"""Caching the results of read queries.
+
+Results are keyed by the serialised query payload and tagged with the name of every model that
+the query touches, i.e. the model being queried and the models of every relational field that is
+included or filtered on. Write queries remove every result that is tagged with any of the models
+that they modify so stale results are never returned.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+import logging
+import threading
+from typing import Any, Set, Dict, Mapping, Iterable, Optional, FrozenSet
+from datetime import timedelta
+from collections import OrderedDict
+
+from ._types import CacheStats, CacheConfig, PrismaMethod, TransactionId
+from ._constants import DEFAULT_CACHE_MAX_SIZE
+
+__all__ = (
+    'QueryCache',
+    'get_query_tags',
+    'READ_METHODS',
+    'MUTATION_METHODS',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+READ_METHODS: FrozenSet[PrismaMethod] = frozenset(
+    {
+        'count',
+        'group_by',
+        'find_many',
+        'find_first',
+        'find_first_or_raise',
+        'find_unique',
+        'find_unique_or_raise',
+    }
+)
+
+MUTATION_METHODS: FrozenSet[PrismaMethod] = frozenset(
+    {
+        'create',
+        'delete',
+        'update',
+        'upsert',
+        'create_many',
+        'delete_many',
+        'update_many',
+        'execute_raw',
+    }
+)
+
+# deleting a record can also delete or update the records that reference it
+_CASCADING_METHODS: FrozenSet[PrismaMethod] = frozenset({'delete', 'delete_many'})
+
+
+def get_query_tags(
+    method: PrismaMethod,
+    model: Optional[str],
+    arguments: Mapping[str, Any],
+    relational_field_mappings: Mapping[str, Mapping[str, str]],
+    *,
+    include: Optional[Mapping[str, Any]] = None,
+) -> Optional[FrozenSet[str]]:
+    """Returns the name of every model that the given query reads or writes.
+
+    Returns None if the models cannot be known, i.e. for raw queries.
+    """
+    if model is None:
+        return None
+
+    tags: Set[str] = {model}
+    _collect_tags(model, arguments, relational_field_mappings, tags)
+    if include is not None:
+        _collect_tags(model, include, relational_field_mappings, tags)
+
+    if method in _CASCADING_METHODS:
+        pending = [model]
+        while pending:
+            for related in relational_field_mappings.get(pending.pop(), {}).values():
+                if related not in tags:
+                    tags.add(related)
+                    pending.append(related)
+
+    return frozenset(tags)
+
+
+def _collect_tags(
+    model: str,
+    value: Any,
+    relational_field_mappings: Mapping[str, Mapping[str, str]],
+    tags: Set[str],
+) -> None:
+    # this intentionally over-approximates, e.g. a JSON filter with a key that matches the
+    # name of a relational field will also add the related model
+    if isinstance(value, Mapping):
+        fields = relational_field_mappings.get(model, {})
+        for key, child in value.items():
+            related = fields.get(key)
+            if related is not None:
+                tags.add(related)
+                _collect_tags(related, child, relational_field_mappings, tags)
+            else:
+                _collect_tags(model, child, relational_field_mappings, tags)
+    elif isinstance(value, (list, tuple)):
+        for child in value:
+            _collect_tags(model, child, relational_field_mappings, tags)
+
+
+class _Entry:
+    __slots__ = ('value', 'tags', 'expires_at')
+
+    def __init__(self, value: Any, tags: FrozenSet[str], expires_at: Optional[float]) -> None:
+        self.value = value
+        self.tags = tags
+        self.expires_at = expires_at
+
+
+class QueryCache:
+    """A thread-safe LRU cache of query results that are invalidated by model.
+
+    Results are only stored if no query has modified the database since the query was sent,
+    this ensures that a slow query cannot store a result that was invalidated while it was running.
+    """
+
+    max_size: int
+
+    def __init__(self, config: CacheConfig | None = None) -> None:
+        config = config or {}
+        self.max_size = config.get('max_size', DEFAULT_CACHE_MAX_SIZE)
+        if self.max_size < 1:
+            raise ValueError(f'Expected `max_size` to be at least 1 but got {self.max_size}')
+
+        ttl = config.get('ttl')
+        self._ttl = _seconds('ttl', ttl) if ttl is not None else None
+        self._model_ttls = {
+            model: _seconds(f'model_ttls.{model}', model_ttl)
+            for model, model_ttl in config.get('model_ttls', {}).items()
+        }
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        # models that have been modified by transactions that haven't finished yet,
+        # the results of queries that select these models are not stored until then
+        self._pending: Dict[TransactionId, Set[str]] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Incremented every time the cache is invalidated"""
+        return self._generation
+
+    def get(self, key: str) -> Any:
+        """Returns a copy of the stored result for the given key or raises a KeyError"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                raise KeyError(key)
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            value = entry.value
+
+        # results are shared between every caller so a copy must be returned to stop
+        # callers from modifying the stored result
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, *, tags: FrozenSet[str], generation: int) -> None:
+        """Store the result for the given key if the cache has not been invalidated since `generation`"""
+        with self._lock:
+            if generation != self._generation:
+                log.debug('Not caching query result as the cache has been invalidated')
+                return
+
+            if any('*' in modified or not tags.isdisjoint(modified) for modified in self._pending.values()):
+                log.debug('Not caching query result as a transaction has modified one of its models')
+                return
+
+            self._entries[key] = _Entry(copy.deepcopy(value), tags, self._expires_at(tags))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, tags: Optional[Iterable[str]], *, tx_id: Optional[TransactionId] = None) -> None:
+        """Remove every result that is tagged with any of the given models, every result is removed if tags is None.
+
+        If the models were modified within a transaction then results for the models will not be stored
+        until `release()` is called for the transaction.
+        """
+        with self._lock:
+            self._generation += 1
+
+            if tags is None:
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+                if tx_id is not None:
+                    self._pending.setdefault(tx_id, set()).add('*')
+                return
+
+            tags = frozenset(tags)
+            if tx_id is not None:
+                self._pending.setdefault(tx_id, set()).update(tags)
+
+            stale = [key for key, entry in self._entries.items() if not entry.tags.isdisjoint(tags)]
+            for key in stale:
+                del self._entries[key]
+
+            self._invalidations += len(stale)
+
+    def release(self, tx_id: TransactionId) -> None:
+        """Invalidate the models that were modified within the given transaction now that it has finished"""
+        with self._lock:
+            modified = self._pending.pop(tx_id, None)
+
+        if modified:
+            self.invalidate(None if '*' in modified else modified)
+
+    def clear(self) -> None:
+        """Remove every stored result"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+    def _expires_at(self, tags: FrozenSet[str]) -> Optional[float]:
+        ttls = [self._model_ttls[tag] for tag in tags if tag in self._model_ttls]
+        if not ttls and self._ttl is not None:
+            ttls.append(self._ttl)
+
+        if not ttls:
+            return None
+
+        return time.monotonic() + min(ttls)
+
+
+def _seconds(name: str, value: timedelta) -> float:
+    if not isinstance(value, timedelta):
+        raise TypeError(f'Expected `{name}` to be a `datetime.timedelta` instance but got {type(value)}')
+    return value.total_seconds()
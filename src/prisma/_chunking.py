@@ -0,0 +1,203 @@
+"""Splitting large `create_many()` inputs into multiple queries.
+
+Sending every record in a single query requires the entire query to be built, serialised and
+parsed by the query engine at once which can use a lot of memory for large inputs. Splitting
+the records into chunks bounds the memory usage and allows the chunks to be sent concurrently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Set, List, Tuple, TypeVar, Callable, Iterable, Iterator, Optional, Awaitable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from ._types import CreateManyProgress
+from ._builder import dumps
+
+__all__ = (
+    'iter_chunks',
+    'run_chunks',
+    'arun_chunks',
+)
+
+_T = TypeVar('_T')
+
+ProgressCallback = Callable[[CreateManyProgress], None]
+
+
+def _validate(chunk_size: Optional[int], max_chunk_bytes: Optional[int], concurrency: int) -> None:
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f'Expected `chunk_size` to be at least 1 but got {chunk_size}')
+
+    if max_chunk_bytes is not None and max_chunk_bytes < 1:
+        raise ValueError(f'Expected `max_chunk_bytes` to be at least 1 but got {max_chunk_bytes}')
+
+    if concurrency < 1:
+        raise ValueError(f'Expected `concurrency` to be at least 1 but got {concurrency}')
+
+
+def iter_chunks(
+    rows: Iterable[_T],
+    *,
+    chunk_size: Optional[int] = None,
+    max_chunk_bytes: Optional[int] = None,
+) -> Iterator[List[_T]]:
+    """Lazily split the given rows into lists of at most `chunk_size` rows.
+
+    If `max_chunk_bytes` is given, a chunk is also ended before the JSON size of its rows would
+    exceed the given number of bytes. A row that is larger than `max_chunk_bytes` by itself is sent
+    in its own chunk.
+
+    If neither option is given then every row is yielded in a single chunk.
+    """
+    _validate(chunk_size, max_chunk_bytes, 1)
+
+    if chunk_size is None and max_chunk_bytes is None:
+        chunk = rows if isinstance(rows, list) else list(rows)
+        if chunk:
+            yield chunk
+        return
+
+    chunk = []
+    size = 0
+    for row in rows:
+        if max_chunk_bytes is not None:
+            row_size = len(dumps(row).encode('utf-8'))
+            if chunk and size + row_size > max_chunk_bytes:
+                yield chunk
+                chunk = []
+                size = 0
+            size += row_size
+
+        chunk.append(row)
+        if chunk_size is not None and len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+            size = 0
+
+    if chunk:
+        yield chunk
+
+
+class _Progress:
+    __slots__ = ('chunks', 'rows', 'created', 'callback')
+
+    def __init__(self, callback: Optional[ProgressCallback]) -> None:
+        self.chunks = 0
+        self.rows = 0
+        self.created = 0
+        self.callback = callback
+
+    def update(self, rows: int, created: int) -> None:
+        self.chunks += 1
+        self.rows += rows
+        self.created += created
+        if self.callback is not None:
+            self.callback(CreateManyProgress(chunks=self.chunks, rows=self.rows, created=self.created))
+
+
+def run_chunks(
+    execute: Callable[[List[_T]], int],
+    chunks: Iterable[List[_T]],
+    *,
+    concurrency: int = 1,
+    on_progress: Optional[ProgressCallback] = None,
+) -> int:
+    """Call `execute` for every chunk, with at most `concurrency` chunks running at once in a thread pool.
+
+    Chunks are only taken from the given iterable when there is capacity to send them so that at most
+    `concurrency` chunks are held in memory at once. Returns the sum of every `execute` result.
+
+    If any chunk fails, no more chunks are sent and the error is raised once the chunks that are
+    currently running have finished.
+    """
+    _validate(None, None, concurrency)
+    progress = _Progress(on_progress)
+
+    if concurrency == 1:
+        for chunk in chunks:
+            progress.update(len(chunk), execute(chunk))
+        return progress.created
+
+    def run(chunk: List[_T]) -> Tuple[int, int]:
+        return len(chunk), execute(chunk)
+
+    iterator = iter(chunks)
+    running: Set[Future[Tuple[int, int]]] = set()
+    error: Optional[BaseException] = None
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='prisma-create-many') as executor:
+        while True:
+            while error is None and len(running) < concurrency:
+                chunk = next(iterator, None)
+                if chunk is None:
+                    break
+                running.add(executor.submit(run, chunk))
+
+            if not running:
+                break
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                if exc is not None:
+                    error = error or exc
+                elif error is None:
+                    progress.update(*future.result())
+
+    if error is not None:
+        raise error
+
+    return progress.created
+
+
+async def arun_chunks(
+    execute: Callable[[List[_T]], Awaitable[int]],
+    chunks: Iterable[List[_T]],
+    *,
+    concurrency: int = 1,
+    on_progress: Optional[ProgressCallback] = None,
+) -> int:
+    """Await `execute` for every chunk, with at most `concurrency` chunks running at once.
+
+    Chunks are only taken from the given iterable when there is capacity to send them so that at most
+    `concurrency` chunks are held in memory at once. Returns the sum of every `execute` result.
+
+    If any chunk fails, the chunks that are currently running are cancelled and the error is raised.
+    """
+    _validate(None, None, concurrency)
+    progress = _Progress(on_progress)
+
+    if concurrency == 1:
+        for chunk in chunks:
+            progress.update(len(chunk), await execute(chunk))
+        return progress.created
+
+    async def run(chunk: List[_T]) -> Tuple[int, int]:
+        return len(chunk), await execute(chunk)
+
+    iterator = iter(chunks)
+    running: Set[asyncio.Task[Tuple[int, int]]] = set()
+
+    try:
+        while True:
+            while len(running) < concurrency:
+                chunk = next(iterator, None)
+                if chunk is None:
+                    break
+                running.add(asyncio.ensure_future(run(chunk)))
+
+            if not running:
+                break
+
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                progress.update(*task.result())
+    finally:
+        for task in running:
+            task.cancel()
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    return progress.created
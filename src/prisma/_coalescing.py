@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Set, List, Tuple, Optional
+from datetime import timedelta
+
+from ._types import CoalesceConfig
+from ._builder import QueryBuilder
+from ._constants import DEFAULT_COALESCE_MAX_WAIT, DEFAULT_COALESCE_MAX_BATCH_SIZE
+from .engine.utils import get_batch_item_error
+from .engine.errors import EngineError
+
+if TYPE_CHECKING:
+    from ._base_client import AsyncBasePrisma
+
+__all__ = ('FindUniqueCoalescer',)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_Pending = Tuple[QueryBuilder, 'asyncio.Future[Any]']
+
+
+class FindUniqueCoalescer:
+    """Groups `find_unique()` queries that are made at the same time into a single batched request.
+
+    The query engine compacts batches of `findUnique` queries for the same model into a single
+    `SELECT ... WHERE id IN (...)` query, so coalescing them saves both a request to the query
+    engine and a round trip to the database for every query after the first.
+
+    Queries are sent once `max_batch_size` queries are waiting or after `max_wait` has elapsed
+    since the first query was added, whichever happens first.
+    """
+
+    max_batch_size: int
+    max_wait: float
+
+    def __init__(self, client: AsyncBasePrisma, config: CoalesceConfig | None = None) -> None:
+        config = config or {}
+        self.max_batch_size = config.get('max_batch_size', DEFAULT_COALESCE_MAX_BATCH_SIZE)
+        if self.max_batch_size < 1:
+            raise ValueError(f'Expected `max_batch_size` to be at least 1 but got {self.max_batch_size}')
+
+        max_wait = config.get('max_wait', DEFAULT_COALESCE_MAX_WAIT)
+        if not isinstance(max_wait, timedelta):
+            raise TypeError(f'Expected `max_wait` to be a `datetime.timedelta` instance but got {type(max_wait)}')
+
+        self.max_wait = max_wait.total_seconds()
+        self._client = client
+        self._pending: List[_Pending] = []
+        self._handle: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    async def execute(self, builder: QueryBuilder) -> Any:
+        """Add the query to the next batch and wait for its response"""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._pending.append((builder, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._handle is None:
+            if self.max_wait > 0:
+                self._handle = loop.call_later(self.max_wait, self._flush)
+            else:
+                self._handle = loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        pending = self._pending
+        self._pending = []
+        if not pending:
+            return
+
+        # keep a reference to the task so that it isn't garbage collected before it finishes
+        task = asyncio.ensure_future(self._send(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, pending: List[_Pending]) -> None:
+        client = self._client
+        try:
+            if len(pending) == 1:
+                builder, future = pending[0]
+                content = client._json_codec.dumps(builder.build_payload())
+                response = await client._engine.query(content, tx_id=None)
+                if not future.done():
+                    future.set_result(builder.process_response(response))
+                return
+
+            payload = client._query_builder_class.build_batch_payload(
+                [builder.build_batch_item() for builder, _ in pending],
+                transaction=False,
+            )
+            log.debug('Coalesced %i find_unique queries into a single request', len(pending))
+            response = await client._engine.query(client._json_codec.dumps(payload), tx_id=None)
+            results = response['batchResult']
+
+            for (builder, future), result in zip(pending, results):
+                if future.done():
+                    # the caller was cancelled
+                    continue
+
+                try:
+                    errors = result.get('errors')
+                    if errors:
+                        future.set_exception(get_batch_item_error(errors))
+                    else:
+                        future.set_result(builder.process_response(result))
+                except Exception as exc:
+                    future.set_exception(exc)
+
+            if len(results) < len(pending):
+                # the callers that did not receive a result are given this error below
+                raise EngineError(
+                    f'Expected {len(pending)} results from a batched request but only received {len(results)}'
+                )
+        except asyncio.CancelledError:
+            for _, future in pending:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
@@ -0,0 +1,198 @@
+"""Transposing query results into columns.
+
+Analytics code commonly turns the results of `find_many()` and `group_by()` into columns, e.g. to
+pass them to NumPy, which makes building a model for every record wasted work. Instead the decoded
+response is transposed in a single pass, converting each value based on the type of the model field
+that it belongs to.
+
+Numeric columns are returned as `array.array` or as a NumPy array if NumPy is installed, boolean
+columns are also returned as NumPy arrays. Every other column, and any column containing null
+values, is returned as a list.
+"""
+
+from __future__ import annotations
+
+import array
+import functools
+from typing import Any, Dict, List, Tuple, Union, Mapping, Optional, Sequence, NamedTuple
+from typing_extensions import get_args, get_origin
+
+from pydantic import BaseModel
+
+from ._compat import numpy, model_field_aliases, model_field_annotations
+from ._hydration import Converter, _NoneType, _convert_float, _make_converter, _UnsupportedType, _uses_enum_values
+
+__all__ = (
+    'find_many_columns',
+    'group_by_columns',
+)
+
+Columns = Dict[str, Any]
+
+# the `array.array` typecode for each numeric type, `?` is only used for NumPy arrays
+_TYPECODES: Dict[Any, str] = {
+    int: 'q',
+    float: 'd',
+    bool: '?',
+}
+
+_NUMPY_DTYPES: Dict[str, str] = {
+    'q': 'int64',
+    'd': 'float64',
+    '?': 'bool',
+}
+
+
+class _FieldType(NamedTuple):
+    name: str
+    convert: Optional[Converter]
+    typecode: Optional[str]
+
+
+class _Column(NamedTuple):
+    """A single column, read from `row[key]` or `row[group][key]` if `group` is given"""
+
+    name: str
+    key: str
+    group: Optional[str]
+    convert: Optional[Converter]
+    typecode: Optional[str]
+
+
+def find_many_columns(model: type[BaseModel], rows: Sequence[Mapping[str, Any]]) -> Columns:
+    """Transpose the results of a `find_many()` query into a column for every scalar field of the model"""
+    columns = tuple(
+        _Column(name=field.name, key=key, group=None, convert=field.convert, typecode=field.typecode)
+        for key, field in _get_field_types(model).items()
+    )
+    return _to_columns(rows, columns)
+
+
+def group_by_columns(
+    model: type[BaseModel],
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    by: Sequence[str],
+    avg: Optional[Mapping[str, Any]] = None,
+    sum: Optional[Mapping[str, Any]] = None,
+    min: Optional[Mapping[str, Any]] = None,
+    max: Optional[Mapping[str, Any]] = None,
+    count: Optional[Union[bool, Mapping[str, Any]]] = None,
+) -> Columns:
+    """Transpose the results of a `group_by()` query into columns.
+
+    Aggregated columns are nested under the key that they are returned in, e.g. `columns['_sum']['views']`.
+    """
+    fields = _get_field_types(model)
+    columns: List[_Column] = [_field_column(fields, key) for key in by]
+
+    if avg is not None:
+        for key in _selected(avg):
+            field = fields.get(key)
+            if field is not None and field.typecode is None:
+                # averages of decimal fields are returned as decimals
+                columns.append(_field_column(fields, key, group='_avg'))
+            else:
+                columns.append(_Column(name=key, key=key, group='_avg', convert=_convert_float, typecode='d'))
+
+    for group, select in (('_sum', sum), ('_min', min), ('_max', max)):
+        if select is not None:
+            columns.extend(_field_column(fields, key, group=group) for key in _selected(select))
+
+    if count is not None:
+        keys = ['_all'] if count is True else _selected(count) if isinstance(count, Mapping) else []
+        columns.extend(_Column(name=key, key=key, group='_count', convert=None, typecode='q') for key in keys)
+
+    return _to_columns(rows, columns)
+
+
+def _selected(select: Mapping[str, Any]) -> List[str]:
+    return [key for key, value in select.items() if value is True]
+
+
+def _field_column(fields: Mapping[str, _FieldType], key: str, *, group: Optional[str] = None) -> _Column:
+    field = fields.get(key)
+    if field is None:
+        return _Column(name=key, key=key, group=group, convert=None, typecode=None)
+    return _Column(name=key, key=key, group=group, convert=field.convert, typecode=field.typecode)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_field_types(model: type[BaseModel]) -> Dict[str, _FieldType]:
+    """Returns the type of every scalar field of the given model, keyed by the name the query engine uses"""
+    use_enum_values = _uses_enum_values(model)
+    aliases = model_field_aliases(model)
+
+    fields: Dict[str, _FieldType] = {}
+    for name, annotation in model_field_annotations(model).items():
+        annotation = _unwrap_optional(annotation)
+        if _is_relation(annotation):
+            continue
+
+        try:
+            convert = _make_converter(annotation, use_enum_values=use_enum_values)
+        except _UnsupportedType:
+            convert = None
+
+        fields[aliases[name]] = _FieldType(name=name, convert=convert, typecode=_TYPECODES.get(annotation))
+
+    return fields
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not _NoneType]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_relation(annotation: Any) -> bool:
+    if get_origin(annotation) in (list, List):
+        args = get_args(annotation)
+        annotation = _unwrap_optional(args[0]) if args else None
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _to_columns(rows: Sequence[Mapping[str, Any]], columns: Sequence[_Column]) -> Columns:
+    values: List[List[Any]] = [[] for _ in columns]
+    plan: List[Tuple[str, Optional[str], Any, Optional[Converter]]] = [
+        (column.key, column.group, column_values.append, column.convert)
+        for column, column_values in zip(columns, values)
+    ]
+
+    for row in rows:
+        for key, group, append, convert in plan:
+            if group is None:
+                value = row.get(key)
+            else:
+                grouped = row.get(group)
+                value = None if grouped is None else grouped.get(key)
+
+            if value is not None and convert is not None:
+                value = convert(value)
+
+            append(value)
+
+    result: Columns = {}
+    for column, column_values in zip(columns, values):
+        data = _finalize(column_values, column.typecode)
+        if column.group is None:
+            result[column.name] = data
+        else:
+            result.setdefault(column.group, {})[column.name] = data
+
+    return result
+
+
+def _finalize(values: List[Any], typecode: Optional[str]) -> Any:
+    if typecode is None or None in values:
+        return values
+
+    if numpy is not None:
+        return numpy.array(values, dtype=_NUMPY_DTYPES[typecode])
+
+    if typecode == '?':
+        return values
+
+    return array.array(typecode, values)
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import os
 import sys
-from typing import TYPE_CHECKING, Any, TypeVar, Callable, cast
+import functools
+from typing import TYPE_CHECKING, Any, TypeVar, Callable, cast, get_type_hints
 from asyncio import get_running_loop as get_running_loop
+from typing_extensions import Annotated
 
 import pydantic
 from pydantic import BaseModel
@@ -235,6 +237,168 @@ def model_field_type(field: FieldInfo) -> type | None:
     return field.type_  # type: ignore
 
 
+def model_field_annotations(model: type[BaseModel]) -> dict[str, Any]:
+    """Returns the resolved type annotation of every field, including any `Optional` and `List` wrappers"""
+    if PYDANTIC_V2:
+        return {name: field.annotation for name, field in model.model_fields.items()}
+
+    # pydantic v1 unwraps the annotation when creating the field so we have to resolve it ourselves
+    hints = get_type_hints(model)
+    return {name: hints[name] for name in model.__fields__}  # type: ignore
+
+
+def model_field_aliases(model: type[BaseModel]) -> dict[str, str]:
+    """Returns the key that the value of every field is given in when parsing data"""
+    if PYDANTIC_V2:
+        return {name: field.alias or name for name, field in model.model_fields.items()}
+    return {name: field.alias for name, field in model.__fields__.items()}  # type: ignore
+
+
+def model_validator_names(model: type[BaseModel]) -> set[str]:
+    """Returns the name of every custom validator function defined on the given model"""
+    if PYDANTIC_V2:
+        decorators = model.__pydantic_decorators__
+        return {
+            *decorators.validators,
+            *decorators.field_validators,
+            *decorators.root_validators,
+            *decorators.model_validators,
+        }
+
+    names = {
+        validator.func.__name__
+        for validators in model.__validators__.values()  # type: ignore
+        for validator in validators
+    }
+    names.update(func.__name__ for func in model.__pre_root_validators__)  # type: ignore
+    names.update(func.__name__ for _, func in model.__post_root_validators__)  # type: ignore
+    return names
+
+
+def model_has_root_validators(model: type[BaseModel]) -> bool:
+    """Returns True if the given model defines validators that run on every field at once"""
+    if PYDANTIC_V2:
+        decorators = model.__pydantic_decorators__
+        return bool(decorators.root_validators or decorators.model_validators)
+
+    return bool(model.__pre_root_validators__ or model.__post_root_validators__)  # type: ignore
+
+
+def model_field_validator(model: type[BaseModel], name: str) -> Callable[[Any], Any]:
+    """Returns a function that validates the value of a single field, including any validators for that field"""
+    if PYDANTIC_V2:
+        if not _has_field_validators(model, name):
+            field_info = model.model_fields[name]
+            try:
+                adapter = pydantic.TypeAdapter(
+                    Annotated[field_info.annotation, field_info],  # type: ignore
+                    config=model.model_config,
+                )
+            except pydantic.PydanticUserError:
+                # the config cannot be given for some types, e.g. models
+                pass
+            else:
+                return adapter.validator.validate_python
+
+        construct = model_constructor(model)
+
+        def validate(value: Any) -> Any:
+            # validating an assignment is the only way to validate a single field with the
+            # configuration and validators of the model
+            instance = construct({}, set())
+            model.__pydantic_validator__.validate_assignment(instance, name, value)
+            return instance.__dict__[name]
+
+        return validate
+
+    field = model.__fields__[name]  # type: ignore
+
+    def validate_v1(value: Any) -> Any:
+        result, errors = field.validate(value, {}, loc=name, cls=model)
+        if errors:
+            raise pydantic.ValidationError([errors], model)  # type: ignore
+        return result
+
+    return validate_v1
+
+
+def _has_field_validators(model: type[BaseModel], name: str) -> bool:
+    decorators = model.__pydantic_decorators__
+    for decorator in (*decorators.validators.values(), *decorators.field_validators.values()):
+        if name in decorator.info.fields or '*' in decorator.info.fields:
+            return True
+    return False
+
+
+def model_field_defaults(model: type[BaseModel]) -> dict[str, Callable[[], Any]]:
+    """Returns a function that creates the default value for every field that is not required"""
+    defaults: dict[str, Callable[[], Any]] = {}
+    if PYDANTIC_V2:
+        for name, field in model.model_fields.items():
+            if field.is_required():
+                continue
+
+            if field.default_factory is None and isinstance(field.default, _IMMUTABLE_TYPES):
+                defaults[name] = _constant(field.default)
+            else:
+                defaults[name] = functools.partial(field.get_default, call_default_factory=True)
+    else:
+        for name, field in model.__fields__.items():  # type: ignore
+            if field.required:
+                continue
+
+            if field.default_factory is None and isinstance(field.default, _IMMUTABLE_TYPES):
+                defaults[name] = _constant(field.default)
+            else:
+                defaults[name] = field.get_default
+
+    return defaults
+
+
+_IMMUTABLE_TYPES = (type(None), str, bytes, int, float, bool)
+
+
+def _constant(value: object) -> Callable[[], Any]:
+    return lambda: value
+
+
+def model_constructor(model: type[_ModelT]) -> Callable[[dict[str, Any], set[str]], _ModelT]:
+    """Returns a function that creates a model instance from the already validated value of every field
+    and the names of the fields that were explicitly set.
+
+    This is equivalent to `model_construct()` but skips resolving aliases and defaults for every instance.
+    """
+    if PYDANTIC_V2:
+        if model.__pydantic_post_init__ or model.__pydantic_root_model__ or model.model_config.get('extra') == 'allow':
+            return lambda values, fields_set: model.model_construct(fields_set, **values)
+
+        new = model.__new__
+        set_fields_set = BaseModel.__pydantic_fields_set__.__set__  # type: ignore
+        set_extra = BaseModel.__pydantic_extra__.__set__  # type: ignore
+        set_private = BaseModel.__pydantic_private__.__set__  # type: ignore
+
+        def construct(values: dict[str, Any], fields_set: set[str]) -> _ModelT:
+            instance = new(model)
+            object.__setattr__(instance, '__dict__', values)
+            set_fields_set(instance, fields_set)
+            set_extra(instance, None)
+            set_private(instance, None)
+            return instance
+
+        return construct
+
+    if model.__private_attributes__:  # type: ignore
+        return lambda values, fields_set: model.construct(fields_set, **values)  # pyright: ignore[reportDeprecated]
+
+    def construct_v1(values: dict[str, Any], fields_set: set[str]) -> _ModelT:
+        instance = model.__new__(model)
+        object.__setattr__(instance, '__dict__', values)
+        object.__setattr__(instance, '__fields_set__', fields_set)
+        return instance
+
+    return construct_v1
+
+
 def model_copy(model: _ModelT, deep: bool = False) -> _ModelT:
     if PYDANTIC_V2:
         return model.model_copy(deep=deep)
@@ -342,6 +506,35 @@ else:
         nodejs = None
 
 
+if TYPE_CHECKING:
+    import orjson as _orjson
+    import msgspec as _msgspec
+
+    orjson = make_optional(_orjson)
+    msgspec = make_optional(_msgspec)
+else:
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    try:
+        import msgspec
+    except ImportError:
+        msgspec = None
+
+
+if TYPE_CHECKING:
+    import numpy as _numpy
+
+    numpy = make_optional(_numpy)
+else:
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+
 # Note: this shim is due to an inconsistency with string enums
 # that was fixed in Python3.11, for reference see:
 # - https://blog.pecar.me/python-enum#there-be-dragons
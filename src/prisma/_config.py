@@ -2,6 +2,7 @@
 # pyright: reportIncompatibleVariableOverride=false
 from __future__ import annotations
 
+import tempfile
 from typing import TYPE_CHECKING, List, Union, ClassVar, Optional
 from pathlib import Path
 from typing_extensions import override
@@ -71,6 +72,12 @@ class DefaultConfig(BaseSettings):
         default_factory=lambda: Path.home() / '.cache' / 'prisma-python' / 'nodeenv',
     )
 
+    # Where to store the lockfiles used to share a query engine between processes
+    engine_lock_dir: Path = Field(
+        env='PRISMA_ENGINE_LOCK_DIR',
+        default_factory=lambda: Path(tempfile.gettempdir()) / 'prisma-python' / 'engines',
+    )
+
     if PYDANTIC_V2:
         model_config: ClassVar[ConfigDict] = ConfigDict(extra='ignore')
     else:
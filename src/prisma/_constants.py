@@ -4,6 +4,9 @@ from datetime import timedelta
 DEFAULT_CONNECT_TIMEOUT: timedelta = timedelta(seconds=10)
 DEFAULT_TX_MAX_WAIT: timedelta = timedelta(milliseconds=2000)
 DEFAULT_TX_TIMEOUT: timedelta = timedelta(milliseconds=5000)
+DEFAULT_COALESCE_MAX_BATCH_SIZE: int = 100
+DEFAULT_COALESCE_MAX_WAIT: timedelta = timedelta(0)
+DEFAULT_CACHE_MAX_SIZE: int = 1000
 
 # key aliases to transform query arguments to make them more pythonic
 QUERY_BUILDER_ALIASES: Dict[str, str] = {
@@ -0,0 +1,257 @@
+"""Creating models from query engine results without running pydantic validation.
+
+The query engine has already validated every value that it returns against the schema, so
+running the full pydantic validation for every field of every record is redundant. Instead,
+a plan is built for each model that only converts the values which are represented differently
+in JSON, e.g. `DateTime` strings, and the model is then constructed from the converted values.
+
+With pydantic v1 this is significantly faster than validating the data, with pydantic v2 the
+validation runs in Rust and the difference is much smaller.
+"""
+
+from __future__ import annotations
+
+import enum
+import json
+import logging
+import datetime
+import functools
+from typing import Any, Set, Dict, List, Tuple, Union, Mapping, TypeVar, Callable, Optional, FrozenSet, cast
+from decimal import Decimal
+from typing_extensions import get_args, get_origin
+
+import pydantic
+from pydantic import BaseModel
+
+from ._compat import (
+    PYDANTIC_V2,
+    model_parse,
+    model_constructor,
+    model_field_aliases,
+    model_field_defaults,
+    model_validator_names,
+    model_field_annotations,
+)
+from ._fields import Json, Base64
+
+__all__ = (
+    'get_model_parser',
+    'get_hydrator',
+    'convert_json',
+    'convert_datetime',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_ModelT = TypeVar('_ModelT', bound=BaseModel)
+
+Converter = Callable[[Any], Any]
+
+# validators that are defined by the generated models and are handled by the converters here
+BUILTIN_VALIDATORS = frozenset({'_transform_required_list_fields'})
+
+_NoneType = type(None)
+
+
+class _UnsupportedType(Exception):
+    pass
+
+
+def get_model_parser(
+    model: type[_ModelT],
+    *,
+    validate: bool,
+    hydrators: Optional[Mapping[type[BaseModel], Callable[[Any], BaseModel]]] = None,
+) -> Callable[[Any], _ModelT]:
+    """Returns a function that creates an instance of the given model from a query engine result.
+
+    `hydrators` are the functions that the generator creates for every model, these are preferred
+    as they do not have to look up how to convert each field at runtime.
+    """
+    if validate:
+        return functools.partial(model_parse, model)
+
+    if hydrators is not None:
+        # subclasses of the generated models may define their own fields or validators
+        hydrator = hydrators.get(model)
+        if hydrator is not None:
+            return cast(Callable[[Any], _ModelT], hydrator)
+
+    return get_hydrator(model)
+
+
+@functools.lru_cache(maxsize=None)
+def get_hydrator(model: type[_ModelT]) -> Callable[[Any], _ModelT]:
+    """Returns a function that creates an instance of the given model without validating the data.
+
+    Models that define their own validators or have fields with types that we do not know how to
+    convert are always validated.
+    """
+    custom_validators = model_validator_names(model) - BUILTIN_VALIDATORS
+    if custom_validators:
+        log.debug('Validating %s results as it defines custom validators: %s', model.__name__, custom_validators)
+        return functools.partial(model_parse, model)
+
+    use_enum_values = _uses_enum_values(model)
+    aliases = model_field_aliases(model)
+    defaults = model_field_defaults(model)
+    try:
+        plan: Tuple[Tuple[str, str, Optional[Converter], Optional[Callable[[], Any]]], ...] = tuple(
+            (aliases[name], name, _make_converter(annotation, use_enum_values=use_enum_values), defaults.get(name))
+            for name, annotation in model_field_annotations(model).items()
+        )
+    except _UnsupportedType as exc:
+        log.debug('Validating %s results as the %s type is not supported', model.__name__, exc.args[0])
+        return functools.partial(model_parse, model)
+
+    construct = model_constructor(model)
+
+    def hydrate(data: Any) -> _ModelT:
+        values: Dict[str, Any] = {}
+        fields_set: Set[str] = set()
+        for key, name, convert, default in plan:
+            if key in data:
+                value = data[key]
+                values[name] = value if convert is None else convert(value)
+                fields_set.add(name)
+            elif default is not None:
+                values[name] = default()
+
+        return construct(values, fields_set)
+
+    return hydrate
+
+
+def _uses_enum_values(model: type[BaseModel]) -> bool:
+    if PYDANTIC_V2:
+        return bool(model.model_config.get('use_enum_values'))
+    return bool(model.__config__.use_enum_values)  # type: ignore
+
+
+def _make_converter(annotation: Any, *, use_enum_values: bool) -> Optional[Converter]:
+    """Returns a function that converts the JSON representation of the given type or None if no conversion is needed"""
+    if annotation in _PASSTHROUGH_TYPES:
+        return None
+
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not _NoneType]
+        if len(args) != 1:
+            raise _UnsupportedType(annotation)
+
+        inner = _make_converter(args[0], use_enum_values=use_enum_values)
+        if inner is None:
+            return None
+
+        return functools.partial(_convert_optional, inner)
+
+    if origin is list or origin is List:
+        (item,) = get_args(annotation)
+        inner = _make_converter(item, use_enum_values=use_enum_values)
+        if inner is None:
+            return _convert_list_passthrough
+
+        return functools.partial(_convert_list, inner)
+
+    converter = _SCALAR_CONVERTERS.get(annotation)
+    if converter is not None:
+        return converter
+
+    if isinstance(annotation, type):
+        if issubclass(annotation, enum.Enum):
+            # the models store the value of the enum member instead of the member itself
+            # and the query engine only returns valid members, so the value can be used as-is
+            return None if use_enum_values else annotation
+
+        if issubclass(annotation, BaseModel):
+            return _make_relation_converter(annotation)
+
+        if issubclass(annotation, Json):
+            return convert_json
+
+        if issubclass(annotation, Base64):
+            return annotation.fromb64
+
+    raise _UnsupportedType(annotation)
+
+
+def _make_relation_converter(model: type[BaseModel]) -> Converter:
+    # the hydrator for the related model is resolved lazily as models can reference each other
+    hydrate: Optional[Callable[[Any], BaseModel]] = None
+
+    def convert(value: Any) -> BaseModel:
+        nonlocal hydrate
+        if hydrate is None:
+            hydrate = get_hydrator(model)
+        return hydrate(value)
+
+    return convert
+
+
+def _convert_optional(inner: Converter, value: Any) -> Any:
+    return None if value is None else inner(value)
+
+
+def _convert_list(inner: Converter, value: Any) -> Any:
+    # raw queries can return None for array fields that have not been set
+    if value is None:
+        return []
+    return [inner(item) for item in value]
+
+
+def _convert_list_passthrough(value: Any) -> Any:
+    if value is None:
+        return []
+    return value
+
+
+def _convert_int(value: Any) -> int:
+    # BigInt values are returned as strings
+    return value if type(value) is int else int(value)
+
+
+def _convert_float(value: Any) -> float:
+    return value if type(value) is float else float(value)
+
+
+def _convert_decimal(value: Any) -> Decimal:
+    if isinstance(value, (str, int)):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+def convert_json(value: Any) -> Any:
+    if isinstance(value, (str, bytes)):
+        return json.loads(value)
+    return value
+
+
+def convert_datetime(value: Any) -> datetime.datetime:
+    if isinstance(value, str):
+        try:
+            # `fromisoformat()` only supports the `Z` suffix from Python 3.11 onwards
+            if value.endswith('Z'):
+                return datetime.datetime.fromisoformat(value[:-1] + '+00:00')
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            pass
+
+    # fallback to pydantic for any formats that `fromisoformat()` does not support,
+    # e.g. nanosecond precision
+    return _validate_datetime(value)
+
+
+if PYDANTIC_V2:
+    _validate_datetime: Callable[[Any], datetime.datetime] = pydantic.TypeAdapter(datetime.datetime).validate_python
+else:
+    _validate_datetime = functools.partial(pydantic.parse_obj_as, datetime.datetime)  # type: ignore
+
+
+_PASSTHROUGH_TYPES: FrozenSet[Any] = frozenset({str, bool, Any})
+
+_SCALAR_CONVERTERS: Dict[Any, Converter] = {
+    int: _convert_int,
+    float: _convert_float,
+    Decimal: _convert_decimal,
+    datetime.datetime: convert_datetime,
+}
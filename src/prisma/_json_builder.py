@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import re
+import json
+import decimal
+import logging
+import datetime
+from typing import TYPE_CHECKING, Any, Dict, Union
+from functools import singledispatch
+from typing_extensions import override
+
+from . import fields
+from .utils import DEBUG
+from ._types import PrismaMethod
+from ._builder import ITERABLES, RAW_METHODS, QueryBuilder, dumps, serializer, serialize_datetime
+
+if TYPE_CHECKING:
+    from .bases import _PrismaModel as PrismaModel  # noqa: TID251
+
+
+__all__ = (
+    'JsonQueryBuilder',
+    'deserialize_json_response',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# https://github.com/prisma/prisma-engines/blob/main/query-engine/request-handlers/src/protocols/json/body.rs
+METHOD_ACTION_MAPPING: dict[PrismaMethod, str] = {
+    'create': 'createOne',
+    'delete': 'deleteOne',
+    'update': 'updateOne',
+    'upsert': 'upsertOne',
+    'query_raw': 'queryRaw',
+    'query_first': 'queryRaw',
+    'create_many': 'createMany',
+    'execute_raw': 'executeRaw',
+    'delete_many': 'deleteMany',
+    'update_many': 'updateMany',
+    'count': 'aggregate',
+    'group_by': 'groupBy',
+    'find_many': 'findMany',
+    'find_first': 'findFirst',
+    'find_first_or_raise': 'findFirstOrThrow',
+    'find_unique': 'findUnique',
+    'find_unique_or_raise': 'findUniqueOrThrow',
+}
+
+TYPE_KEY = '$type'
+VALUE_KEY = 'value'
+
+Selection = Dict[str, Union[bool, Dict[str, Any]]]
+
+SELECTION_TOKEN_PATTERN = re.compile(r'[{}]|[^\s{}]+')
+
+
+class JsonQueryBuilder(QueryBuilder):
+    """Builds request objects for the query engine JSON protocol.
+
+    Unlike the GraphQL builder, the request is built as plain Python objects that
+    are serialised in a single `json.dumps()` call, e.g.
+
+    {
+      "modelName": "User",
+      "action": "findUnique",
+      "query": {
+        "arguments": {"where": {"id": "ckq23ky3003510r8zll5m2hma"}},
+        "selection": {"id": true, "name": true, "profile": {"selection": {"id": true, "bio": true}}}
+      }
+    }
+
+    https://github.com/prisma/prisma/blob/main/packages/engine-core/src/common/types/JsonProtocol.ts
+    """
+
+    __slots__ = ()
+
+    @override
+    def build_payload(self) -> dict[str, Any]:
+        request = self.build_request()
+        if DEBUG:
+            log.debug('Generated query: \n%s', dumps(request, indent=2))
+        return request
+
+    @override
+    def build_query(self, *, pretty: bool = True) -> str:
+        """Build the JSON protocol request"""
+        query = dumps(self.build_request(), indent=2 if pretty else None)
+        log.debug('Generated query: \n%s', query)
+        return query
+
+    @override
+    def build_batch_item(self) -> dict[str, Any]:
+        return self.build_request()
+
+    @classmethod
+    @override
+    def build_batch_payload(cls, items: list[dict[str, Any]], *, transaction: bool = True) -> dict[str, Any]:
+        payload: dict[str, Any] = {'batch': items}
+        if transaction:
+            payload['transaction'] = {}
+        return payload
+
+    @override
+    def process_response(self, data: Any) -> Any:
+        return deserialize_json_response(data, raw=self.method in RAW_METHODS)
+
+    @override
+    def process_result_item(self, item: Any) -> Any:
+        return _untag(item)
+
+    def build_request(self) -> dict[str, Any]:
+        """Build the JSON protocol request object for the current query"""
+        request: dict[str, Any] = {}
+        if self.model is not None:
+            request['modelName'] = self.model.__prisma_model__
+
+        request['action'] = METHOD_ACTION_MAPPING[self.method]
+        request['query'] = {
+            'arguments': self._build_arguments(self.arguments),
+            'selection': self._build_selection(
+                model=self.model,
+                include=self.include,
+                root_selection=self.root_selection,
+            ),
+        }
+        return request
+
+    def _build_arguments(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        if self.method in RAW_METHODS:
+            # raw query parameters are sent as a JSON string
+            return {
+                arg: dumps(value) if isinstance(value, ITERABLES) else encode_value(value)
+                for arg, value in arguments.items()
+                if value is not None
+            }
+
+        # ignore None values for convenience
+        return {arg: encode_value(value) for arg, value in arguments.items() if value is not None}
+
+    def _build_selection(
+        self,
+        *,
+        model: type[PrismaModel] | None,
+        include: dict[str, Any] | None,
+        root_selection: list[str] | None = None,
+    ) -> Selection:
+        selection: Selection = {}
+
+        # root_selection, if present overrides the default fields
+        # for a model as it is used by methods such as count()
+        # that do not support returning model fields
+        if root_selection is not None:
+            for field in root_selection:
+                _parse_selection(field, selection)
+        elif model is not None:
+            for field in self.get_default_fields(model):
+                selection[field] = True
+
+        if include is None:
+            return selection
+
+        if model is None:
+            raise ValueError('Cannot include fields when model is None.')
+
+        for key, value in include.items():
+            if value is True:
+                selection[key] = {
+                    'selection': self._build_selection(
+                        model=self.get_relational_model(current_model=model, field=key),
+                        include=None,
+                    ),
+                }
+            elif isinstance(value, dict):
+                args = value.copy()
+                nested_include = args.pop('include', None)
+                selection[key] = {
+                    'arguments': {arg: encode_value(v) for arg, v in args.items() if v is not None},
+                    'selection': self._build_selection(
+                        model=self.get_relational_model(current_model=model, field=key),
+                        include=nested_include,
+                    ),
+                }
+            elif value is False:
+                continue
+            else:
+                raise TypeError(f'Expected `bool` or `dict` include value but got {type(value)} instead.')
+
+        return selection
+
+
+def _parse_selection(field: str, selection: Selection) -> None:
+    """Parse a GraphQL style selection string, e.g. `_count { _all }` into a JSON protocol selection.
+
+    This is a work around until field selection is added to the query builder.
+    """
+    stack: list[Selection] = [selection]
+    last: str | None = None
+    for token in SELECTION_TOKEN_PATTERN.findall(field):
+        if token == '{':
+            if last is None:
+                raise ValueError(f'Unexpected `{{` in selection: {field!r}')
+
+            nested: Selection = {}
+            stack[-1][last] = {'selection': nested}
+            stack.append(nested)
+            last = None
+        elif token == '}':
+            if len(stack) == 1:
+                raise ValueError(f'Unexpected `}}` in selection: {field!r}')
+
+            stack.pop()
+            last = None
+        else:
+            stack[-1][token] = True
+            last = token
+
+    if len(stack) != 1:
+        raise ValueError(f'Unterminated selection: {field!r}')
+
+
+def encode_value(value: Any) -> Any:
+    """Convert a Python value to its JSON protocol representation"""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+
+    if isinstance(value, dict):
+        return {key: encode_value(item) for key, item in value.items()}
+
+    if isinstance(value, ITERABLES):
+        return [encode_value(item) for item in value]
+
+    return encode_tagged(value)
+
+
+@singledispatch
+def encode_tagged(value: Any) -> Any:
+    """Single dispatch generic function for encoding values that the JSON protocol represents with a `$type` tag.
+
+    Types that do not have a tagged representation fallback to the GraphQL serializer.
+    """
+    return encode_value(serializer(value))
+
+
+@encode_tagged.register(datetime.datetime)
+def encode_datetime(dt: datetime.datetime) -> dict[str, str]:
+    return {TYPE_KEY: 'DateTime', VALUE_KEY: serialize_datetime(dt)}
+
+
+@encode_tagged.register(decimal.Decimal)
+def encode_decimal(value: decimal.Decimal) -> dict[str, str]:
+    return {TYPE_KEY: 'Decimal', VALUE_KEY: str(value)}
+
+
+@encode_tagged.register(fields.Base64)
+def encode_base64(value: fields.Base64) -> dict[str, str]:
+    return {TYPE_KEY: 'Bytes', VALUE_KEY: str(value)}
+
+
+@encode_tagged.register(fields.Json)
+def encode_json(value: fields.Json) -> dict[str, str]:
+    return {TYPE_KEY: 'Json', VALUE_KEY: dumps(value.data)}
+
+
+def deserialize_json_response(data: Any, *, raw: bool = False) -> Any:
+    """Normalise a JSON protocol response to the same shape as a GraphQL response.
+
+    The JSON protocol returns the result under the name of the action, e.g. `{"data": {"findUniqueUser": {...}}}`
+    and represents values that are not natively supported by JSON as `{"$type": "DateTime", "value": "..."}`.
+
+    This unpacks the result to `{"data": {"result": ...}}` and replaces every tagged value with the
+    raw value as that is how the GraphQL protocol represents them.
+    """
+    response = data.get('data')
+    if not isinstance(response, dict) or len(response) != 1:
+        return data
+
+    result = next(iter(response.values()))
+    if raw:
+        # raw results are not tagged and are described by their own `types` array instead
+        if isinstance(result, str):
+            result = json.loads(result)
+    else:
+        result = _untag(result)
+
+    return {**data, 'data': {'result': result}}
+
+
+def _untag(value: Any) -> Any:
+    if isinstance(value, dict):
+        if TYPE_KEY in value and VALUE_KEY in value:
+            return value[VALUE_KEY]
+        return {key: _untag(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [_untag(item) for item in value]
+
+    return value
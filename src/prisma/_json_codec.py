@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import logging
+import datetime
+from abc import ABC, abstractmethod
+from typing import Any, Union
+from typing_extensions import override
+
+from ._types import JsonCodecName
+from ._compat import orjson, msgspec
+from ._builder import dumps, serializer
+
+__all__ = (
+    'JsonCodec',
+    'StdlibJsonCodec',
+    'OrjsonJsonCodec',
+    'MsgspecJsonCodec',
+    'get_json_codec',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+class JsonCodec(ABC):
+    """Encodes request bodies & decodes response bodies for the query engine.
+
+    Types that are not natively supported by the underlying library, e.g. `fields.Json`, `fields.Base64`,
+    `decimal.Decimal` and `datetime.datetime`, must be encoded using the `prisma._builder.serializer` hook
+    so that they are represented the same regardless of which codec is used.
+    """
+
+    name: str
+
+    __slots__ = ()
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> str | bytes:
+        """Serialise the given object to JSON"""
+        ...
+
+    @abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        """Deserialise the given JSON document, this must accept raw response bytes"""
+        ...
+
+    @override
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} name={self.name}>'
+
+
+class StdlibJsonCodec(JsonCodec):
+    """Codec using the builtin `json` module, this produces the same output as `prisma._builder.dumps()`"""
+
+    name = 'stdlib'
+
+    __slots__ = ()
+
+    @override
+    def dumps(self, obj: Any) -> str:
+        return dumps(obj)
+
+    @override
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonJsonCodec(JsonCodec):
+    """Codec using [orjson](https://github.com/ijl/orjson)"""
+
+    name = 'orjson'
+
+    __slots__ = ('_option',)
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError('The `orjson` JSON codec requires the `orjson` package to be installed')
+
+        # datetimes are passed through to our own serializer so that they are
+        # formatted the same as they would be with the stdlib codec
+        self._option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    @override
+    def dumps(self, obj: Any) -> bytes:
+        assert orjson is not None
+        try:
+            return orjson.dumps(obj, default=serializer, option=self._option)
+        except orjson.JSONEncodeError:
+            # orjson cannot encode integers larger than 64 bits, e.g. `BigInt` values, so we fallback
+            # to the stdlib which also raises the same error for objects that cannot be serialized
+            return dumps(obj).encode('utf-8')
+
+    @override
+    def loads(self, data: bytes | str) -> Any:
+        assert orjson is not None
+        return orjson.loads(data)
+
+
+class MsgspecJsonCodec(JsonCodec):
+    """Codec using [msgspec](https://github.com/jcrist/msgspec)
+
+    msgspec natively encodes `datetime.datetime` objects without passing them to our serializer and
+    there is no option to disable this, so they are serialized before the object is encoded.
+    """
+
+    name = 'msgspec'
+
+    __slots__ = ('_encoder', '_decoder')
+
+    def __init__(self) -> None:
+        if msgspec is None:
+            raise RuntimeError('The `msgspec` JSON codec requires the `msgspec` package to be installed')
+
+        self._encoder = msgspec.json.Encoder(enc_hook=serializer, decimal_format='string')
+        self._decoder = msgspec.json.Decoder()
+
+    @override
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(_serialize_datetimes(obj))
+
+    @override
+    def loads(self, data: bytes | str) -> Any:
+        return self._decoder.decode(data)
+
+
+def _serialize_datetimes(obj: Any) -> Any:
+    """Returns the given object with every `datetime.datetime` replaced by its serialized form"""
+    if isinstance(obj, dict):
+        return {key: _serialize_datetimes(value) for key, value in obj.items()}
+
+    if isinstance(obj, (list, tuple)):
+        return [_serialize_datetimes(value) for value in obj]
+
+    if isinstance(obj, datetime.datetime):
+        return serializer(obj)
+
+    return obj
+
+
+STDLIB_CODEC = StdlibJsonCodec()
+
+
+def get_json_codec(codec: Union[JsonCodec, JsonCodecName]) -> JsonCodec:
+    """Resolve the given codec name to a `JsonCodec` instance.
+
+    `auto` will use the fastest codec that is installed.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec == 'stdlib':
+        return STDLIB_CODEC
+
+    if codec == 'orjson':
+        return OrjsonJsonCodec()
+
+    if codec == 'msgspec':
+        return MsgspecJsonCodec()
+
+    if codec == 'auto':
+        if orjson is not None:
+            return OrjsonJsonCodec()
+
+        if msgspec is not None:
+            return MsgspecJsonCodec()
+
+        log.debug('Neither orjson or msgspec are installed, falling back to the stdlib JSON codec')
+        return STDLIB_CODEC
+
+    raise ValueError(f'Unknown JSON codec: {codec!r}; expected one of stdlib, orjson, msgspec or auto')
@@ -0,0 +1,239 @@
+"""Limiting the number of queries that are sent to the query engine at the same time.
+
+The query engine accepts every request that it is sent and then waits for a connection from its
+database connection pool, so sending a burst of queries results in most of them timing out while
+waiting inside the query engine. Queueing the queries on the client instead means that callers can
+be given an error straight away when the queue is full, applying backpressure to the caller.
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import logging
+import contextlib
+from typing import Dict, List, Deque, Tuple, Optional
+from collections import deque
+
+import httpx
+
+from ._types import LimiterStats, ConcurrencyLimitConfig
+from .errors import DataError, QueryQueueFullError, QueryQueueTimeoutError
+from .limits import FixedLimit, LimitSample, LimitAlgorithm
+from ._metrics import Metric, HistogramBucket, MetricHistogram
+
+__all__ = (
+    'ConcurrencyLimiter',
+    'is_overloaded_error',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# in seconds
+WAIT_TIME_BUCKETS: Tuple[float, ...] = (0, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUEUE_DEPTH_BUCKETS: Tuple[float, ...] = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# timed out fetching a new connection from the connection pool
+POOL_TIMEOUT_ERROR_CODE = 'P2024'
+
+
+def is_overloaded_error(exc: BaseException) -> bool:
+    """Returns True if the given error indicates that the query engine or the database cannot keep up with the load"""
+    if isinstance(exc, httpx.TimeoutException):
+        return True
+
+    return isinstance(exc, DataError) and exc.code == POOL_TIMEOUT_ERROR_CODE
+
+
+class _Histogram:
+    """Counts observations in fixed buckets, values larger than every bucket are counted in a final infinite bucket"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def snapshot(self) -> MetricHistogram:
+        buckets: List[HistogramBucket] = [
+            HistogramBucket(max_value=bound, total_count=count)
+            for bound, count in zip((*self.bounds, float('inf')), self.counts)
+        ]
+        return MetricHistogram(sum=self.sum, count=self.count, buckets=buckets)
+
+
+class ConcurrencyLimiter:
+    """Limits the number of queries in flight, queueing any other queries in the order that they were made.
+
+    The limit is calculated by the configured `LimitAlgorithm` from the latency of every query that is sent.
+    """
+
+    algorithm: LimitAlgorithm
+    max_queue_length: Optional[int]
+    queue_timeout: Optional[float]
+
+    def __init__(self, config: ConcurrencyLimitConfig) -> None:
+        algorithm = config.get('algorithm')
+        max_in_flight = config.get('max_in_flight')
+        if algorithm is None:
+            if max_in_flight is None:
+                raise ValueError('Expected either the `max_in_flight` or the `algorithm` option to be given')
+
+            if max_in_flight < 1:
+                raise ValueError(f'Expected `max_in_flight` to be at least 1 but got {max_in_flight}')
+
+            algorithm = FixedLimit(max_in_flight)
+        elif max_in_flight is not None:
+            raise ValueError('The `max_in_flight` and `algorithm` options cannot be used together')
+
+        self.algorithm = algorithm
+
+        self.max_queue_length = config.get('max_queue_length')
+        if self.max_queue_length is not None and self.max_queue_length < 0:
+            raise ValueError(f'Expected `max_queue_length` to be a positive integer but got {self.max_queue_length}')
+
+        queue_timeout = config.get('queue_timeout')
+        if queue_timeout is not None:
+            self.queue_timeout = queue_timeout.total_seconds()
+        else:
+            self.queue_timeout = None
+
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+        self._acquired = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._dropped = 0
+        self._wait_time = _Histogram(WAIT_TIME_BUCKETS)
+        self._queue_depth = _Histogram(QUEUE_DEPTH_BUCKETS)
+
+    @property
+    def max_in_flight(self) -> int:
+        """The number of queries that can currently be sent at the same time"""
+        return self.algorithm.limit
+
+    async def acquire(self) -> None:
+        """Wait until the query can be sent, `release()` must be called once the query has finished"""
+        depth = len(self._waiters)
+        self._queue_depth.observe(depth)
+
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            self._acquired += 1
+            self._wait_time.observe(0)
+            return
+
+        if self.max_queue_length is not None and depth >= self.max_queue_length:
+            self._rejected += 1
+            raise QueryQueueFullError(self.max_queue_length)
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = time.monotonic()
+
+        try:
+            if self.queue_timeout is None:
+                await waiter
+            else:
+                # the waiter is shielded so that we can tell whether or not the query was
+                # given a slot at the same time as it timed out
+                await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # we were given a slot that we are not going to use
+                self.release()
+            else:
+                waiter.cancel()
+                # the waiter may have already been discarded by `release()`
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+
+            if isinstance(exc, asyncio.TimeoutError):
+                assert self.queue_timeout is not None
+                self._timed_out += 1
+                raise QueryQueueTimeoutError(self.queue_timeout) from None
+
+            raise
+
+        self._acquired += 1
+        self._wait_time.observe(time.monotonic() - start)
+
+    def release(self, *, rtt: Optional[float] = None, dropped: bool = False) -> None:
+        """Release the slot of a finished query, giving it to the queries that have been waiting the longest.
+
+        If the query was sent then `rtt` should be how long it took in seconds so that the limit can be adjusted.
+        """
+        if rtt is not None:
+            if dropped:
+                self._dropped += 1
+
+            previous = self.algorithm.limit
+            limit = self.algorithm.update(LimitSample(rtt=rtt, in_flight=self._in_flight, dropped=dropped))
+            if limit != previous:
+                log.debug('Concurrency limit changed from %s to %s', previous, limit)
+
+        self._in_flight -= 1
+
+        # the limit may have increased so we may be able to send more than one query
+        while self._waiters and self._in_flight < self.algorithm.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> LimiterStats:
+        return LimiterStats(
+            max_in_flight=self.max_in_flight,
+            in_flight=self._in_flight,
+            queued=len(self._waiters),
+            acquired=self._acquired,
+            rejected=self._rejected,
+            timed_out=self._timed_out,
+            dropped=self._dropped,
+            wait_time=self._wait_time.snapshot(),
+            queue_depth=self._queue_depth.snapshot(),
+        )
+
+    def gauges(self, labels: Optional[Dict[str, str]] = None) -> List[Metric[float]]:
+        """Returns the current state of the limiter in the same format as the query engine metrics"""
+        values = (
+            (
+                'prisma_client_queries_limit',
+                self.max_in_flight,
+                'Number of queries that can currently be sent at the same time',
+            ),
+            ('prisma_client_queries_in_flight', self._in_flight, 'Number of queries that are currently being sent'),
+            ('prisma_client_queries_queued', len(self._waiters), 'Number of queries that are waiting to be sent'),
+        )
+        return [
+            Metric[float](key=key, value=float(value), labels=dict(labels or {}), description=description)
+            for key, value, description in values
+        ]
+
+    def prometheus_gauges(self, labels: Optional[Dict[str, str]] = None) -> str:
+        """Returns the current state of the limiter in the prometheus text format"""
+        lines: List[str] = []
+        for gauge in self.gauges(labels):
+            if gauge.labels:
+                formatted = ','.join(f'{name}="{value}"' for name, value in gauge.labels.items())
+                name = f'{gauge.key}{{{formatted}}}'
+            else:
+                name = gauge.key
+
+            lines.append(f'# HELP {gauge.key} {gauge.description}')
+            lines.append(f'# TYPE {gauge.key} gauge')
+            lines.append(f'{name} {gauge.value:g}')
+
+        return '\n'.join(lines) + '\n'
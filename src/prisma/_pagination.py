@@ -0,0 +1,229 @@
+"""Keyset pagination over every record matching a filter.
+
+Pages are fetched by filtering on the last key that was seen, e.g. `{'id': {'gt': last_id}}`,
+instead of using an offset so that every page is just as cheap to find as the first one.
+
+As the filter for the next page only depends on the last record of the current page, the
+next pages can be fetched while the caller is still processing the current page.
+"""
+
+from __future__ import annotations
+
+import queue
+import asyncio
+import threading
+from typing import (
+    Any,
+    Dict,
+    List,
+    Union,
+    Generic,
+    Mapping,
+    TypeVar,
+    Callable,
+    Iterator,
+    Optional,
+    Awaitable,
+    AsyncIterator,
+)
+
+from ._types import SortOrder
+
+__all__ = (
+    'iter_pages',
+    'aiter_pages',
+)
+
+_T = TypeVar('_T')
+
+Where = Optional[Mapping[str, Any]]
+
+
+class _Done:
+    """Sentinel marking that there are no more pages"""
+
+
+class _Failed:
+    __slots__ = ('exc',)
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+_Page = Union[List[_T], _Done, _Failed]
+
+
+def _validate(page_size: int, prefetch: int) -> None:
+    if page_size < 1:
+        raise ValueError(f'Expected `page_size` to be at least 1 but got {page_size}')
+
+    if prefetch < 0:
+        raise ValueError(f'Expected `prefetch` to be a positive integer but got {prefetch}')
+
+
+class _Keyset(Generic[_T]):
+    """Builds the filter for each page"""
+
+    __slots__ = ('where', 'key', 'order', 'page_size', 'last')
+
+    def __init__(self, *, where: Where, key: str, order: SortOrder, page_size: int) -> None:
+        self.where = where
+        self.key = key
+        self.order = order
+        self.page_size = page_size
+        self.last: Any = None
+
+    @property
+    def order_by(self) -> Dict[str, Any]:
+        return {self.key: self.order}
+
+    def page_where(self, first: bool) -> Where:
+        if first:
+            return self.where
+
+        condition = {self.key: {'gt' if self.order == 'asc' else 'lt': self.last}}
+        if not self.where:
+            return condition
+
+        return {'AND': [self.where, condition]}
+
+    def advance(self, page: List[_T]) -> bool:
+        """Record the last key of the given page, returns whether or not there could be another page"""
+        if len(page) < self.page_size:
+            return False
+
+        self.last = getattr(page[-1], self.key)
+        return True
+
+
+def iter_pages(
+    fetch: Callable[[Where, Dict[str, Any], int], List[_T]],
+    *,
+    where: Where,
+    key: str,
+    order: SortOrder = 'asc',
+    page_size: int = 100,
+    prefetch: int = 1,
+) -> Iterator[_T]:
+    """Yield every record in key order, fetching up to `prefetch` pages in a background thread.
+
+    `fetch` is called with the filter, ordering and number of records for each page.
+    """
+    _validate(page_size, prefetch)
+    keyset: _Keyset[_T] = _Keyset(where=where, key=key, order=order, page_size=page_size)
+
+    if prefetch == 0:
+        first = True
+        while True:
+            page = fetch(keyset.page_where(first), keyset.order_by, page_size)
+            first = False
+            yield from page
+            if not keyset.advance(page):
+                return
+
+    pages: queue.Queue[_Page[_T]] = queue.Queue(maxsize=prefetch)
+    stopped = threading.Event()
+
+    def put(item: _Page[_T]) -> bool:
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def produce() -> None:
+        first = True
+        try:
+            while not stopped.is_set():
+                page = fetch(keyset.page_where(first), keyset.order_by, page_size)
+                first = False
+                more = keyset.advance(page)
+                if not put(page) or not more:
+                    break
+        except BaseException as exc:
+            put(_Failed(exc))
+        else:
+            put(_Done())
+
+    thread = threading.Thread(target=produce, name='prisma-page-prefetch', daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = pages.get()
+            if isinstance(item, _Done):
+                return
+            if isinstance(item, _Failed):
+                raise item.exc
+
+            yield from item
+    finally:
+        stopped.set()
+
+
+async def aiter_pages(
+    fetch: Callable[[Where, Dict[str, Any], int], Awaitable[List[_T]]],
+    *,
+    where: Where,
+    key: str,
+    order: SortOrder = 'asc',
+    page_size: int = 100,
+    prefetch: int = 1,
+) -> AsyncIterator[_T]:
+    """Yield every record in key order, fetching up to `prefetch` pages in a background task.
+
+    `fetch` is called with the filter, ordering and number of records for each page.
+    """
+    _validate(page_size, prefetch)
+    keyset: _Keyset[_T] = _Keyset(where=where, key=key, order=order, page_size=page_size)
+
+    if prefetch == 0:
+        first = True
+        while True:
+            page = await fetch(keyset.page_where(first), keyset.order_by, page_size)
+            first = False
+            for record in page:
+                yield record
+            if not keyset.advance(page):
+                return
+
+    pages: asyncio.Queue[_Page[_T]] = asyncio.Queue(maxsize=prefetch)
+
+    async def produce() -> None:
+        first = True
+        try:
+            while True:
+                page = await fetch(keyset.page_where(first), keyset.order_by, page_size)
+                first = False
+                more = keyset.advance(page)
+                await pages.put(page)
+                if not more:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await pages.put(_Failed(exc))
+        else:
+            await pages.put(_Done())
+
+    task = asyncio.ensure_future(produce())
+
+    try:
+        while True:
+            item = await pages.get()
+            if isinstance(item, _Done):
+                return
+            if isinstance(item, _Failed):
+                raise item.exc
+
+            for record in item:
+                yield record
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
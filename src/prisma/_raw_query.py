@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Callable, overload
+import functools
+from typing import Any, Callable, cast, overload
 from typing_extensions import Literal
 
 from ._types import BaseModelT
@@ -88,10 +89,11 @@ def deserialize_raw_results(
         types=raw_result['types'],
         rows=raw_result['rows'],
     )
+    deserialize = _get_row_deserializer(tuple(result.columns), tuple(result.types), for_model=model is not None)
     if model is not None:
-        return [_deserialize_prisma_object(obj, result=result, model=model, for_model=True) for obj in result.rows]
+        return [model_parse(model, deserialize(row)) for row in result.rows]
 
-    return [_deserialize_prisma_object(obj, result=result, for_model=False) for obj in result.rows]
+    return [deserialize(row) for row in result.rows]
 
 
 # NOTE: this very weird `for_model` API is simply here as a workaround for
@@ -100,69 +102,65 @@ def deserialize_raw_results(
 # This should hopefully be removed soon.
 
 
-@overload
-def _deserialize_prisma_object(
-    fields: list[object],
+@functools.lru_cache(maxsize=256)
+def _get_row_deserializer(
+    columns: tuple[str, ...],
+    types: tuple[PrismaType, ...],
     *,
-    result: RawQueryResult,
     for_model: bool,
-) -> dict[str, Any]: ...
+) -> Callable[[list[object]], dict[str, Any]]:
+    """Returns a function that deserializes a single row of a raw query result with the given columns & types.
 
+    The deserializer for each column is resolved once here so that deserializing each row only has to
+    call the deserializers for the columns that need it, queries that return the same columns reuse the
+    same function.
+    """
+    # if the same column name is returned more than once then the last value is used
+    last_index = {key: index for index, key in enumerate(columns)}
 
-@overload
-def _deserialize_prisma_object(
-    fields: list[object],
-    *,
-    result: RawQueryResult,
-    for_model: bool,
-    model: type[BaseModelT],
-) -> BaseModelT: ...
+    plan: list[tuple[int, str, Callable[[Any], object]]] = []
+    for index, (key, prisma_type) in enumerate(zip(columns, types)):
+        if last_index[key] != index:
+            continue
 
+        deserializer = _get_column_deserializer(key, prisma_type, for_model=for_model)
+        if deserializer is not None:
+            plan.append((index, key, deserializer))
 
-def _deserialize_prisma_object(
-    fields: list[object],
-    *,
-    result: RawQueryResult,
-    for_model: bool,
-    model: type[BaseModelT] | None = None,
-) -> BaseModelT | dict[str, Any]:
-    # create a local reference to avoid performance penalty of global
-    # lookups on some python versions
-    _deserializers = DESERIALIZERS
-
-    new_obj: dict[str, Any] = {}
-    for i, field in enumerate(fields):
-        key = result.columns[i]
-        prisma_type = result.types[i]
-
-        if field is None:
-            new_obj[key] = None
-            continue
+    def deserialize(row: list[object]) -> dict[str, Any]:
+        new_obj = dict(zip(columns, row))
+        for index, key, deserializer in plan:
+            value = row[index]
+            if value is not None:
+                new_obj[key] = deserializer(value)
+        return new_obj
 
-        if prisma_type.endswith('-array'):
-            if not isinstance(field, list):
-                raise TypeError(
-                    f'Expected array data for {key} column with internal type {prisma_type}',
-                )
+    return deserialize
 
-            item_type, _ = prisma_type.split('-')
 
-            new_obj[key] = [
-                _deserializers[item_type](value, for_model)
-                #
-                if item_type in _deserializers
-                else value
-                for value in field
-            ]
-        else:
-            value = field
+def _get_column_deserializer(key: str, prisma_type: PrismaType, *, for_model: bool) -> Callable[[Any], object] | None:
+    """Returns the function to deserialize non-null values of the given type, or None if they can be used as-is"""
+    if not prisma_type.endswith('-array'):
+        deserializer = DESERIALIZERS.get(prisma_type)
+        if deserializer is None:
+            return None
+        return lambda value: deserializer(value, for_model)
 
-            new_obj[key] = _deserializers[prisma_type](value, for_model) if prisma_type in _deserializers else value
+    item_type, _ = prisma_type.split('-')
+    item_deserializer = DESERIALIZERS.get(cast(PrismaType, item_type))
 
-    if model is not None:
-        return model_parse(model, new_obj)
+    def deserialize_array(value: object) -> object:
+        if not isinstance(value, list):
+            raise TypeError(
+                f'Expected array data for {key} column with internal type {prisma_type}',
+            )
+
+        if item_deserializer is None:
+            return value
+
+        return [item_deserializer(item, for_model) for item in value]
 
-    return new_obj
+    return deserialize_array
 
 
 def _deserialize_bigint(value: str, _for_model: bool) -> int:
@@ -0,0 +1,141 @@
+"""Lazily validated records for results where only some of the fields will be used.
+
+Creating a model validates every field of every record. A `LazyRecord` instead holds on to
+the raw data returned by the query engine and only validates a field when it is first accessed,
+the validated value is then stored in a slot on the record so it is only validated once and
+later accesses are as fast as accessing an attribute of any other object.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import Any, Dict, Generic, TypeVar, Callable, ClassVar, Optional, cast
+from typing_extensions import override
+
+from pydantic import BaseModel
+
+from ._compat import (
+    model_parse,
+    model_field_aliases,
+    model_field_defaults,
+    model_field_validator,
+    model_has_root_validators,
+)
+
+__all__ = (
+    'LazyRecord',
+    'get_record_class',
+)
+
+_ModelT = TypeVar('_ModelT', bound=BaseModel)
+
+_MISSING = object()
+
+
+class LazyRecord(Generic[_ModelT]):
+    """A record that validates its fields on first access.
+
+    Fields are accessed in the same way as on the model, e.g. `record.name`, and the full model can
+    be created with `to_model()`.
+    """
+
+    __slots__ = ('_data', '_model')
+
+    __prisma_model__: ClassVar[type[BaseModel]]
+    __prisma_fields__: ClassVar[Dict[str, _LazyField]] = {}
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+        self._model: Optional[_ModelT] = None
+
+    def __getattr__(self, name: str) -> Any:
+        # this is only called when the slot for the field has not been set yet, once the value has
+        # been validated it is stored in the slot and accessed directly from then on
+        field = self.__prisma_fields__.get(name)
+        if field is None:
+            raise AttributeError(f'{self.__class__.__name__!r} object has no attribute {name!r}')
+
+        value = field.load(self)
+        object.__setattr__(self, name, value)
+        return value
+
+    def to_model(self) -> _ModelT:
+        """Validate every field and return the model instance, the same instance is returned on subsequent calls"""
+        if self._model is None:
+            self._model = cast(_ModelT, model_parse(self.__prisma_model__, self._data))
+        return self._model
+
+    @property
+    def raw_data(self) -> Dict[str, Any]:
+        """The data returned by the query engine for this record"""
+        return self._data
+
+    @override
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._data!r})'
+
+
+class _LazyField:
+    """Validates the value of a single field of a record"""
+
+    __slots__ = ('name', 'key', 'default', 'validate')
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        key: str,
+        default: Optional[Callable[[], Any]],
+        validate: Optional[Callable[[Any], Any]],
+    ) -> None:
+        self.name = name
+        self.key = key
+        self.default = default
+        self.validate = validate
+
+    def load(self, record: LazyRecord[Any]) -> Any:
+        if record._model is not None:
+            return getattr(record._model, self.name)
+
+        raw = record._data.get(self.key, _MISSING)
+
+        # fall back to validating the whole model if the field cannot be validated on its own
+        if self.validate is None or (raw is _MISSING and self.default is None):
+            return getattr(record.to_model(), self.name)
+
+        if raw is _MISSING:
+            assert self.default is not None
+            return self.default()
+
+        return self.validate(raw)
+
+
+@functools.lru_cache(maxsize=None)
+def get_record_class(model: type[_ModelT]) -> type[LazyRecord[_ModelT]]:
+    """Returns the `LazyRecord` subclass for the given model, with a slot for every field"""
+    # fields that are validated together must be validated with the rest of the model
+    validate_fields = not model_has_root_validators(model)
+    defaults = model_field_defaults(model)
+
+    fields: Dict[str, _LazyField] = {}
+    for name, key in model_field_aliases(model).items():
+        if hasattr(LazyRecord, name):
+            # the field can only be accessed through `to_model()` as it would shadow a method of the record
+            continue
+
+        fields[name] = _LazyField(
+            name=name,
+            key=key,
+            default=defaults.get(name),
+            validate=model_field_validator(model, name) if validate_fields else None,
+        )
+
+    return type(
+        f'Lazy{model.__name__}',
+        (LazyRecord,),
+        {
+            '__slots__': tuple(fields),
+            '__prisma_model__': model,
+            '__prisma_fields__': fields,
+        },
+    )
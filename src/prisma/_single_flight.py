@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import copy
+import asyncio
+import logging
+from typing import Any, Dict, Callable, Hashable, Awaitable
+
+from ._types import DeduplicationStats
+
+__all__ = ('SingleFlight',)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    __slots__ = ('task', 'followers')
+
+    def __init__(self, task: asyncio.Task[Any]) -> None:
+        self.task = task
+        self.followers = 0
+
+
+class SingleFlight:
+    """Shares the response of a query with every identical query that is made while it is in flight.
+
+    The first caller for a key sends the request, any callers that are made with the same key before
+    the response is received wait for that request instead of sending their own. Every caller receives
+    its own copy of the response so that callers cannot modify the results of other callers.
+
+    The request is ran in a separate task so that cancelling the caller that sent the request does not
+    affect the other callers.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._requests = 0
+        self._deduplicated = 0
+
+    async def execute(self, key: Hashable, send: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.followers += 1
+            self._deduplicated += 1
+            log.debug('Waiting for an identical query that is already in flight')
+            return copy.deepcopy(await asyncio.shield(flight.task))
+
+        task = asyncio.ensure_future(send())
+        flight = self._flights[key] = _Flight(task)
+        self._requests += 1
+
+        def finished(task: asyncio.Task[Any]) -> None:
+            # this callback runs before any callers are resumed so no more callers can
+            # start waiting for this request once it has finished
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+            # stop asyncio from warning about unretrieved errors if every caller was cancelled
+            if not task.cancelled():
+                task.exception()
+
+        task.add_done_callback(finished)
+
+        result = await asyncio.shield(task)
+        if flight.followers:
+            return copy.deepcopy(result)
+        return result
+
+    def stats(self) -> DeduplicationStats:
+        return DeduplicationStats(requests=self._requests, deduplicated=self._deduplicated)
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import re
+import json
+import codecs
+from typing import Any, List, Optional
+
+__all__ = ('ResultStreamParser',)
+
+# characters that change the parser state before the result array, everything else can be skipped
+_TOKEN = re.compile(rb'["\\{}\[\]]')
+_STRING_TOKEN = re.compile(rb'["\\]')
+
+# the same characters for the decoded elements of the result array
+_ITEM_TOKEN = re.compile(r'["{}\[\]]')
+_ITEM_STRING_TOKEN = re.compile(r'["\\]')
+
+# separators between elements of the result array
+_SEPARATORS = re.compile(r'[\s,]*')
+
+# the end of an element that is not an object, array or string, e.g. a number
+_SCALAR_END = re.compile(r'[\s,\]]')
+
+_decoder = json.JSONDecoder()
+
+# parser states
+_PREFIX = 0
+_ITEMS = 1
+_SUFFIX = 2
+
+
+class ResultStreamParser:
+    """Incrementally parses a query engine response of the form `{"data": {"<key>": [...]}}`.
+
+    Bytes are fed in as they are received and each element of the result array is decoded
+    as soon as it has been fully received. Only the bytes for the element that is currently
+    being received are kept in memory and every byte is only scanned once, elements are
+    decoded once their closing bracket has been found.
+
+    Until the result array is found the response is buffered in full so that any other
+    response, e.g. `{"errors": [...]}`, can be retrieved with `close()`.
+    """
+
+    __slots__ = (
+        '_state',
+        '_prefix',
+        '_pos',
+        '_stack',
+        '_keys',
+        '_in_string',
+        '_string_start',
+        '_last_string',
+        '_utf8',
+        '_items',
+        '_pending',
+        '_in_item',
+        '_depth',
+        '_escaped',
+        '_in_scalar',
+    )
+
+    def __init__(self) -> None:
+        self._state: int = _PREFIX
+        self._prefix = bytearray()
+        self._pos = 0
+        self._stack: List[int] = []
+        self._keys: List[Optional[bytes]] = []
+        self._in_string = False
+        self._string_start = 0
+        self._last_string: Optional[bytes] = None
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._items = 0
+
+        # the state of the result element that is currently being received
+        self._pending: List[str] = []
+        self._in_item = False
+        self._depth = 0
+        self._escaped = False
+        self._in_scalar = False
+
+    @property
+    def items(self) -> int:
+        """The number of result elements that have been parsed so far"""
+        return self._items
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add the given bytes to the parser and return every result element that was completed"""
+        if self._state == _PREFIX:
+            self._prefix += chunk
+            start = self._find_result_array()
+            if start is None:
+                return []
+
+            # everything after the opening bracket of the result array
+            chunk = bytes(self._prefix[start:])
+            self._prefix = bytearray()
+            self._state = _ITEMS
+
+        if self._state == _ITEMS:
+            return self._parse_items(self._utf8.decode(chunk))
+
+        # we don't need anything after the result array
+        return []
+
+    def close(self) -> Any:
+        """Signal that the response has been fully received.
+
+        Returns the decoded response if it did not contain a result array, otherwise `None`.
+        """
+        if self._state == _PREFIX:
+            return json.loads(self._prefix)
+
+        if self._state == _ITEMS:
+            raise ValueError('Query engine response ended unexpectedly')
+
+        return None
+
+    def _parse_items(self, text: str) -> List[Any]:
+        """Scan the given text for the end of each element, only decoding elements that have been fully received"""
+        results: List[Any] = []
+        length = len(text)
+        pos = 0
+
+        # the index that the current element starts at within this text
+        start = 0
+
+        while pos < length:
+            if not self._in_item:
+                pos = _SEPARATORS.match(text, pos).end()  # type: ignore[union-attr]
+                if pos >= length:
+                    break
+
+                char = text[pos]
+                if char == ']':
+                    # we don't need anything after the result array
+                    self._state = _SUFFIX
+                    break
+
+                self._in_item = True
+                start = pos
+                pos += 1
+
+                if char == '"':
+                    self._in_string = True
+                elif char in '{[':
+                    self._depth = 1
+                else:
+                    self._in_scalar = True
+                    pos -= 1
+
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    # the escaped character was the first character of this text
+                    self._escaped = False
+                    pos += 1
+                    continue
+
+                match = _ITEM_STRING_TOKEN.search(text, pos)
+                if match is None:
+                    break
+
+                index = match.start()
+                if text[index] == '\\':
+                    if index + 1 >= length:
+                        self._escaped = True
+                        break
+
+                    pos = index + 2
+                    continue
+
+                self._in_string = False
+                pos = index + 1
+                if self._depth == 0:
+                    results.append(self._decode_item(text, start, pos))
+
+                continue
+
+            if self._in_scalar:
+                match = _SCALAR_END.search(text, pos)
+                if match is None:
+                    break
+
+                self._in_scalar = False
+                pos = match.start()
+                results.append(self._decode_item(text, start, pos))
+                continue
+
+            match = _ITEM_TOKEN.search(text, pos)
+            if match is None:
+                break
+
+            index = match.start()
+            char = text[index]
+            pos = index + 1
+
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    results.append(self._decode_item(text, start, pos))
+
+        if self._in_item:
+            self._pending.append(text[start:])
+
+        self._items += len(results)
+        return results
+
+    def _decode_item(self, text: str, start: int, end: int) -> Any:
+        """Decode the element that ends at the given index, including any text for it from previous chunks"""
+        data = text[start:end]
+        if self._pending:
+            self._pending.append(data)
+            data = ''.join(self._pending)
+            self._pending = []
+
+        self._in_item = False
+        return _decoder.decode(data)
+
+    def _find_result_array(self) -> int | None:
+        """Scan the buffered response for the start of the result array, returning the index after it"""
+        buffer = self._prefix
+        stack = self._stack
+        pos = self._pos
+        length = len(buffer)
+
+        while pos < length:
+            if self._in_string:
+                match = _STRING_TOKEN.search(buffer, pos)
+                if match is None:
+                    pos = length
+                    break
+
+                index = match.start()
+                if buffer[index] == 0x5C:  # backslash
+                    if index + 1 >= length:
+                        # wait for the escaped character
+                        pos = index
+                        break
+
+                    pos = index + 2
+                    continue
+
+                self._in_string = False
+                self._last_string = bytes(buffer[self._string_start : index])
+                pos = index + 1
+                continue
+
+            match = _TOKEN.search(buffer, pos)
+            if match is None:
+                pos = length
+                break
+
+            index = match.start()
+            char = buffer[index]
+            pos = index + 1
+
+            if char == 0x22:  # quote
+                self._in_string = True
+                self._string_start = pos
+            elif char in (0x7B, 0x5B):  # { [
+                stack.append(char)
+                self._keys.append(self._last_string)
+                self._last_string = None
+
+                if len(stack) == 3 and char == 0x5B and stack[:2] == [0x7B, 0x7B] and self._keys[1] == b'data':
+                    return pos
+            else:  # } ]
+                if stack:
+                    stack.pop()
+                    self._keys.pop()
+
+        self._pos = pos
+        return None
@@ -1,4 +1,5 @@
-from typing import Any
+from typing import Any, Iterator
+from contextlib import contextmanager
 from typing_extensions import override
 
 import httpx
@@ -24,9 +25,19 @@ class SyncHTTP(AbstractHTTP[httpx.Client, httpx.Response]):
     def request(self, method: Method, url: str, **kwargs: Any) -> 'Response':
         return Response(self.session.request(method, url, **kwargs))
 
+    @contextmanager
+    def stream(self, method: Method, url: str, **kwargs: Any) -> Iterator['Response']:
+        """Send a request without reading the response body upfront"""
+        with self.session.stream(method, url, **kwargs) as response:
+            yield Response(response)
+
     @override
     def open(self) -> None:
-        self.session = httpx.Client(**self.session_kwargs)
+        kwargs = self.session_kwargs
+        if self.uds is not None:
+            kwargs = {**kwargs, 'transport': httpx.HTTPTransport(**self._transport_kwargs())}
+
+        self.session = httpx.Client(**kwargs)
 
     @override
     def close(self) -> None:
@@ -56,6 +67,13 @@ class Response(AbstractResponse[httpx.Response]):
     def headers(self) -> httpx.Headers:
         return self.original.headers
 
+    @override
+    def read(self) -> bytes:
+        return self.original.read()
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        return self.original.iter_bytes()
+
     @override
     def json(self, **kwargs: Any) -> Any:
         return self.original.json(**kwargs)
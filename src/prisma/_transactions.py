@@ -89,14 +89,22 @@ class AsyncTransactionManager(Generic[_AsyncPrismaT]):
         if self._tx_id is None:
             raise TransactionNotStartedError()
 
-        await self.__client._engine.commit_transaction(self._tx_id)
+        try:
+            await self.__client._engine.commit_transaction(self._tx_id)
+        finally:
+            if self.__client._cache is not None:
+                self.__client._cache.release(self._tx_id)
 
     async def rollback(self) -> None:
         """Do not commit the changes to the database, this transaction will no longer be usable"""
         if self._tx_id is None:
             raise TransactionNotStartedError()
 
-        await self.__client._engine.rollback_transaction(self._tx_id)
+        try:
+            await self.__client._engine.rollback_transaction(self._tx_id)
+        finally:
+            if self.__client._cache is not None:
+                self.__client._cache.release(self._tx_id)
 
     async def __aenter__(self) -> _AsyncPrismaT:
         return await self.start(_from_context=True)
@@ -191,14 +199,22 @@ class SyncTransactionManager(Generic[_SyncPrismaT]):
         if self._tx_id is None:
             raise TransactionNotStartedError()
 
-        self.__client._engine.commit_transaction(self._tx_id)
+        try:
+            self.__client._engine.commit_transaction(self._tx_id)
+        finally:
+            if self.__client._cache is not None:
+                self.__client._cache.release(self._tx_id)
 
     def rollback(self) -> None:
         """Do not commit the changes to the database, this transaction will no longer be usable"""
         if self._tx_id is None:
             raise TransactionNotStartedError()
 
-        self.__client._engine.rollback_transaction(self._tx_id)
+        try:
+            self.__client._engine.rollback_transaction(self._tx_id)
+        finally:
+            if self.__client._cache is not None:
+                self.__client._cache.release(self._tx_id)
 
     def __enter__(self) -> _SyncPrismaT:
         return self.start(_from_context=True)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Type, Tuple, Mapping, TypeVar, Callable, Coroutine
+from typing import TYPE_CHECKING, Any, Dict, Type, Tuple, Mapping, TypeVar, Callable, Coroutine, NamedTuple
+from datetime import timedelta
 from typing_extensions import (
     Literal as Literal,
     NewType,
@@ -14,6 +15,10 @@ from typing_extensions import (
 import httpx
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from .limits import LimitAlgorithm
+    from ._metrics import MetricHistogram
+
 Method = Literal['GET', 'POST']
 
 CallableT = TypeVar('CallableT', bound='FuncType')
@@ -69,11 +74,150 @@ class HttpConfig(TypedDict, total=False):
     max_redirects: int
 
 
+class CoalesceConfig(TypedDict, total=False):
+    max_batch_size: int
+    """The maximum number of queries to send in a single request, defaults to 100"""
+
+    max_wait: timedelta
+    """How long to wait for more queries before sending a request.
+
+    Defaults to zero which only waits for queries made in the same iteration of the event loop.
+    """
+
+
+class CacheConfig(TypedDict, total=False):
+    max_size: int
+    """The maximum number of query results to store, the least recently used results are evicted first"""
+
+    ttl: timedelta
+    """How long query results are stored for, defaults to storing results until they are invalidated"""
+
+    model_ttls: Dict[str, timedelta]
+    """How long query results are stored for, for queries that select the given models.
+
+    If a query selects multiple models then the shortest TTL is used.
+    """
+
+
+class CacheStats(NamedTuple):
+    """Statistics for the query result cache, returned by `Prisma.get_cache_stats()`"""
+
+    hits: int
+    """The number of queries that were served from the cache"""
+
+    misses: int
+    """The number of cacheable queries that were sent to the query engine"""
+
+    evictions: int
+    """The number of results that were removed to stay within the `max_size` limit"""
+
+    expirations: int
+    """The number of results that were removed because they were older than their TTL"""
+
+    invalidations: int
+    """The number of results that were removed because a query modified one of their models"""
+
+    size: int
+    """The number of results that are currently stored"""
+
+    @property
+    def hit_ratio(self) -> float:
+        """The proportion of cacheable queries that were served from the cache"""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+
+class DeduplicationStats(NamedTuple):
+    """Statistics for query deduplication, returned by `Prisma.get_deduplication_stats()`"""
+
+    requests: int
+    """The number of deduplicated read queries that were sent to the query engine"""
+
+    deduplicated: int
+    """The number of read queries that waited for an identical query instead of being sent"""
+
+
+class ConcurrencyLimitConfig(TypedDict, total=False):
+    max_in_flight: int
+    """The maximum number of queries that can be sent to the query engine at the same time"""
+
+    algorithm: LimitAlgorithm
+    """Adjust the number of queries that can be sent at the same time, cannot be used with `max_in_flight`"""
+
+    max_queue_length: int
+    """The maximum number of queries that can wait to be sent, defaults to no limit"""
+
+    queue_timeout: timedelta
+    """How long a query can wait to be sent, defaults to no limit"""
+
+
+class LimiterStats(NamedTuple):
+    """Statistics for the query concurrency limiter, returned by `Prisma.get_limiter_stats()`"""
+
+    max_in_flight: int
+    """The number of queries that can currently be sent at the same time"""
+
+    in_flight: int
+    """The number of queries that are currently being sent"""
+
+    queued: int
+    """The number of queries that are currently waiting to be sent"""
+
+    acquired: int
+    """The total number of queries that have been sent"""
+
+    rejected: int
+    """The number of queries that were not sent as the queue was full"""
+
+    timed_out: int
+    """The number of queries that were not sent as they waited for longer than the queue timeout"""
+
+    dropped: int
+    """The number of queries that failed because the query engine or database was overloaded"""
+
+    wait_time: MetricHistogram
+    """How long queries waited in the queue before being sent, in seconds"""
+
+    queue_depth: MetricHistogram
+    """How many queries were already waiting when each query was made"""
+
+
+class CreateManyProgress(NamedTuple):
+    """The progress of a chunked `create_many()` query, passed to the `on_progress` callback"""
+
+    chunks: int
+    """The number of chunks that have been sent"""
+
+    rows: int
+    """The number of rows that have been sent"""
+
+    created: int
+    """The number of records that have been created"""
+
+
+class UpsertManyResult(NamedTuple):
+    """The result of an `upsert_many()` query"""
+
+    created: int
+    """The number of records that were created"""
+
+    updated: int
+    """The number of existing records that were updated"""
+
+
 SortMode = Literal['default', 'insensitive']
 SortOrder = Literal['asc', 'desc']
 
 MetricsFormat = Literal['json', 'prometheus']
 
+EngineProtocol = Literal['graphql', 'json']
+
+EngineTransport = Literal['tcp', 'uds']
+
+JsonCodecName = Literal['stdlib', 'orjson', 'msgspec', 'auto']
+
 
 class _DatasourceOverrideOptional(TypedDict, total=False):
     env: str
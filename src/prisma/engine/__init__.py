@@ -1,3 +1,7 @@
+from ._pool import (
+    EngineHealth as EngineHealth,
+    AsyncQueryEnginePool as AsyncQueryEnginePool,
+)
 from ._query import (
     SyncQueryEngine as SyncQueryEngine,
     AsyncQueryEngine as AsyncQueryEngine,
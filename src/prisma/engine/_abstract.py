@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, overload
+from typing import TYPE_CHECKING, Any, Iterator, AsyncIterator, overload
 from datetime import timedelta
 from typing_extensions import Literal
 
@@ -57,7 +57,7 @@ class SyncAbstractEngine(BaseAbstractEngine):
         ...
 
     @abstractmethod
-    def query(self, content: str, *, tx_id: TransactionId | None) -> Any:
+    def query(self, content: str | bytes, *, tx_id: TransactionId | None) -> Any:
         """Execute a GraphQL query.
 
         This method expects a JSON object matching this structure:
@@ -70,6 +70,11 @@ class SyncAbstractEngine(BaseAbstractEngine):
         """
         ...
 
+    @abstractmethod
+    def stream_query(self, content: str | bytes, *, tx_id: TransactionId | None) -> Iterator[Any]:
+        """Execute a query that returns a list, yielding each element as soon as it has been received"""
+        ...
+
     @abstractmethod
     def start_transaction(self, *, content: str) -> TransactionId:
         """Start an interactive transaction, returns the transaction ID that can be used to perform subsequent operations"""
@@ -123,7 +128,7 @@ class AsyncAbstractEngine(BaseAbstractEngine):
         ...
 
     @abstractmethod
-    async def query(self, content: str, *, tx_id: TransactionId | None) -> Any:
+    async def query(self, content: str | bytes, *, tx_id: TransactionId | None) -> Any:
         """Execute a GraphQL query.
 
         This method expects a JSON object matching this structure:
@@ -136,6 +141,11 @@ class AsyncAbstractEngine(BaseAbstractEngine):
         """
         ...
 
+    @abstractmethod
+    def stream_query(self, content: str | bytes, *, tx_id: TransactionId | None) -> AsyncIterator[Any]:
+        """Execute a query that returns a list, yielding each element as soon as it has been received"""
+        ...
+
     @abstractmethod
     async def start_transaction(self, *, content: str) -> TransactionId:
         """Start an interactive transaction, returns the transaction ID that can be used to perform subsequent operations"""
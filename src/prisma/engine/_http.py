@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import json
 import logging
-from typing import Any, NoReturn
+from typing import Any, Iterator, NoReturn, AsyncIterator
 from datetime import timedelta
 from typing_extensions import override
 
@@ -12,8 +11,10 @@ from . import utils, errors
 from ..utils import is_dict
 from .._types import Method
 from ._abstract import SyncAbstractEngine, AsyncAbstractEngine
+from .._streaming import ResultStreamParser
 from .._sync_http import SyncHTTP
 from .._async_http import AsyncHTTP
+from .._json_codec import STDLIB_CODEC, JsonCodec
 from ..http_abstract import AbstractResponse
 
 log: logging.Logger = logging.getLogger(__name__)
@@ -24,16 +25,19 @@ class BaseHTTPEngine:
 
     url: str | None
     headers: dict[str, str]
+    codec: JsonCodec
 
     def __init__(
         self,
         *,
         url: str | None,
         headers: dict[str, str] | None = None,
+        codec: JsonCodec | None = None,
     ) -> None:
         super().__init__()
         self.url = url
         self.headers = headers if headers is not None else {}
+        self.codec = codec if codec is not None else STDLIB_CODEC
 
     def _build_request(
         self,
@@ -77,7 +81,7 @@ class BaseHTTPEngine:
     ) -> Any:
         if isinstance(data, str):
             # workaround for https://github.com/prisma/prisma-engines/pull/4246
-            data = json.loads(data)
+            data = self.codec.loads(data)
 
         if not is_dict(data):
             raise TypeError(f'Expected deserialised engine response to be a dictionary, got {type(data)} - {data}')
@@ -108,9 +112,10 @@ class SyncHTTPEngine(BaseHTTPEngine, SyncAbstractEngine):
         self,
         url: str | None,
         headers: dict[str, str] | None = None,
+        codec: JsonCodec | None = None,
         **kwargs: Any,
     ) -> None:
-        super().__init__(url=url, headers=headers)
+        super().__init__(url=url, headers=headers, codec=codec)
         self.session = SyncHTTP(**kwargs)
 
     @override
@@ -160,13 +165,48 @@ class SyncHTTPEngine(BaseHTTPEngine, SyncAbstractEngine):
                 log.debug('%s %s returned text: %s', method, url, text)
                 return text
 
-            data = response.json()
+            data = self.codec.loads(response.read())
             log.debug('%s %s returned %s', method, url, data)
 
             return self._process_response_data(data=data, response=response)
 
         self._process_response_error(body=response.text(), response=response)
 
+    def stream_request(
+        self,
+        method: Method,
+        path: str,
+        *,
+        content: Any = None,
+        headers: dict[str, str] | None = None,
+    ) -> Iterator[Any]:
+        """Send a request that returns a list of results and yield each result as it is received"""
+        url, kwargs = self._build_request(
+            path=path,
+            method=method,
+            content=content,
+            headers=headers,
+            parse_response=True,
+        )
+
+        with self.session.stream(method, url, **kwargs) as response:
+            log.debug('%s %s returned status %s', method, url, response.status)
+
+            if not 300 > response.status >= 200:
+                response.read()
+                self._process_response_error(body=response.text(), response=response)
+
+            parser = ResultStreamParser()
+            for chunk in response.iter_bytes():
+                yield from parser.feed(chunk)
+
+            data = parser.close()
+            if data is not None:
+                self._process_response_data(data=data, response=response)
+                raise TypeError(f'Expected the query engine to return a list of results, got {data}')
+
+            log.debug('%s %s streamed %i results', method, url, parser.items)
+
 
 class AsyncHTTPEngine(BaseHTTPEngine, AsyncAbstractEngine):
     session: AsyncHTTP
@@ -175,9 +215,10 @@ class AsyncHTTPEngine(BaseHTTPEngine, AsyncAbstractEngine):
         self,
         url: str | None,
         headers: dict[str, str] | None = None,
+        codec: JsonCodec | None = None,
         **kwargs: Any,
     ) -> None:
-        super().__init__(url=url, headers=headers)
+        super().__init__(url=url, headers=headers, codec=codec)
         self.session = AsyncHTTP(**kwargs)
 
     @override
@@ -227,9 +268,45 @@ class AsyncHTTPEngine(BaseHTTPEngine, AsyncAbstractEngine):
                 log.debug('%s %s returned text: %s', method, url, text)
                 return text
 
-            data = await response.json()
+            data = self.codec.loads(await response.read())
             log.debug('%s %s returned %s', method, url, data)
 
             return self._process_response_data(data=data, response=response)
 
         self._process_response_error(body=await response.text(), response=response)
+
+    async def stream_request(
+        self,
+        method: Method,
+        path: str,
+        *,
+        content: Any = None,
+        headers: dict[str, str] | None = None,
+    ) -> AsyncIterator[Any]:
+        """Send a request that returns a list of results and yield each result as it is received"""
+        url, kwargs = self._build_request(
+            path=path,
+            method=method,
+            content=content,
+            headers=headers,
+            parse_response=True,
+        )
+
+        async with self.session.stream(method, url, **kwargs) as response:
+            log.debug('%s %s returned status %s', method, url, response.status)
+
+            if not 300 > response.status >= 200:
+                await response.read()
+                self._process_response_error(body=await response.text(), response=response)
+
+            parser = ResultStreamParser()
+            async for chunk in response.aiter_bytes():
+                for item in parser.feed(chunk):
+                    yield item
+
+            data = parser.close()
+            if data is not None:
+                self._process_response_data(data=data, response=response)
+                raise TypeError(f'Expected the query engine to return a list of results, got {data}')
+
+            log.debug('%s %s streamed %i results', method, url, parser.items)
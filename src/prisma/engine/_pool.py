@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import time
+import asyncio
+import logging
+import itertools
+from typing import TYPE_CHECKING, Any, Dict, List, TypeVar, Iterator, Awaitable, NamedTuple, AsyncIterator, overload
+from datetime import timedelta
+from typing_extensions import Literal, override
+
+import httpx
+
+from . import errors
+from ._query import AsyncQueryEngine
+from .._types import TransactionId
+from ._abstract import AsyncAbstractEngine
+from .._constants import DEFAULT_CONNECT_TIMEOUT
+
+if TYPE_CHECKING:
+    from ..types import MetricsFormat, DatasourceOverride  # noqa: TID251
+
+
+__all__ = (
+    'EngineHealth',
+    'AsyncQueryEnginePool',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_T = TypeVar('_T')
+
+# how long to wait before sending requests to an engine that previously failed
+DEFAULT_RETRY_AFTER = timedelta(seconds=5)
+
+
+class EngineHealth(NamedTuple):
+    index: int
+    """The position of the engine within the pool"""
+
+    healthy: bool
+    """Whether or not requests are currently being routed to the engine"""
+
+    outstanding: int
+    """The number of requests that are currently in flight"""
+
+    requests: int
+    """The total number of requests that have been sent to the engine"""
+
+    failures: int
+    """The total number of requests that failed due to a connection error"""
+
+    transactions: int
+    """The number of interactive transactions that are currently pinned to the engine"""
+
+    last_error: BaseException | None
+    """The last connection error that was encountered"""
+
+
+class _PoolMember:
+    engine: AsyncQueryEngine
+    index: int
+    outstanding: int
+    requests: int
+    failures: int
+    transactions: int
+    healthy: bool
+    retry_at: float
+    last_error: BaseException | None
+
+    __slots__ = (
+        'engine',
+        'index',
+        'outstanding',
+        'requests',
+        'failures',
+        'transactions',
+        'healthy',
+        'retry_at',
+        'last_error',
+    )
+
+    def __init__(self, engine: AsyncQueryEngine, index: int) -> None:
+        self.engine = engine
+        self.index = index
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.transactions = 0
+        self.healthy = True
+        self.retry_at = 0.0
+        self.last_error = None
+
+    def is_available(self, now: float) -> bool:
+        if self.engine.process is not None and self.engine.process.poll() is not None:
+            # the process has exited, it will never become available again
+            return False
+
+        return self.healthy or now >= self.retry_at
+
+    def mark_healthy(self) -> None:
+        if not self.healthy:
+            log.debug('Query engine %i in the pool is healthy again', self.index)
+
+        self.healthy = True
+
+    def mark_unhealthy(self, exc: BaseException, *, retry_after: timedelta) -> None:
+        log.debug('Query engine %i in the pool is unhealthy due to %s', self.index, exc)
+        self.healthy = False
+        self.failures += 1
+        self.last_error = exc
+        self.retry_at = time.monotonic() + retry_after.total_seconds()
+
+    def health(self) -> EngineHealth:
+        return EngineHealth(
+            index=self.index,
+            healthy=self.is_available(time.monotonic()),
+            outstanding=self.outstanding,
+            requests=self.requests,
+            failures=self.failures,
+            transactions=self.transactions,
+            last_error=self.last_error,
+        )
+
+
+class AsyncQueryEnginePool(AsyncAbstractEngine):
+    """Spreads queries across multiple query engine processes.
+
+    Each query is sent to the engine with the least number of outstanding requests.
+    Interactive transactions are pinned to the engine that started them as
+    transaction state only exists within a single engine process.
+
+    Engines that fail with a connection error are not sent any more requests until
+    `retry_after` has passed, engines whose process has exited are never used again.
+
+    Queries are sent using the `query()` and `stream_query()` methods of each engine so that
+    the concurrency limiter, which is shared between every engine in the pool, is respected.
+    """
+
+    members: List[_PoolMember]
+
+    def __init__(
+        self,
+        engines: List[AsyncQueryEngine],
+        *,
+        retry_after: timedelta = DEFAULT_RETRY_AFTER,
+    ) -> None:
+        if not engines:
+            raise ValueError('At least one query engine is required')
+
+        self.members = [_PoolMember(engine, index) for index, engine in enumerate(engines)]
+        self._retry_after = retry_after
+        self._transactions: Dict[TransactionId, _PoolMember] = {}
+        self._counter = itertools.count()
+
+    @property
+    def engines(self) -> List[AsyncQueryEngine]:
+        return [member.engine for member in self.members]
+
+    def health(self) -> List[EngineHealth]:
+        """Returns the current state of every engine in the pool"""
+        return [member.health() for member in self.members]
+
+    async def check_health(self) -> List[EngineHealth]:
+        """Send a status request to every engine and update their health"""
+
+        async def check(member: _PoolMember) -> None:
+            try:
+                await member.engine.request('GET', '/status')
+            except Exception as exc:
+                member.mark_unhealthy(exc, retry_after=self._retry_after)
+            else:
+                member.mark_healthy()
+
+        await asyncio.gather(*(check(member) for member in self.members))
+        return self.health()
+
+    @override
+    def close(self, *, timeout: timedelta | None = None) -> None:
+        for member in self.members:
+            member.engine.close(timeout=timeout)
+
+        self._transactions.clear()
+
+    @override
+    async def aclose(self, *, timeout: timedelta | None = None) -> None:
+        for member in self.members:
+            await member.engine.aclose(timeout=timeout)
+
+        self._transactions.clear()
+
+    @override
+    async def connect(
+        self,
+        timeout: timedelta = DEFAULT_CONNECT_TIMEOUT,
+        datasources: list[DatasourceOverride] | None = None,
+    ) -> None:
+        log.debug('Connecting to a pool of %i query engines', len(self.members))
+        results = await asyncio.gather(
+            *(member.engine.connect(timeout=timeout, datasources=datasources) for member in self.members),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                self.close()
+                raise result
+
+    def _choose(self) -> _PoolMember:
+        """Returns the available engine with the least outstanding requests.
+
+        Ties are broken in a round-robin fashion so that an idle pool still spreads requests.
+        """
+        now = time.monotonic()
+        offset = next(self._counter) % len(self.members)
+
+        chosen: _PoolMember | None = None
+        for member in self._rotate(offset):
+            if not member.is_available(now):
+                continue
+
+            if chosen is None or member.outstanding < chosen.outstanding:
+                chosen = member
+
+        if chosen is None:
+            raise errors.EngineConnectionError('None of the query engines in the pool are available')
+
+        return chosen
+
+    def _rotate(self, offset: int) -> Iterator[_PoolMember]:
+        members = self.members
+        for i in range(len(members)):
+            yield members[(offset + i) % len(members)]
+
+    def _member_for(self, tx_id: TransactionId) -> _PoolMember:
+        try:
+            return self._transactions[tx_id]
+        except KeyError:
+            raise errors.EngineError(
+                f'Transaction {tx_id} was not started by this engine pool; '
+                'transactions must be started using the same client that executes them'
+            ) from None
+
+    async def _send(self, member: _PoolMember, path: str, **kwargs: Any) -> Any:
+        return await self._track(member, member.engine.request('POST', path, **kwargs))
+
+    async def _track(self, member: _PoolMember, request: Awaitable[_T]) -> _T:
+        """Wait for the given request to the member, updating its health based on the result"""
+        member.outstanding += 1
+        member.requests += 1
+        try:
+            result = await request
+        except httpx.TransportError as exc:
+            member.mark_unhealthy(exc, retry_after=self._retry_after)
+            raise
+        else:
+            member.mark_healthy()
+            return result
+        finally:
+            member.outstanding -= 1
+
+    @override
+    async def query(self, content: str | bytes, *, tx_id: TransactionId | None) -> Any:
+        member = self._choose() if tx_id is None else self._member_for(tx_id)
+        return await self._track(member, member.engine.query(content, tx_id=tx_id))
+
+    @override
+    async def stream_query(self, content: str | bytes, *, tx_id: TransactionId | None) -> AsyncIterator[Any]:
+        member = self._choose() if tx_id is None else self._member_for(tx_id)
+
+        member.outstanding += 1
+        member.requests += 1
+        try:
+            async for item in member.engine.stream_query(content, tx_id=tx_id):
+                yield item
+        except httpx.TransportError as exc:
+            member.mark_unhealthy(exc, retry_after=self._retry_after)
+            raise
+        else:
+            member.mark_healthy()
+        finally:
+            member.outstanding -= 1
+
+    @override
+    async def start_transaction(self, *, content: str) -> TransactionId:
+        member = self._choose()
+        result = await self._send(member, '/transaction/start', content=content)
+        tx_id = TransactionId(result['id'])
+        self._transactions[tx_id] = member
+        member.transactions += 1
+        return tx_id
+
+    def _release(self, tx_id: TransactionId) -> _PoolMember:
+        member = self._member_for(tx_id)
+        del self._transactions[tx_id]
+        member.transactions -= 1
+        return member
+
+    @override
+    async def commit_transaction(self, tx_id: TransactionId) -> None:
+        await self._send(self._release(tx_id), f'/transaction/{tx_id}/commit')
+
+    @override
+    async def rollback_transaction(self, tx_id: TransactionId) -> None:
+        await self._send(self._release(tx_id), f'/transaction/{tx_id}/rollback')
+
+    @overload
+    async def metrics(
+        self,
+        *,
+        format: Literal['json'],
+        global_labels: dict[str, str] | None,
+    ) -> dict[str, Any]: ...
+
+    @overload
+    async def metrics(
+        self,
+        *,
+        format: Literal['prometheus'],
+        global_labels: dict[str, str] | None,
+    ) -> str: ...
+
+    @override
+    async def metrics(
+        self,
+        *,
+        format: MetricsFormat,
+        global_labels: dict[str, str] | None,
+    ) -> str | dict[str, Any]:
+        if format == 'prometheus':
+            # we can't reliably merge the prometheus format so we only return the metrics for the first engine
+            return await self.members[0].engine.metrics(format='prometheus', global_labels=global_labels)
+
+        results = await asyncio.gather(
+            *(member.engine.metrics(format='json', global_labels=global_labels) for member in self.members)
+        )
+        return merge_metrics(results)
+
+
+def merge_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the JSON metrics from multiple engines by summing values with the same key & labels"""
+    merged: Dict[str, Any] = {}
+    for result in results:
+        for kind, metrics in result.items():
+            if not isinstance(metrics, list):
+                merged.setdefault(kind, metrics)
+                continue
+
+            existing: List[Dict[str, Any]] = merged.setdefault(kind, [])
+            for metric in metrics:
+                match = next(
+                    (m for m in existing if m['key'] == metric['key'] and m.get('labels') == metric.get('labels')),
+                    None,
+                )
+                if match is None:
+                    existing.append(_copy_metric(metric))
+                elif kind == 'histograms':
+                    _merge_histogram(match['value'], metric['value'])
+                else:
+                    match['value'] += metric['value']
+
+    return merged
+
+
+def _copy_metric(metric: Dict[str, Any]) -> Dict[str, Any]:
+    copied = dict(metric)
+    value = metric['value']
+    if isinstance(value, dict):
+        copied['value'] = {**value, 'buckets': [list(bucket) for bucket in value.get('buckets', [])]}
+    return copied
+
+
+def _merge_histogram(target: Dict[str, Any], other: Dict[str, Any]) -> None:
+    target['sum'] += other['sum']
+    target['count'] += other['count']
+
+    buckets = {bucket[0]: bucket for bucket in target['buckets']}
+    for upper, count in other['buckets']:
+        if upper in buckets:
+            buckets[upper][1] += count
+        else:
+            target['buckets'].append([upper, count])
@@ -8,19 +8,23 @@ import atexit
 import signal
 import asyncio
 import logging
+import functools
 import subprocess
-from typing import TYPE_CHECKING, Any, overload
+from typing import TYPE_CHECKING, Any, Iterator, AsyncIterator, overload
 from pathlib import Path
 from datetime import timedelta
 from typing_extensions import Literal, override
 
-from . import utils, errors
+from . import utils, errors, _shared
 from ._http import SyncHTTPEngine, AsyncHTTPEngine
 from ..utils import DEBUG, _env_bool, time_since
-from .._types import HttpConfig, TransactionId
+from .._types import HttpConfig, TransactionId, EngineProtocol, EngineTransport
+from ._startup import READY_LOG_FILTER, StartupTimings, EngineLogReader, iter_backoff
 from .._builder import dumps
+from .._limiter import ConcurrencyLimiter, is_overloaded_error
 from ..binaries import platform
 from .._constants import DEFAULT_CONNECT_TIMEOUT
+from .._json_codec import JsonCodec
 
 if TYPE_CHECKING:
     from ..types import MetricsFormat, DatasourceOverride  # noqa: TID251
@@ -38,6 +42,9 @@ class BaseQueryEngine:
     dml_path: Path
     url: str | None
     file: Path | None
+    unix_path: Path | None
+    shared_key: str | None
+    startup_timings: StartupTimings | None
     process: subprocess.Popen[bytes] | subprocess.Popen[str] | None
 
     def __init__(
@@ -45,11 +52,136 @@ class BaseQueryEngine:
         *,
         dml_path: Path,
         log_queries: bool = False,
+        engine_protocol: EngineProtocol = 'graphql',
+        transport: EngineTransport = 'tcp',
+        shared: bool = False,
     ) -> None:
         self.dml_path = dml_path
         self._log_queries = log_queries
+        self._engine_protocol = engine_protocol
+        self._transport = transport
+        self._shared = shared
         self.process = None
         self.file = None
+        self.unix_path = None
+        self.shared_key = None
+        self.startup_timings = None
+        self._log_reader: EngineLogReader | None = None
+
+    def _is_connected(self) -> bool:
+        return self.process is not None or self.shared_key is not None
+
+    def _start_process(
+        self,
+        *,
+        file: Path,
+        datasources: list[DatasourceOverride] | None,
+    ) -> None:
+        if self._shared:
+            self._attach_shared(file=file, datasources=datasources)
+        else:
+            self._spawn_process(file=file, datasources=datasources)
+
+    async def _start_process_async(
+        self,
+        *,
+        file: Path,
+        datasources: list[DatasourceOverride] | None,
+    ) -> None:
+        if not self._shared:
+            self._start_process(file=file, datasources=datasources)
+            return
+
+        # the shared engine lock blocks until any other process has finished spawning the engine,
+        # so it is acquired in a separate thread to avoid blocking the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._start_process, file=file, datasources=datasources))
+
+    async def _kill_process_async(self, timeout: timedelta | None) -> None:
+        if self.shared_key is None:
+            self._kill_process(timeout=timeout)
+            return
+
+        # the shared engine lock must also be acquired when detaching
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._kill_process, timeout=timeout))
+
+    def _attach_shared(
+        self,
+        *,
+        file: Path,
+        datasources: list[DatasourceOverride] | None,
+    ) -> None:
+        key = _shared.make_key(
+            str(file.absolute()),
+            self.dml_path.read_text(),
+            dumps(datasources),
+            self._engine_protocol,
+            self._transport,
+            str(self._log_queries),
+        )
+        with _shared.EngineLock(key) as lock:
+            state = lock.read()
+            if state is None:
+                log.debug('Spawning a new shared query engine')
+                _, process = self._spawn_process(file=file, datasources=datasources, detached=True)
+                state = {
+                    'pid': process.pid,
+                    'url': self.url,
+                    'unix_path': str(self.unix_path) if self.unix_path is not None else None,
+                    'clients': [],
+                }
+            else:
+                if not state['clients']:
+                    # the engine is stopped once we detach as if we had spawned it
+                    log.debug('Adopting shared query engine with pid %i as every other client has exited', state['pid'])
+
+                log.debug('Attaching to shared query engine with pid %i', state['pid'])
+                self.url = state['url']
+                self.unix_path = Path(state['unix_path']) if state['unix_path'] is not None else None
+
+            state['clients'].append(os.getpid())
+            lock.write(state)
+
+        self.shared_key = key
+        log.debug('There are %i clients attached to the shared query engine', len(state['clients']))
+
+    def _detach_shared(self, key: str, timeout: timedelta | None) -> None:
+        with _shared.EngineLock(key) as lock:
+            state = lock.read()
+            if state is not None:
+                try:
+                    state['clients'].remove(os.getpid())
+                except ValueError:
+                    pass
+
+                if state['clients']:
+                    log.debug('Detaching from shared query engine with pid %i', state['pid'])
+                    lock.write(state)
+                    state = None
+                else:
+                    lock.remove()
+
+        if state is None:
+            # we're not the last client, the engine will be stopped by someone else
+            if self.process is not None:
+                # reap the process if it has been stopped by another client
+                self.process.poll()
+
+            self.process = None
+            self.unix_path = None
+            return
+
+        log.debug('Stopping shared query engine with pid %i as there are no clients left', state['pid'])
+        if self.process is not None and self.process.pid == state['pid']:
+            # we spawned this engine so we can stop it the same way as a non-shared engine
+            self._kill_process(timeout=timeout)
+            return
+
+        _shared.kill_process(state['pid'], timeout=timeout.total_seconds() if timeout is not None else None)
+        if self.unix_path is not None:
+            utils.remove_unix_socket_path(self.unix_path)
+            self.unix_path = None
 
     def _ensure_file(self) -> Path:
         # circular import
@@ -62,19 +194,29 @@ class BaseQueryEngine:
         *,
         file: Path,
         datasources: list[DatasourceOverride] | None,
+        detached: bool = False,
     ) -> tuple[str, subprocess.Popen[bytes] | subprocess.Popen[str]]:
-        port = utils.get_open_port()
-        log.debug('Running query engine on port %i', port)
+        if self._transport == 'uds':
+            self.unix_path = unix_path = utils.make_unix_socket_path()
+            log.debug('Running query engine on unix socket %s', unix_path)
+
+            # the host is ignored when requests are sent over the unix socket
+            self.url = 'http://localhost'
+            listen_args = ['--unix-path', str(unix_path)]
+        else:
+            port = utils.get_open_port()
+            log.debug('Running query engine on port %i', port)
 
-        self.url = f'http://localhost:{port}'
+            self.url = f'http://localhost:{port}'
+            listen_args = ['-p', str(port)]
 
         env = os.environ.copy()
         env.update(
             PRISMA_DML_PATH=str(self.dml_path.absolute()),
-            RUST_LOG='error',
+            RUST_LOG=f'error,{READY_LOG_FILTER}',
             RUST_LOG_FORMAT='json',
             PRISMA_CLIENT_ENGINE_TYPE='binary',
-            PRISMA_ENGINE_PROTOCOL='graphql',
+            PRISMA_ENGINE_PROTOCOL=self._engine_protocol,
         )
 
         if DEBUG:
@@ -89,8 +231,7 @@ class BaseQueryEngine:
 
         args: list[str] = [
             str(file.absolute()),
-            '-p',
-            str(port),
+            *listen_args,
             '--enable-metrics',
             '--enable-raw-queries',
         ]
@@ -101,7 +242,8 @@ class BaseQueryEngine:
         log.debug('Starting query engine...')
         popen_kwargs: dict[str, Any] = {
             'env': env,
-            'stdout': sys.stdout,
+            # the output of shared engines cannot be piped to us as we may exit before the engine does
+            'stdout': sys.stdout if detached else subprocess.PIPE,
             'stderr': sys.stderr,
             'text': False,
         }
@@ -112,11 +254,58 @@ class BaseQueryEngine:
                 signal.SIG_UNBLOCK, [signal.SIGINT, signal.SIGTERM]
             )
 
+            if detached:
+                # shared engines must outlive the process that spawned them & must not
+                # receive signals that are sent to its process group, e.g. ctrl+c
+                popen_kwargs['start_new_session'] = True
+
         self.process = subprocess.Popen(args, **popen_kwargs)
 
+        if self.process.stdout is not None:
+            self._log_reader = EngineLogReader(self.process.stdout)
+            self._log_reader.start()
+
         return self.url, self.process
 
+    def _check_process(self) -> None:
+        if self.process is not None and self.process.poll() is not None:
+            raise errors.EngineConnectionError(
+                f'The query engine exited with code {self.process.returncode} before it was ready'
+            )
+
+    def _iter_probe_delays(self, timeout: timedelta, *, start: float) -> Iterator[float]:
+        remaining = timeout.total_seconds() - (time.monotonic() - start)
+        if self._log_reader is not None:
+            # we'll be woken up by the log message so we don't need to probe as often
+            return iter_backoff(remaining, initial=0.05)
+
+        return iter_backoff(remaining)
+
+    def _record_startup(self, *, start: float, spawned: float, probed: float) -> None:
+        end = time.monotonic()
+        reader = self._log_reader
+        if reader is not None and reader.ready_at is not None and reader.ready_at <= probed:
+            ready = reader.ready_at
+            readiness: Literal['log', 'probe'] = 'log'
+        else:
+            ready = probed
+            readiness = 'probe'
+
+        self.startup_timings = StartupTimings(
+            ensure=0,
+            spawn=spawned - start,
+            ready=ready - spawned,
+            probe=end - ready,
+            readiness=readiness,
+        )
+
     def _kill_process(self, timeout: timedelta | None) -> None:
+        if self.shared_key is not None:
+            key = self.shared_key
+            self.shared_key = None
+            self._detach_shared(key, timeout=timeout)
+            return
+
         if self.process is None:
             return
 
@@ -136,6 +325,11 @@ class BaseQueryEngine:
                 self.process.send_signal(signal.SIGKILL)
 
         self.process = None
+        self._log_reader = None
+
+        if self.unix_path is not None:
+            utils.remove_unix_socket_path(self.unix_path)
+            self.unix_path = None
 
 
 class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
@@ -147,11 +341,22 @@ class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
         dml_path: Path,
         log_queries: bool = False,
         http_config: HttpConfig | None = None,
+        engine_protocol: EngineProtocol = 'graphql',
+        json_codec: JsonCodec | None = None,
+        transport: EngineTransport = 'tcp',
+        shared: bool = False,
     ) -> None:
         # this is a little weird but it's needed to distinguish between
         # the different required arguments for our two base classes
-        BaseQueryEngine.__init__(self, dml_path=dml_path, log_queries=log_queries)
-        SyncHTTPEngine.__init__(self, url=None, **(http_config or {}))
+        BaseQueryEngine.__init__(
+            self,
+            dml_path=dml_path,
+            log_queries=log_queries,
+            engine_protocol=engine_protocol,
+            transport=transport,
+            shared=shared,
+        )
+        SyncHTTPEngine.__init__(self, url=None, codec=json_codec, **(http_config or {}))
 
         # ensure the query engine process is terminated when we are
         atexit.register(self.stop)
@@ -180,11 +385,12 @@ class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
         if datasources:
             log.debug('Datasources: %s', datasources)
 
-        if self.process is not None:
+        if self._is_connected():
             raise errors.AlreadyConnectedError('Already connected to the query engine')
 
         start = time.monotonic()
         self.file = file = self._ensure_file()
+        ensured = time.monotonic()
 
         try:
             self.spawn(file, timeout=timeout, datasources=datasources)
@@ -192,7 +398,10 @@ class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
             self.close()
             raise
 
-        log.debug('Connecting to query engine took %s', time_since(start))
+        if self.startup_timings is not None:
+            self.startup_timings = self.startup_timings._replace(ensure=ensured - start)
+
+        log.debug('Connecting to query engine took %s (%s)', time_since(start), self.startup_timings)
 
     def spawn(
         self,
@@ -200,10 +409,23 @@ class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
         timeout: timedelta = DEFAULT_CONNECT_TIMEOUT,
         datasources: list[DatasourceOverride] | None = None,
     ) -> None:
-        self._spawn_process(file=file, datasources=datasources)
+        start = time.monotonic()
+        self._start_process(file=file, datasources=datasources)
+        self.session.uds = str(self.unix_path) if self.unix_path is not None else None
+        spawned = time.monotonic()
 
+        reader = self._log_reader
+        probed = spawned
         last_exc = None
-        for _ in range(int(timeout.total_seconds() / 0.1)):
+        for delay in self._iter_probe_delays(timeout, start=start):
+            if reader is not None and not reader.done:
+                # wake up as soon as the engine logs that it is listening, we still
+                # probe after the delay in case the message is never logged
+                reader.wait(delay)
+
+            self._check_process()
+            probed = time.monotonic()
+
             try:
                 data = self.request('GET', '/status')
             except Exception as exc:
@@ -216,22 +438,27 @@ class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
                     'Could not connect to query engine due to %s; retrying...',
                     exc,
                 )
-                time.sleep(0.1)
+                if reader is None or reader.done:
+                    time.sleep(delay)
                 continue
 
             if data.get('Errors') is not None:
                 log.debug('Could not connect due to gql errors; retrying...')
-                time.sleep(0.1)
+                if reader is None or reader.done:
+                    time.sleep(delay)
                 continue
 
             break
         else:
+            self._check_process()
             raise errors.EngineConnectionError('Could not connect to the query engine') from last_exc
 
+        self._record_startup(start=start, spawned=spawned, probed=probed)
+
     @override
     def query(
         self,
-        content: str,
+        content: str | bytes,
         *,
         tx_id: TransactionId | None,
     ) -> Any:
@@ -246,6 +473,24 @@ class SyncQueryEngine(BaseQueryEngine, SyncHTTPEngine):
             headers=headers,
         )
 
+    @override
+    def stream_query(
+        self,
+        content: str | bytes,
+        *,
+        tx_id: TransactionId | None,
+    ) -> Iterator[Any]:
+        headers: dict[str, str] = {}
+        if tx_id is not None:
+            headers['X-transaction-id'] = tx_id
+
+        return self.stream_request(
+            'POST',
+            '/',
+            content=content,
+            headers=headers,
+        )
+
     @override
     def start_transaction(self, *, content: str) -> TransactionId:
         result = self.request(
@@ -308,11 +553,24 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
         dml_path: Path,
         log_queries: bool = False,
         http_config: HttpConfig | None = None,
+        engine_protocol: EngineProtocol = 'graphql',
+        json_codec: JsonCodec | None = None,
+        transport: EngineTransport = 'tcp',
+        shared: bool = False,
+        limiter: ConcurrencyLimiter | None = None,
     ) -> None:
         # this is a little weird but it's needed to distinguish between
         # the different required arguments for our two base classes
-        BaseQueryEngine.__init__(self, dml_path=dml_path, log_queries=log_queries)
-        AsyncHTTPEngine.__init__(self, url=None, **(http_config or {}))
+        BaseQueryEngine.__init__(
+            self,
+            dml_path=dml_path,
+            log_queries=log_queries,
+            engine_protocol=engine_protocol,
+            transport=transport,
+            shared=shared,
+        )
+        AsyncHTTPEngine.__init__(self, url=None, codec=json_codec, **(http_config or {}))
+        self._limiter = limiter
 
         # ensure the query engine process is terminated when we are
         atexit.register(self.stop)
@@ -327,9 +585,13 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
 
     @override
     async def aclose(self, *, timeout: timedelta | None = None) -> None:
-        self.close(timeout=timeout)
+        log.debug('Disconnecting query engine...')
+
+        await self._kill_process_async(timeout=timeout)
         await self._close_session()
 
+        log.debug('Disconnected query engine')
+
     @override
     async def connect(
         self,
@@ -340,11 +602,12 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
         if datasources:
             log.debug('Datasources: %s', datasources)
 
-        if self.process is not None:
+        if self._is_connected():
             raise errors.AlreadyConnectedError('Already connected to the query engine')
 
         start = time.monotonic()
         self.file = file = self._ensure_file()
+        ensured = time.monotonic()
 
         try:
             await self.spawn(file, timeout=timeout, datasources=datasources)
@@ -352,7 +615,10 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
             self.close()
             raise
 
-        log.debug('Connecting to query engine took %s', time_since(start))
+        if self.startup_timings is not None:
+            self.startup_timings = self.startup_timings._replace(ensure=ensured - start)
+
+        log.debug('Connecting to query engine took %s (%s)', time_since(start), self.startup_timings)
 
     async def spawn(
         self,
@@ -360,10 +626,23 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
         timeout: timedelta = DEFAULT_CONNECT_TIMEOUT,
         datasources: list[DatasourceOverride] | None = None,
     ) -> None:
-        self._spawn_process(file=file, datasources=datasources)
+        start = time.monotonic()
+        await self._start_process_async(file=file, datasources=datasources)
+        self.session.uds = str(self.unix_path) if self.unix_path is not None else None
+        spawned = time.monotonic()
 
+        reader = self._log_reader
+        probed = spawned
         last_exc = None
-        for _ in range(int(timeout.total_seconds() / 0.1)):
+        for delay in self._iter_probe_delays(timeout, start=start):
+            if reader is not None and not reader.done:
+                # wake up as soon as the engine logs that it is listening, we still
+                # probe after the delay in case the message is never logged
+                await reader.wait_async(delay)
+
+            self._check_process()
+            probed = time.monotonic()
+
             try:
                 data = await self.request('GET', '/status')
             except Exception as exc:
@@ -376,22 +655,27 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
                     'Could not connect to query engine due to %s; retrying...',
                     exc,
                 )
-                await asyncio.sleep(0.1)
+                if reader is None or reader.done:
+                    await asyncio.sleep(delay)
                 continue
 
             if data.get('Errors') is not None:
                 log.debug('Could not connect due to gql errors; retrying...')
-                await asyncio.sleep(0.1)
+                if reader is None or reader.done:
+                    await asyncio.sleep(delay)
                 continue
 
             break
         else:
+            self._check_process()
             raise errors.EngineConnectionError('Could not connect to the query engine') from last_exc
 
+        self._record_startup(start=start, spawned=spawned, probed=probed)
+
     @override
     async def query(
         self,
-        content: str,
+        content: str | bytes,
         *,
         tx_id: TransactionId | None,
     ) -> Any:
@@ -399,12 +683,67 @@ class AsyncQueryEngine(BaseQueryEngine, AsyncHTTPEngine):
         if tx_id is not None:
             headers['X-transaction-id'] = tx_id
 
-        return await self.request(
+        # queries within a transaction are never queued as the transaction is already
+        # holding a database connection that would be blocked until they are sent
+        limiter = self._limiter
+        if limiter is None or tx_id is not None:
+            return await self.request(
+                'POST',
+                '/',
+                content=content,
+                headers=headers,
+            )
+
+        await limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = await self.request(
+                'POST',
+                '/',
+                content=content,
+                headers=headers,
+            )
+        except Exception as exc:
+            limiter.release(rtt=time.monotonic() - start, dropped=is_overloaded_error(exc))
+            raise
+        except BaseException:
+            # the query was cancelled so we don't know how long it would have taken
+            limiter.release()
+            raise
+
+        limiter.release(rtt=time.monotonic() - start)
+        return response
+
+    @override
+    def stream_query(
+        self,
+        content: str | bytes,
+        *,
+        tx_id: TransactionId | None,
+    ) -> AsyncIterator[Any]:
+        headers: dict[str, str] = {}
+        if tx_id is not None:
+            headers['X-transaction-id'] = tx_id
+
+        stream = self.stream_request(
             'POST',
             '/',
             content=content,
             headers=headers,
         )
+        if self._limiter is None or tx_id is not None:
+            return stream
+
+        return self._limit_stream(self._limiter, stream)
+
+    async def _limit_stream(self, limiter: ConcurrencyLimiter, stream: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        # the slot is held until the stream is finished as the response is still being received
+        await limiter.acquire()
+        try:
+            async for item in stream:
+                yield item
+        finally:
+            limiter.release()
 
     @override
     async def start_transaction(self, *, content: str) -> TransactionId:
@@ -0,0 +1,162 @@
+"""Support for sharing a single query engine process between multiple client processes.
+
+The state of the shared engine is stored in a JSON lockfile that is keyed on everything that
+influences how the engine is spawned, e.g. the schema and datasource overrides. Every process
+that is attached to the engine adds its pid to the lockfile and the engine is stopped when
+the last attached process detaches.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import signal
+import hashlib
+import logging
+from types import TracebackType
+from typing import IO, List, Optional
+from pathlib import Path
+from typing_extensions import TypedDict
+
+from . import errors
+from .. import config
+from ..binaries import platform
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+class SharedEngineState(TypedDict):
+    pid: int
+    """The pid of the query engine process"""
+
+    url: str
+    """The URL that the query engine is listening on"""
+
+    unix_path: Optional[str]
+    """The unix socket that the query engine is listening on, if any"""
+
+    clients: List[int]
+    """The pids of the processes that are attached to the engine, a pid may be present multiple times"""
+
+
+def make_key(*parts: str) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part.encode('utf-8'))
+        hasher.update(b'\0')
+
+    return hasher.hexdigest()[:32]
+
+
+class EngineLock:
+    """Exclusive, cross-process lock around the shared engine state for the given key"""
+
+    key: str
+    path: Path
+    lock_path: Path
+
+    def __init__(self, key: str) -> None:
+        if fcntl is None or platform.name() == 'windows':
+            raise errors.EngineConnectionError('Sharing the query engine between processes is not supported on Windows')
+
+        self.key = key
+        self.path = config.engine_lock_dir / f'{key}.json'
+        self.lock_path = config.engine_lock_dir / f'{key}.lock'
+        self._file: IO[bytes] | None = None
+
+    def __enter__(self) -> EngineLock:
+        assert fcntl is not None
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.lock_path.open('wb')
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        assert fcntl is not None
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def read(self) -> SharedEngineState | None:
+        """Returns the current state if the engine is still running"""
+        try:
+            state: SharedEngineState = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            log.debug('Ignoring malformed shared engine state at %s', self.path)
+            return None
+
+        if not is_process_alive(state['pid']):
+            log.debug('Shared query engine with pid %i is no longer running', state['pid'])
+            return None
+
+        state['clients'] = [pid for pid in state['clients'] if is_process_alive(pid)]
+        return state
+
+    def write(self, state: SharedEngineState) -> None:
+        # write to a temporary file first so that the state is never partially written
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, self.path)
+
+    def remove(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def is_process_alive(pid: int) -> bool:
+    try:
+        # if the process is our child then it must be reaped, otherwise it
+        # would be a zombie that still looks like it is running
+        reaped, _ = os.waitpid(pid, os.WNOHANG)
+    except ChildProcessError:
+        pass
+    else:
+        if reaped == pid:
+            return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # the process exists but is owned by a different user
+        return True
+
+    return True
+
+
+def kill_process(pid: int, *, timeout: float | None) -> None:
+    """Stop a query engine process that may not have been started by the current process"""
+    try:
+        os.kill(pid, signal.SIGINT)
+    except ProcessLookupError:
+        return
+
+    start = time.monotonic()
+    while is_process_alive(pid):
+        if timeout is not None and time.monotonic() - start > timeout:
+            log.debug('Shared query engine did not exit in time, killing it')
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            return
+
+        time.sleep(0.05)
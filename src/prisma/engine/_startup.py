@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import sys
+import json
+import time
+import asyncio
+import logging
+import threading
+from typing import IO, Any, List, Callable, Iterator, NamedTuple, cast
+from typing_extensions import Literal, override
+
+from ..utils import DEBUG
+
+__all__ = (
+    'StartupTimings',
+    'EngineLogReader',
+    'iter_backoff',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# the query engine logs this message once the HTTP server is accepting connections
+READY_MESSAGE = 'Started query engine http server'
+
+# the query engine logs at the error level by default, this enables the message above
+READY_LOG_TARGET = 'query_engine::server'
+READY_LOG_FILTER = f'{READY_LOG_TARGET}=info'
+
+
+class StartupTimings(NamedTuple):
+    """The time spent in each phase of connecting to the query engine, in seconds"""
+
+    ensure: float
+    """Resolving the query engine binary"""
+
+    spawn: float
+    """Starting the query engine process or attaching to a shared query engine"""
+
+    ready: float
+    """Waiting for the query engine to log that it is listening"""
+
+    probe: float
+    """Waiting for the query engine to respond to a status request"""
+
+    readiness: Literal['log', 'probe']
+    """Whether readiness was detected from the engine logs or only by probing"""
+
+    @property
+    def total(self) -> float:
+        return self.ensure + self.spawn + self.ready + self.probe
+
+    @override
+    def __str__(self) -> str:
+        return (
+            f'ensure={self.ensure:.4f}s spawn={self.spawn:.4f}s ready={self.ready:.4f}s '
+            f'probe={self.probe:.4f}s total={self.total:.4f}s readiness={self.readiness}'
+        )
+
+
+def _parse_server_log(line: bytes) -> dict[str, Any] | None:
+    """Returns the parsed log line if it was logged by the query engine HTTP server"""
+    if READY_LOG_TARGET.encode('utf-8') not in line:
+        return None
+
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+
+    if not isinstance(data, dict) or not str(data.get('target', '')).startswith(READY_LOG_TARGET):  # pyright: ignore
+        return None
+
+    return cast('dict[str, Any]', data)
+
+
+def is_ready_log(data: dict[str, Any]) -> bool:
+    fields = data.get('fields')
+    if not isinstance(fields, dict):
+        return False
+
+    message = cast('dict[str, Any]', fields).get('message')
+    return isinstance(message, str) and message.startswith(READY_MESSAGE)
+
+
+class EngineLogReader:
+    """Reads the output of the query engine in a background thread.
+
+    Output is forwarded to `sys.stdout` as if it was written there directly and
+    waiters are notified as soon as the engine logs that it is listening.
+    """
+
+    ready_at: float | None
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        self.ready_at = None
+        self._stream = stream
+        self._ready = threading.Event()
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self._thread = threading.Thread(target=self._run, name='prisma-query-engine-output', daemon=True)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def done(self) -> bool:
+        """Whether or not there is nothing left to wait for, i.e. the engine is ready or has closed its output"""
+        return self._done.is_set()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the engine is ready, has closed its output or the timeout has elapsed"""
+        self._done.wait(timeout)
+        return self.ready
+
+    async def wait_async(self, timeout: float) -> bool:
+        """Same as `wait()` but without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def notify() -> None:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # event loop is closed
+                pass
+
+        with self._lock:
+            if self._done.is_set():
+                return self.ready
+
+            self._callbacks.append(notify)
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        return self.ready
+
+    def _run(self) -> None:
+        try:
+            for line in iter(self._stream.readline, b''):
+                data = _parse_server_log(line)
+                if data is not None:
+                    if not self._ready.is_set() and is_ready_log(data):
+                        self.ready_at = time.monotonic()
+                        self._ready.set()
+                        self._notify()
+
+                    # these logs are only enabled so that we can detect when the engine is ready
+                    if not DEBUG and data.get('level') == 'INFO':
+                        continue
+
+                self._forward(line)
+        except Exception as exc:
+            log.debug('Stopped reading query engine output due to %s', exc)
+        finally:
+            self._notify()
+            self._stream.close()
+
+    def _forward(self, line: bytes) -> None:
+        try:
+            sys.stdout.write(line.decode('utf-8', errors='replace'))
+            sys.stdout.flush()
+        except ValueError:
+            # stdout has been closed
+            pass
+
+    def _notify(self) -> None:
+        with self._lock:
+            self._done.set()
+            callbacks = self._callbacks
+            self._callbacks = []
+
+        for callback in callbacks:
+            callback()
+
+
+def iter_backoff(timeout: float, *, initial: float = 0.001, maximum: float = 0.1) -> Iterator[float]:
+    """Yields exponentially increasing delays until the given timeout has elapsed.
+
+    The first attempt should be made before sleeping for the first delay.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+
+        yield min(delay, remaining)
+        delay = min(delay * 2, maximum)
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import os
 import sys
+import json
 import time
+import shutil
 import socket
 import logging
+import tempfile
 import subprocess
-from typing import Any, Dict, Type, NoReturn
+from typing import Any, Dict, Type, NoReturn, cast
 from pathlib import Path
 
 from . import errors
@@ -34,6 +37,9 @@ META_ERROR_MAPPING: dict[str, type[Exception]] = {
     'UnknownSelectionField': prisma_errors.FieldNotFoundError,
 }
 
+# stored in the binary cache dir, maps binary paths to the version they reported
+VERSION_CACHE_NAME = 'query-engine-versions.json'
+
 
 def query_engine_name() -> str:
     return f'prisma-query-engine-{platform.check_for_extension(platform.binary_platform())}'
@@ -114,21 +120,92 @@ def ensure(binary_paths: dict[str, str]) -> Path:
 
     log.debug('Using Query Engine binary at %s', file)
 
-    start_version = time.monotonic()
-    process = subprocess.run([str(file.absolute()), '--version'], stdout=subprocess.PIPE, check=True)
-    log.debug('Version check took %s', time_since(start_version))
+    version = _get_cached_version(file)
+    if version is None:
+        start_version = time.monotonic()
+        process = subprocess.run([str(file.absolute()), '--version'], stdout=subprocess.PIPE, check=True)
+        log.debug('Version check took %s', time_since(start_version))
+
+        version = str(process.stdout, sys.getdefaultencoding()).replace('query-engine', '').strip()
+        cached = False
+    else:
+        log.debug('Using cached version for %s', file)
+        cached = True
 
-    version = str(process.stdout, sys.getdefaultencoding()).replace('query-engine', '').strip()
     log.debug('Using query engine version %s', version)
 
     if force_version and version != config.expected_engine_version:
         raise errors.MismatchedVersionsError(expected=config.expected_engine_version, got=version)
 
+    if not cached:
+        # we only cache binaries that have passed the version check
+        _set_cached_version(file, version)
+
     log.debug('Using query engine at %s', file)
     log.debug('Ensuring query engine took: %s', time_since(start_time))
     return file
 
 
+def version_cache_path() -> Path:
+    return config.binary_cache_dir.joinpath(VERSION_CACHE_NAME)
+
+
+def _fingerprint(file: Path) -> dict[str, int]:
+    stat = file.stat()
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'inode': stat.st_ino,
+    }
+
+
+def _read_version_cache() -> dict[str, Any]:
+    try:
+        data = json.loads(version_cache_path().read_text())
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict):
+        return {}
+
+    return cast('dict[str, Any]', data)
+
+
+def _get_cached_version(file: Path) -> str | None:
+    """Returns the version of the given binary if it has previously been checked and has not since been modified"""
+    entry = _read_version_cache().get(str(file.absolute()))
+    if not isinstance(entry, dict):
+        return None
+
+    try:
+        fingerprint = _fingerprint(file)
+    except OSError:
+        return None
+
+    entry = cast('dict[str, Any]', entry)
+    if any(entry.get(key) != value for key, value in fingerprint.items()):
+        log.debug('Ignoring cached version for %s as it has been modified', file)
+        return None
+
+    version = entry.get('version')
+    return version if isinstance(version, str) else None
+
+
+def _set_cached_version(file: Path, version: str) -> None:
+    path = version_cache_path()
+    try:
+        cache = _read_version_cache()
+        cache[str(file.absolute())] = {**_fingerprint(file), 'version': version}
+
+        # write to a temporary file first as other processes may be reading the cache concurrently
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(cache))
+        os.replace(tmp, path)
+    except OSError as exc:
+        log.debug('Could not write the query engine version cache due to %s', exc)
+
+
 def get_open_port() -> int:
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.bind(('', 0))
@@ -137,7 +214,34 @@ def get_open_port() -> int:
     return int(port)
 
 
+def make_unix_socket_path() -> Path:
+    """Returns a path within a new private temporary directory that the query engine can listen on.
+
+    Note: the directory is kept short as unix socket paths are limited to ~100 characters.
+    """
+    if platform.name() == 'windows':
+        raise errors.EngineConnectionError(
+            'Connecting to the query engine over a unix socket is not supported on Windows'
+        )
+
+    return Path(tempfile.mkdtemp(prefix='prisma-')) / 'query-engine.sock'
+
+
+def remove_unix_socket_path(path: Path) -> None:
+    """Remove the directory created by `make_unix_socket_path()`"""
+    shutil.rmtree(path.parent, ignore_errors=True)
+
+
 def handle_response_errors(resp: AbstractResponse[Any], data: Any) -> NoReturn:
+    exc = get_response_error(data)
+    if exc is not None:
+        raise exc
+
+    raise errors.EngineRequestError(resp, f'Could not process erroneous response: {data}')
+
+
+def get_response_error(data: Any) -> Exception | None:
+    """Returns the exception that corresponds to the `errors` of a query engine response"""
     for error in data:
         try:
             base_error_message = error.get('error', '')
@@ -156,11 +260,11 @@ def handle_response_errors(resp: AbstractResponse[Any], data: Any) -> NoReturn:
 
             if code == 'P2028':
                 if base_error_message.startswith('Transaction already closed'):
-                    raise prisma_errors.TransactionExpiredError(base_error_message)
-                raise prisma_errors.TransactionError(message)
+                    return prisma_errors.TransactionExpiredError(base_error_message)
+                return prisma_errors.TransactionError(message)
 
             if 'A value is required but not set' in message:
-                raise prisma_errors.MissingRequiredValueError(error)
+                return prisma_errors.MissingRequiredValueError(error)
 
             exc: type[Exception] | None = None
 
@@ -172,14 +276,21 @@ def handle_response_errors(resp: AbstractResponse[Any], data: Any) -> NoReturn:
                 exc = ERROR_MAPPING.get(code)
 
             if exc is not None:
-                raise exc(error)
+                return exc(error)
         except (KeyError, TypeError) as err:
             log.debug('Ignoring error while constructing specialized error %s', err)
             continue
 
     try:
-        raise prisma_errors.DataError(data[0])
+        return prisma_errors.DataError(data[0])
     except (IndexError, TypeError):
-        pass
+        return None
 
-    raise errors.EngineRequestError(resp, f'Could not process erroneous response: {data}')
+
+def get_batch_item_error(data: Any) -> Exception:
+    """Returns the exception for a single query in a batched request that did not succeed"""
+    exc = get_response_error(data)
+    if exc is not None:
+        return exc
+
+    return errors.EngineError(f'Could not process erroneous batch result: {data}')
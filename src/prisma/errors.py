@@ -141,6 +141,35 @@ class TransactionNotStartedError(TransactionError):
         )
 
 
+class BatchNotCommittedError(PrismaError):
+    def __init__(self) -> None:
+        super().__init__('The result of a batch operation is not available until the batch has been committed.')
+
+
+class QueryQueueError(PrismaError):
+    """Base class for errors raised when a query could not be sent because of the client's `concurrency_limit`"""
+
+    pass
+
+
+class QueryQueueFullError(QueryQueueError):
+    max_queue_length: int
+
+    def __init__(self, max_queue_length: int) -> None:
+        super().__init__(
+            f'Could not queue the query as there are already {max_queue_length} queries waiting to be sent.'
+        )
+        self.max_queue_length = max_queue_length
+
+
+class QueryQueueTimeoutError(QueryQueueError):
+    timeout: float
+
+    def __init__(self, timeout: float) -> None:
+        super().__init__(f'Query was not sent as it was queued for longer than the {timeout}s queue timeout.')
+        self.timeout = timeout
+
+
 class BuilderError(PrismaError):
     pass
 
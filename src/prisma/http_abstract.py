@@ -32,9 +32,13 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 class AbstractHTTP(ABC, Generic[Session, Response]):
     session_kwargs: Dict[str, Any]
 
+    uds: Optional[str]
+    """Path to a unix domain socket that requests should be sent over instead of TCP"""
+
     __slots__ = (
         '_session',
         'session_kwargs',
+        'uds',
     )
 
     # NOTE: ParamSpec wouldn't be valid here:
@@ -48,6 +52,18 @@ class AbstractHTTP(ABC, Generic[Session, Response]):
             **DEFAULT_CONFIG,
             **kwargs,
         }
+        self.uds = None
+
+    def _transport_kwargs(self) -> Dict[str, Any]:
+        """Returns the session options that must be passed to the transport instead of the client
+        when connecting over a unix domain socket.
+        """
+        assert self.uds is not None
+        kwargs: Dict[str, Any] = {'uds': self.uds}
+        for key in ('limits', 'http1', 'http2'):
+            if key in self.session_kwargs:
+                kwargs[key] = self.session_kwargs[key]
+        return kwargs
 
     @abstractmethod
     def download(self, url: str, dest: str) -> MaybeCoroutine[None]: ...
@@ -110,6 +126,9 @@ class AbstractResponse(ABC, Generic[Response]):
     @abstractmethod
     def headers(self) -> Headers: ...
 
+    @abstractmethod
+    def read(self) -> MaybeCoroutine[bytes]: ...
+
     @abstractmethod
     def json(self) -> MaybeCoroutine[Any]: ...
 
@@ -0,0 +1,220 @@
+"""Algorithms for adjusting the number of queries that can be sent at the same time.
+
+These are used with the `concurrency_limit` client option, for example:
+
+```py
+from prisma import Prisma
+from prisma.limits import GradientLimit
+
+db = Prisma(concurrency_limit={'algorithm': GradientLimit(max_limit=50)})
+```
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+from datetime import timedelta
+from typing_extensions import override
+
+__all__ = (
+    'LimitSample',
+    'LimitAlgorithm',
+    'FixedLimit',
+    'AIMDLimit',
+    'GradientLimit',
+)
+
+
+class LimitSample(NamedTuple):
+    """The measurements taken from a single query that was sent to the query engine"""
+
+    rtt: float
+    """How long it took for the query engine to respond, in seconds"""
+
+    in_flight: int
+    """The number of queries that were in flight when the query finished, including the query itself"""
+
+    dropped: bool
+    """Whether or not the query failed because the query engine or database is overloaded, e.g. timeouts"""
+
+
+class LimitAlgorithm(ABC):
+    """Base class for algorithms that calculate how many queries can be sent to the query engine at the same time.
+
+    `update()` is called with the measurements of every query that is sent, the returned limit applies to every
+    query that is made afterwards.
+    """
+
+    @property
+    @abstractmethod
+    def limit(self) -> int:
+        """The current number of queries that can be sent at the same time, this must be at least 1"""
+        ...
+
+    @abstractmethod
+    def update(self, sample: LimitSample) -> int:
+        """Adjust the limit based on a query that has just finished and return the new limit"""
+        ...
+
+    @override
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(limit={self.limit})'
+
+
+def _validate_bounds(initial_limit: int, min_limit: int, max_limit: int) -> None:
+    if min_limit < 1:
+        raise ValueError(f'Expected `min_limit` to be at least 1 but got {min_limit}')
+
+    if max_limit < min_limit:
+        raise ValueError(f'Expected `max_limit` to be at least `min_limit` ({min_limit}) but got {max_limit}')
+
+    if not min_limit <= initial_limit <= max_limit:
+        raise ValueError(
+            f'Expected `initial_limit` to be between `min_limit` ({min_limit}) and `max_limit` ({max_limit}) '
+            f'but got {initial_limit}'
+        )
+
+
+class FixedLimit(LimitAlgorithm):
+    """A limit that never changes"""
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError(f'Expected `limit` to be at least 1 but got {limit}')
+        self._limit = limit
+
+    @property
+    @override
+    def limit(self) -> int:
+        return self._limit
+
+    @override
+    def update(self, sample: LimitSample) -> int:  # noqa: ARG002
+        return self._limit
+
+
+class AIMDLimit(LimitAlgorithm):
+    """Additive increase, multiplicative decrease.
+
+    The limit is increased by one for every query that succeeds while at least half of the limit is in use
+    and is multiplied by `backoff_ratio` whenever a query is dropped or takes longer than `timeout`.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.9,
+        timeout: timedelta = timedelta(seconds=5),
+    ) -> None:
+        _validate_bounds(initial_limit, min_limit, max_limit)
+        if not 0 < backoff_ratio < 1:
+            raise ValueError(f'Expected `backoff_ratio` to be between 0 and 1 but got {backoff_ratio}')
+
+        self._limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.timeout = timeout.total_seconds()
+
+    @property
+    @override
+    def limit(self) -> int:
+        return self._limit
+
+    @override
+    def update(self, sample: LimitSample) -> int:
+        limit = self._limit
+        if sample.dropped or sample.rtt > self.timeout:
+            limit = int(limit * self.backoff_ratio)
+        elif sample.in_flight * 2 >= limit:
+            # only increase the limit if it is actually being used, otherwise a long quiet
+            # period would increase the limit far past the capacity of the database
+            limit += 1
+
+        self._limit = max(self.min_limit, min(self.max_limit, limit))
+        return self._limit
+
+
+class GradientLimit(LimitAlgorithm):
+    """Adjusts the limit based on the difference between the current latency and the long term average latency.
+
+    When the latency of a query rises above `rtt_tolerance` times the long term average, queries are assumed
+    to be queueing within the database and the limit is reduced in proportion, otherwise the limit grows by
+    `queue_size`. Changes are smoothed by `smoothing` so that a single slow query does not halve the limit.
+
+    This is based on the Gradient2 algorithm from Netflix's `concurrency-limits` library.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        smoothing: float = 0.2,
+        rtt_tolerance: float = 1.5,
+        long_window: int = 600,
+        queue_size: int = 4,
+    ) -> None:
+        _validate_bounds(initial_limit, min_limit, max_limit)
+        if not 0 < smoothing <= 1:
+            raise ValueError(f'Expected `smoothing` to be between 0 and 1 but got {smoothing}')
+
+        if rtt_tolerance < 1:
+            raise ValueError(f'Expected `rtt_tolerance` to be at least 1 but got {rtt_tolerance}')
+
+        if long_window < 1:
+            raise ValueError(f'Expected `long_window` to be at least 1 but got {long_window}')
+
+        self._estimated_limit = float(initial_limit)
+        self._long_rtt: float | None = None
+        self._long_rtt_factor = 2 / (long_window + 1)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.smoothing = smoothing
+        self.rtt_tolerance = rtt_tolerance
+        self.queue_size = queue_size
+
+    @property
+    @override
+    def limit(self) -> int:
+        return int(self._estimated_limit)
+
+    @property
+    def long_rtt(self) -> float | None:
+        """The exponential moving average of every query latency, in seconds"""
+        return self._long_rtt
+
+    @override
+    def update(self, sample: LimitSample) -> int:
+        short_rtt = max(sample.rtt, 1e-9)
+        long_rtt = self._long_rtt
+        if long_rtt is None:
+            long_rtt = short_rtt
+        else:
+            long_rtt += (short_rtt - long_rtt) * self._long_rtt_factor
+
+        # the latency has dropped far below the long term average, e.g. because the load has dropped,
+        # so we decay the average faster than usual to stop the limit from growing indefinitely
+        if long_rtt / short_rtt > 2:
+            long_rtt *= 0.95
+
+        self._long_rtt = long_rtt
+
+        # the limit isn't being used so the measurements tell us nothing about whether or not it should grow
+        if not sample.dropped and sample.in_flight < self._estimated_limit / 2:
+            return self.limit
+
+        if sample.dropped:
+            gradient = 0.5
+        else:
+            gradient = max(0.5, min(1.0, self.rtt_tolerance * long_rtt / short_rtt))
+
+        new_limit = self._estimated_limit * gradient + self.queue_size
+        new_limit = self._estimated_limit * (1 - self.smoothing) + new_limit * self.smoothing
+        self._estimated_limit = max(float(self.min_limit), min(float(self.max_limit), new_limit))
+        return self.limit
@@ -1,6 +1,25 @@
 import inspect
+from typing import Any, cast
 
-from prisma import Prisma
+import pytest
+
+from prisma import Prisma, errors
+from prisma._batch import BatchOperation, parse_raw_count, parse_aggregate_count, process_batch_response
+
+# arguments that only apply to queries that are sent on their own and are therefore not accepted by batch methods
+UNBATCHED_ARGUMENTS = {
+    'create_many': {
+        'chunk_size',
+        'max_chunk_bytes',
+        'concurrency',
+        'transaction',
+        'transaction_timeout',
+        'on_progress',
+    },
+    # results of batched queries are always validated and returned as models
+    'find_unique': {'validate'},
+    'find_many': {'validate', 'as_columns'},
+}
 
 
 def test_ensure_batch_and_action_signatures_are_equal(client: Prisma) -> None:
@@ -21,5 +40,55 @@ def test_ensure_batch_and_action_signatures_are_equal(client: Prisma) -> None:
             continue
 
         actual = inspect.signature(meth).replace(return_annotation=inspect.Signature.empty)
-        expected = inspect.signature(getattr(actions, name)).replace(return_annotation=inspect.Signature.empty)
+        expected = inspect.signature(getattr(actions, name))
+        unbatched = UNBATCHED_ARGUMENTS.get(name, set())
+        expected = expected.replace(
+            parameters=[param for param in expected.parameters.values() if param.name not in unbatched],
+            return_annotation=inspect.Signature.empty,
+        )
         assert actual == expected, f'{name} methods are inconsistent'
+
+
+def test_create_many_chunking_arguments_are_not_accepted(client: Prisma) -> None:
+    """The arguments for splitting create_many() into multiple queries cannot be used within a batch"""
+    batcher = client.batch_()
+    parameters = inspect.signature(batcher.user.create_many).parameters
+    assert not UNBATCHED_ARGUMENTS['create_many'] & set(parameters)
+
+    with pytest.raises(TypeError):
+        batcher.user.create_many([{'name': 'Robert'}], chunk_size=1)  # type: ignore[call-arg]
+
+
+class _FakeBuilder:
+    def process_response(self, data: Any) -> Any:
+        return data
+
+
+def test_process_batch_response() -> None:
+    """Results and errors are stored on the operation they belong to"""
+    first = BatchOperation(cast(Any, _FakeBuilder()), parse_raw_count)
+    second = BatchOperation(cast(Any, _FakeBuilder()), parse_aggregate_count)
+    assert not first.done()
+
+    with pytest.raises(errors.BatchNotCommittedError):
+        first.result()
+
+    error = {
+        'error': 'Unique constraint failed',
+        'user_facing_error': {'error_code': 'P2002', 'message': 'Unique constraint failed'},
+    }
+    results = process_batch_response(
+        [first, second],
+        {'batchResult': [{'data': {'result': 3}}, {'errors': [error]}]},
+    )
+
+    assert results[0] == 3
+    assert isinstance(results[1], errors.UniqueViolationError)
+
+    assert first.done()
+    assert first.result() == 3
+    assert first.exception() is None
+
+    assert second.exception() is results[1]
+    with pytest.raises(errors.UniqueViolationError):
+        second.result()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import datetime
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import pytest
 from pydantic import BaseModel
@@ -12,9 +12,12 @@ from prisma.bases import _PrismaModel as PrismaModel
 from prisma.utils import _NoneType
 from prisma.errors import UnknownModelError, UnknownRelationalFieldError
 from prisma._compat import PYDANTIC_V2
-from prisma._builder import QueryBuilder, serializer
+from prisma._builder import QueryBuilder, QueryTemplateCache, serializer
 from prisma.metadata import PRISMA_MODELS, RELATIONAL_FIELD_MAPPINGS
 
+if TYPE_CHECKING:
+    from _pytest.monkeypatch import MonkeyPatch
+
 # TODO: more tests
 # TODO: cleanup registered serializers
 # TODO: these tests should be schema agnostic
@@ -537,3 +540,145 @@ def test_forward_reference_error() -> None:
             prisma_models=PRISMA_MODELS,
             relational_field_mappings=RELATIONAL_FIELD_MAPPINGS,
         ).build_query()
+
+
+def test_compact_building() -> None:
+    """Queries can be emitted without any insignificant whitespace"""
+    query = QueryBuilder(
+        method='find_unique',
+        model=models.User,
+        arguments={
+            'where': {'id': '1'},
+            'include': {
+                'posts': {'where': {'title': {'in': ['foo', 'bar']}}, 'take': None, 'include': {'categories': True}},
+                'profile': False,
+            },
+        },
+        prisma_models=PRISMA_MODELS,
+        relational_field_mappings=RELATIONAL_FIELD_MAPPINGS,
+    ).build_query(pretty=False)
+    assert query == snapshot(
+        'query{result:findUniqueUser(where:{id:"1"}){id name email created_at posts(where:{title:{in:["foo","bar"]}})'
+        '{id created_at updated_at title published views desc author_id categories{id name}}}}'
+    )
+
+    query = QueryBuilder(
+        method='query_raw',
+        arguments={'query': 'SELECT * FROM User where id = $1', 'parameters': ['1263526'], 'empty': {}},
+        prisma_models=PRISMA_MODELS,
+        relational_field_mappings=RELATIONAL_FIELD_MAPPINGS,
+    ).build_query(pretty=False)
+    assert query == snapshot(
+        'mutation{result:queryRaw(query:"SELECT * FROM User where id = $1",parameters:"[\\"1263526\\"]",empty:{})}'
+    )
+
+
+@pytest.mark.parametrize('cached', [True, False])
+def test_compact_building_cache(cached: bool, monkeypatch: MonkeyPatch) -> None:
+    """Compact queries are cached separately from pretty queries"""
+    cache = QueryTemplateCache(enabled=cached)
+    monkeypatch.setattr('prisma._builder.query_cache', cache)
+
+    builder = QueryBuilder(
+        method='count',
+        model=models.Post,
+        arguments={'where': {'title': 'foo'}},
+        root_selection=['_count { _all }'],
+        prisma_models=PRISMA_MODELS,
+        relational_field_mappings=RELATIONAL_FIELD_MAPPINGS,
+    )
+    assert builder.build_query(pretty=False) == 'query{result:aggregatePost(where:{title:"foo"}){_count { _all }}}'
+    assert '\n' in builder.build_query(pretty=True)
+    assert builder.build_query(pretty=False) == 'query{result:aggregatePost(where:{title:"foo"}){_count { _all }}}'
+
+    if cached:
+        assert cache.info() == (1, 2, 512, 2)
+
+
+def test_query_cache_matches_uncached(monkeypatch: MonkeyPatch) -> None:
+    """Queries built from a cached template are identical to queries rendered from scratch"""
+    cases: list[dict[str, Any]] = [
+        {'method': 'find_unique', 'model': models.User, 'arguments': {'where': {'id': '1'}}},
+        {
+            'method': 'find_many',
+            'model': models.User,
+            'arguments': {
+                'where': {'name': {'in': ['Robert', 'Tegan"\n']}, 'email': None},
+                'take': None,
+                'order_by': [{'id': 'desc'}],
+                'include': {'posts': {'where': {'published': True}, 'include': {'categories': True}}},
+            },
+        },
+        {
+            'method': 'query_raw',
+            'arguments': {'query': 'SELECT * FROM User where id = $1', 'parameters': ['1263526', 2]},
+        },
+        {
+            'method': 'find_unique',
+            'model': models.Post,
+            'arguments': {'where': {'created_at': datetime.datetime(1985, 10, 26, 1, 1, 1)}},
+        },
+        {
+            'method': 'count',
+            'model': models.Post,
+            'arguments': {'where': {'title': '❤'}},
+            'root_selection': ['_count { _all }'],
+        },
+    ]
+
+    for case in cases:
+        monkeypatch.setattr('prisma._builder.query_cache', QueryTemplateCache(enabled=False))
+        expected = build_query(**case)
+
+        monkeypatch.setattr('prisma._builder.query_cache', QueryTemplateCache())
+        assert build_query(**case) == expected
+        assert build_query(**case) == expected
+
+
+def test_query_cache_substitutes_values(monkeypatch: MonkeyPatch) -> None:
+    """Queries with the same shape re-use the same template with different values"""
+    cache = QueryTemplateCache()
+    monkeypatch.setattr('prisma._builder.query_cache', cache)
+
+    build_query(method='find_unique', model=models.User, arguments={'where': {'id': '1'}})
+    query = build_query(method='find_unique', model=models.User, arguments={'where': {'id': '2'}})
+    assert 'id: "2"' in query
+
+    info = cache.info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+    # different argument keys result in a different shape
+    build_query(method='find_unique', model=models.User, arguments={'where': {'email': 'robert@craigie.dev'}})
+    assert cache.info().misses == 2
+
+
+def test_query_cache_disabled(monkeypatch: MonkeyPatch) -> None:
+    """Templates are not cached when the cache is disabled"""
+    cache = QueryTemplateCache(enabled=False)
+    monkeypatch.setattr('prisma._builder.query_cache', cache)
+
+    build_query(method='find_unique', model=models.User, arguments={'where': {'id': '1'}})
+    build_query(method='find_unique', model=models.User, arguments={'where': {'id': '1'}})
+
+    info = cache.info()
+    assert info.hits == 0
+    assert info.misses == 0
+    assert info.currsize == 0
+
+
+def test_query_cache_eviction(monkeypatch: MonkeyPatch) -> None:
+    """The least recently used template is evicted once the cache is full"""
+    cache = QueryTemplateCache(maxsize=2)
+    monkeypatch.setattr('prisma._builder.query_cache', cache)
+
+    build_query(method='find_unique', model=models.User, arguments={'where': {'id': '1'}})
+    build_query(method='find_unique', model=models.User, arguments={'where': {'email': 'foo'}})
+    build_query(method='find_unique', model=models.User, arguments={'where': {'id': '2'}})
+    build_query(method='find_unique', model=models.User, arguments={'where': {'name': 'foo'}})
+    assert cache.info().currsize == 2
+
+    # the `email` template was evicted
+    build_query(method='find_unique', model=models.User, arguments={'where': {'email': 'bar'}})
+    assert cache.info() == (1, 4, 2, 2)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import time
+from typing import AsyncIterator
+from datetime import timedelta
+
+import pytest
+
+from prisma import Prisma
+from prisma._cache import QueryCache, get_query_tags
+
+MAPPINGS = {
+    'User': {'posts': 'Post', 'profile': 'Profile'},
+    'Post': {'author': 'User', 'categories': 'Category'},
+    'Profile': {'user': 'User'},
+    'Category': {'posts': 'Post'},
+}
+
+
+def test_query_tags() -> None:
+    """Every model that is included or filtered on is added"""
+    assert get_query_tags('find_many', 'User', {'where': {'name': 'Robert'}}, MAPPINGS) == {'User'}
+    assert get_query_tags('find_many', 'User', {}, MAPPINGS, include={'posts': True}) == {'User', 'Post'}
+    assert get_query_tags(
+        'find_many',
+        'User',
+        {},
+        MAPPINGS,
+        include={'posts': {'include': {'categories': True}}},
+    ) == {'User', 'Post', 'Category'}
+    assert get_query_tags(
+        'find_many',
+        'User',
+        {
+            'where': {'OR': [{'name': 'Robert'}, {'posts': {'some': {'categories': {'none': {}}}}}]},
+        },
+        MAPPINGS,
+    ) == {'User', 'Post', 'Category'}
+    assert get_query_tags(
+        'create',
+        'User',
+        {'data': {'name': 'Robert', 'profile': {'create': {'bio': 'Hello'}}}},
+        MAPPINGS,
+    ) == {'User', 'Profile'}
+
+
+def test_query_tags_delete() -> None:
+    """Deleting a record may also modify any model that is related to it"""
+    assert get_query_tags('delete', 'Profile', {'where': {'id': 1}}, MAPPINGS) == {
+        'Profile',
+        'User',
+        'Post',
+        'Category',
+    }
+
+
+def test_query_tags_raw() -> None:
+    assert get_query_tags('execute_raw', None, {'query': 'DELETE FROM User'}, MAPPINGS) is None
+
+
+def test_get_set() -> None:
+    cache = QueryCache()
+    with pytest.raises(KeyError):
+        cache.get('foo')
+
+    result = {'data': {'result': [{'id': 1}]}}
+    cache.set('foo', result, tags=frozenset({'User'}), generation=cache.generation)
+    assert cache.get('foo') == result
+
+    # stored results cannot be modified by callers
+    result['data']['result'].clear()
+    cache.get('foo')['data']['result'].clear()
+    assert cache.get('foo') == {'data': {'result': [{'id': 1}]}}
+
+    stats = cache.stats()
+    assert stats.hits == 3
+    assert stats.misses == 1
+    assert stats.hit_ratio == 0.75
+    assert stats.size == 1
+
+
+def test_lru_eviction() -> None:
+    """The least recently used result is evicted first"""
+    cache = QueryCache({'max_size': 2})
+    tags = frozenset({'User'})
+    cache.set('a', 1, tags=tags, generation=cache.generation)
+    cache.set('b', 2, tags=tags, generation=cache.generation)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3, tags=tags, generation=cache.generation)
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    with pytest.raises(KeyError):
+        cache.get('b')
+
+    assert cache.stats().evictions == 1
+
+
+def test_invalidate() -> None:
+    """Only results tagged with an invalidated model are removed"""
+    cache = QueryCache()
+    cache.set('users', 1, tags=frozenset({'User'}), generation=cache.generation)
+    cache.set('posts', 2, tags=frozenset({'Post'}), generation=cache.generation)
+    cache.set('users_and_posts', 3, tags=frozenset({'User', 'Post'}), generation=cache.generation)
+
+    cache.invalidate({'Post'})
+    assert cache.get('users') == 1
+    for key in ('posts', 'users_and_posts'):
+        with pytest.raises(KeyError):
+            cache.get(key)
+
+    cache.invalidate(None)
+    with pytest.raises(KeyError):
+        cache.get('users')
+
+    assert cache.stats().invalidations == 3
+
+
+def test_stale_results_are_not_stored() -> None:
+    """Results for queries that were sent before an invalidation are not stored"""
+    cache = QueryCache()
+    generation = cache.generation
+    cache.invalidate({'Post'})
+    cache.set('users', 1, tags=frozenset({'User'}), generation=generation)
+
+    with pytest.raises(KeyError):
+        cache.get('users')
+
+
+def test_transactions() -> None:
+    """Results for models modified within a transaction are not stored until the transaction finishes"""
+    cache = QueryCache()
+    cache.invalidate({'User'}, tx_id='tx')
+
+    cache.set('users', 1, tags=frozenset({'User'}), generation=cache.generation)
+    cache.set('posts', 2, tags=frozenset({'Post'}), generation=cache.generation)
+    with pytest.raises(KeyError):
+        cache.get('users')
+    assert cache.get('posts') == 2
+
+    cache.release('tx')
+    cache.set('users', 1, tags=frozenset({'User'}), generation=cache.generation)
+    assert cache.get('users') == 1
+
+
+def test_ttl() -> None:
+    """Results expire after the TTL of the models that they select"""
+    cache = QueryCache({'ttl': timedelta(seconds=10), 'model_ttls': {'Post': timedelta(milliseconds=20)}})
+    cache.set('users', 1, tags=frozenset({'User'}), generation=cache.generation)
+    cache.set('posts', 2, tags=frozenset({'User', 'Post'}), generation=cache.generation)
+
+    time.sleep(0.03)
+    assert cache.get('users') == 1
+    with pytest.raises(KeyError):
+        cache.get('posts')
+
+    assert cache.stats().expirations == 1
+
+
+def test_invalid_config() -> None:
+    with pytest.raises(ValueError, match='max_size'):
+        QueryCache({'max_size': 0})
+
+    with pytest.raises(TypeError, match='model_ttls.User'):
+        QueryCache({'model_ttls': {'User': 10}})  # type: ignore[dict-item]
+
+
+@pytest.fixture(name='cached')
+async def cached_fixture(client: Prisma) -> AsyncIterator[Prisma]:
+    cached = Prisma(cache=True)
+    await cached.connect()
+    yield cached
+    await cached.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_client_cache(cached: Prisma) -> None:
+    """Read queries are cached until a write query modifies the model"""
+    user = await cached.user.create({'name': 'Robert'})
+
+    assert await cached.user.count() == 1
+    assert await cached.user.count() == 1
+    found = await cached.user.find_unique(where={'id': user.id}, include={'posts': True})
+    assert found is not None
+    assert found.posts == []
+
+    stats = cached.get_cache_stats()
+    assert stats.hits == 1
+    assert stats.misses == 2
+
+    await cached.post.create({'title': 'Hi', 'published': False})
+
+    # the count query did not select posts
+    assert await cached.user.count() == 1
+    assert cached.get_cache_stats().hits == 2
+
+    await cached.user.find_unique(where={'id': user.id}, include={'posts': True})
+    stats = cached.get_cache_stats()
+    assert stats.hits == 2
+    assert stats.misses == 3
+
+
+@pytest.mark.asyncio
+async def test_client_cache_transaction(cached: Prisma) -> None:
+    """Writes within a transaction invalidate the cache"""
+    assert await cached.user.count() == 0
+
+    async with cached.tx() as tx:
+        await tx.user.create({'name': 'Robert'})
+
+    assert await cached.user.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_client_cache_batch(cached: Prisma) -> None:
+    """Batched writes invalidate the cache"""
+    assert await cached.user.count() == 0
+
+    async with cached.batch_() as batcher:
+        batcher.user.create({'name': 'Robert'})
+
+    assert await cached.user.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_client_cache_disabled(client: Prisma) -> None:
+    await client.user.count()
+    await client.user.count()
+    assert client.get_cache_stats().hits == 0
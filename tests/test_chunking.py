@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import time
+import asyncio
+import threading
+from typing import Any, Dict, List, Iterator
+
+import pytest
+
+from prisma._types import CreateManyProgress
+from prisma._chunking import run_chunks, arun_chunks, iter_chunks
+
+
+def rows(count: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {'id': i, 'name': 'a'}
+
+
+@pytest.mark.parametrize(
+    'count,chunk_size,expected',
+    [
+        (0, 3, []),
+        (3, 3, [3]),
+        (7, 3, [3, 3, 1]),
+        (2, 5, [2]),
+    ],
+)
+def test_iter_chunks_size(count: int, chunk_size: int, expected: List[int]) -> None:
+    chunks = list(iter_chunks(rows(count), chunk_size=chunk_size))
+    assert [len(chunk) for chunk in chunks] == expected
+    assert [row['id'] for chunk in chunks for row in chunk] == list(range(count))
+
+
+def test_iter_chunks_bytes() -> None:
+    """Chunks are ended before they would exceed the given size"""
+    row_size = len('{"id": 0, "name": "a"}')
+    chunks = list(iter_chunks(rows(10), max_chunk_bytes=row_size * 3 + 1))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+
+    # both limits are respected
+    chunks = list(iter_chunks(rows(10), chunk_size=2, max_chunk_bytes=row_size * 3 + 1))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 2, 2]
+
+
+def test_iter_chunks_oversized_row() -> None:
+    """Rows that are larger than the limit are sent by themselves"""
+    data = [{'name': 'a'}, {'name': 'a' * 100}, {'name': 'b'}, {'name': 'c'}]
+    chunks = list(iter_chunks(data, max_chunk_bytes=50))
+    assert chunks == [[data[0]], [data[1]], [data[2], data[3]]]
+
+
+def test_iter_chunks_no_options() -> None:
+    """Every row is sent in a single chunk by default"""
+    data = list(rows(5))
+    chunks = list(iter_chunks(data))
+    assert len(chunks) == 1
+    assert chunks[0] is data
+
+    assert list(iter_chunks(rows(5))) == [data]
+    assert list(iter_chunks([])) == []
+
+
+def test_iter_chunks_lazy() -> None:
+    """Rows are only consumed as chunks are requested"""
+    consumed: List[int] = []
+
+    def generate() -> Iterator[int]:
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    chunks = iter_chunks(generate(), chunk_size=3)
+    assert next(chunks) == [0, 1, 2]
+    assert consumed == [0, 1, 2]
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match='chunk_size'):
+        next(iter_chunks([1], chunk_size=0))
+
+    with pytest.raises(ValueError, match='max_chunk_bytes'):
+        next(iter_chunks([1], max_chunk_bytes=0))
+
+    with pytest.raises(ValueError, match='concurrency'):
+        run_chunks(len, [[1]], concurrency=0)
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+def test_run_chunks(concurrency: int) -> None:
+    progress: List[CreateManyProgress] = []
+    total = run_chunks(
+        len,
+        iter_chunks(rows(10), chunk_size=3),
+        concurrency=concurrency,
+        on_progress=progress.append,
+    )
+    assert total == 10
+    assert len(progress) == 4
+    assert progress[-1] == CreateManyProgress(chunks=4, rows=10, created=10)
+    assert [p.chunks for p in progress] == [1, 2, 3, 4]
+
+
+def test_run_chunks_bounded_concurrency() -> None:
+    """At most `concurrency` chunks are running at once"""
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def execute(chunk: List[int]) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return len(chunk)
+
+    start = time.monotonic()
+    assert run_chunks(execute, iter_chunks(range(20), chunk_size=2), concurrency=3) == 20
+    assert peak == 3
+
+    # 10 chunks sent 3 at a time would take at least 0.2s if they were sent sequentially
+    assert time.monotonic() - start < 0.18
+
+
+def test_run_chunks_error() -> None:
+    """No more chunks are sent after a chunk fails"""
+    sent: List[List[int]] = []
+
+    def execute(chunk: List[int]) -> int:
+        sent.append(chunk)
+        if chunk[0] == 4:
+            raise RuntimeError('boom')
+        return len(chunk)
+
+    with pytest.raises(RuntimeError, match='boom'):
+        run_chunks(execute, iter_chunks(range(100), chunk_size=2), concurrency=2)
+
+    assert len(sent) <= 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('concurrency', [1, 3])
+async def test_arun_chunks(concurrency: int) -> None:
+    async def execute(chunk: List[Dict[str, Any]]) -> int:
+        await asyncio.sleep(0)
+        return len(chunk)
+
+    progress: List[CreateManyProgress] = []
+    total = await arun_chunks(
+        execute,
+        iter_chunks(rows(10), chunk_size=3),
+        concurrency=concurrency,
+        on_progress=progress.append,
+    )
+    assert total == 10
+    assert progress[-1] == CreateManyProgress(chunks=4, rows=10, created=10)
+
+
+@pytest.mark.asyncio
+async def test_arun_chunks_bounded_concurrency() -> None:
+    running = 0
+    peak = 0
+
+    async def execute(chunk: List[int]) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return len(chunk)
+
+    assert await arun_chunks(execute, iter_chunks(range(20), chunk_size=2), concurrency=4) == 20
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_arun_chunks_error() -> None:
+    """Running chunks are cancelled when a chunk fails"""
+    cancelled: List[int] = []
+
+    async def execute(chunk: List[int]) -> int:
+        if chunk[0] == 0:
+            raise RuntimeError('boom')
+
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(chunk[0])
+            raise
+        return len(chunk)
+
+    with pytest.raises(RuntimeError, match='boom'):
+        await arun_chunks(execute, iter_chunks(range(100), chunk_size=2), concurrency=3)
+
+    assert sorted(cancelled) == [2, 4]
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, cast
+from datetime import timedelta
+
+import pytest
+
+from prisma import errors
+from prisma._coalescing import FindUniqueCoalescer
+from prisma._json_codec import STDLIB_CODEC
+from prisma._json_builder import JsonQueryBuilder
+from prisma.engine.errors import EngineError
+
+# the response for this record cannot be processed
+INVALID_ID = 99
+
+
+class FakeBuilder:
+    """Stands in for a `find_unique()` query builder for the record with the given id"""
+
+    def __init__(self, id: int) -> None:
+        self.id = id
+
+    def build_payload(self) -> Dict[str, Any]:
+        return self.build_batch_item()
+
+    def build_batch_item(self) -> Dict[str, Any]:
+        return {'modelName': 'User', 'action': 'findUnique', 'query': {'arguments': {'where': {'id': self.id}}}}
+
+    def process_response(self, data: Any) -> Any:
+        if self.id == INVALID_ID:
+            raise ValueError('Invalid response')
+        return JsonQueryBuilder.process_response(cast(Any, self), data)
+
+    method = 'find_unique'
+
+
+class FakeEngine:
+    def __init__(self) -> None:
+        self.requests: List[Any] = []
+        self.error: Exception | None = None
+        self.missing = 0
+
+    async def query(self, content: str, *, tx_id: Any) -> Any:
+        payload = STDLIB_CODEC.loads(content)
+        self.requests.append(payload)
+        await asyncio.sleep(0)
+
+        if self.error is not None:
+            raise self.error
+
+        def result(item: Dict[str, Any]) -> Any:
+            id = item['query']['arguments']['where']['id']
+            if id < 0:
+                return {
+                    'errors': [
+                        {
+                            'error': 'Invalid value',
+                            'user_facing_error': {'error_code': 'P2009', 'message': 'Invalid value'},
+                        }
+                    ]
+                }
+            return {'data': {'findUniqueUser': {'id': id} if id else None}}
+
+        if 'batch' in payload:
+            assert 'transaction' not in payload
+            results = [result(item) for item in payload['batch']]
+            return {'batchResult': results[: len(results) - self.missing]}
+
+        return result(payload)
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self._engine = FakeEngine()
+        self._json_codec = STDLIB_CODEC
+        self._query_builder_class = JsonQueryBuilder
+
+
+def make_coalescer(**config: Any) -> tuple[FindUniqueCoalescer, FakeEngine]:
+    client = FakeClient()
+    return FindUniqueCoalescer(cast(Any, client), cast(Any, config)), client._engine
+
+
+async def find(coalescer: FindUniqueCoalescer, id: int) -> Any:
+    response = await coalescer.execute(cast(Any, FakeBuilder(id)))
+    return response['data']['result']
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_are_batched() -> None:
+    """Queries made in the same iteration of the event loop are sent in a single request"""
+    coalescer, engine = make_coalescer()
+
+    results = await asyncio.gather(*[find(coalescer, i) for i in range(1, 11)])
+    assert results == [{'id': i} for i in range(1, 11)]
+    assert len(engine.requests) == 1
+    assert len(engine.requests[0]['batch']) == 10
+
+
+@pytest.mark.asyncio
+async def test_single_query_is_not_batched() -> None:
+    coalescer, engine = make_coalescer()
+
+    assert await find(coalescer, 1) == {'id': 1}
+    assert await find(coalescer, 0) is None
+    assert [request['action'] for request in engine.requests] == ['findUnique', 'findUnique']
+
+
+@pytest.mark.asyncio
+async def test_max_batch_size() -> None:
+    """Batches are sent as soon as they are full"""
+    coalescer, engine = make_coalescer(max_batch_size=4)
+
+    results = await asyncio.gather(*[find(coalescer, i) for i in range(1, 11)])
+    assert results == [{'id': i} for i in range(1, 11)]
+    assert [len(request.get('batch', [request])) for request in engine.requests] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_max_wait() -> None:
+    """Queries made within the wait window are added to the same batch"""
+    coalescer, engine = make_coalescer(max_wait=timedelta(milliseconds=50))
+
+    async def delayed(id: int) -> Any:
+        await asyncio.sleep(0.01)
+        return await find(coalescer, id)
+
+    results = await asyncio.gather(find(coalescer, 1), delayed(2), delayed(3))
+    assert results == [{'id': 1}, {'id': 2}, {'id': 3}]
+    assert len(engine.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_routed_to_callers() -> None:
+    """An error for one query does not affect the other queries in the batch"""
+    coalescer, engine = make_coalescer()
+
+    results = await asyncio.gather(find(coalescer, 1), find(coalescer, -1), find(coalescer, 0), return_exceptions=True)
+    assert results[0] == {'id': 1}
+    assert isinstance(results[1], errors.FieldNotFoundError)
+    assert results[2] is None
+    assert len(engine.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_error() -> None:
+    """Every caller receives the error if the request fails"""
+    coalescer, engine = make_coalescer()
+    engine.error = RuntimeError('boom')
+
+    results = await asyncio.gather(find(coalescer, 1), find(coalescer, 2), return_exceptions=True)
+    assert [str(result) for result in results] == ['boom', 'boom']
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller() -> None:
+    """Cancelling one caller does not affect the other queries in the batch"""
+    coalescer, engine = make_coalescer()
+
+    first = asyncio.ensure_future(find(coalescer, 1))
+    second = asyncio.ensure_future(find(coalescer, 2))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == {'id': 2}
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_response_processing_error() -> None:
+    """An error processing the result of one query does not affect the other queries in the batch"""
+    coalescer, _ = make_coalescer()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(find(coalescer, INVALID_ID), find(coalescer, 1), find(coalescer, 2), return_exceptions=True),
+        timeout=1,
+    )
+    assert isinstance(results[0], ValueError)
+    assert results[1:] == [{'id': 1}, {'id': 2}]
+
+
+@pytest.mark.asyncio
+async def test_missing_results() -> None:
+    """Callers that do not receive a result from the batched request are given an error"""
+    coalescer, engine = make_coalescer()
+    engine.missing = 2
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*[find(coalescer, i) for i in range(1, 5)], return_exceptions=True),
+        timeout=1,
+    )
+    assert results[:2] == [{'id': 1}, {'id': 2}]
+    for result in results[2:]:
+        assert isinstance(result, EngineError)
+        assert 'Expected 4 results from a batched request but only received 2' in str(result)
+
+
+def test_invalid_config() -> None:
+    with pytest.raises(ValueError, match='max_batch_size'):
+        make_coalescer(max_batch_size=0)
+
+    with pytest.raises(TypeError, match='max_wait'):
+        make_coalescer(max_wait=0.1)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import enum
+import array
+import datetime
+from typing import Any, Dict, List, Optional
+from decimal import Decimal
+
+import pytest
+from pydantic import BaseModel
+
+from prisma import Prisma, fields
+from prisma._compat import PYDANTIC_V2, ConfigDict
+from prisma._columns import group_by_columns, find_many_columns
+
+
+class _Model(BaseModel):
+    # mirrors the configuration of the generated models
+    if PYDANTIC_V2:
+        model_config = ConfigDict(
+            use_enum_values=True,
+            arbitrary_types_allowed=True,
+            populate_by_name=True,
+        )
+    else:
+
+        class Config:
+            use_enum_values = True
+            arbitrary_types_allowed = True
+            allow_population_by_field_name = True
+
+
+class Role(str, enum.Enum):
+    USER = 'USER'
+    ADMIN = 'ADMIN'
+
+
+class Post(_Model):
+    id: str
+    title: str
+
+
+class User(_Model):
+    id: int
+    name: str
+    role: Role
+    active: bool
+    score: float
+    bigint: int
+    created_at: datetime.datetime
+    balance: Decimal
+    meta: fields.Json
+    tags: List[str]
+    age: Optional[int] = None
+    posts: Optional[List[Post]] = None
+
+
+def rows(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': index,
+            'name': f'User {index}',
+            'role': 'ADMIN' if index % 2 else 'USER',
+            'active': index % 2 == 0,
+            'score': index / 2,
+            'bigint': str(2**40 + index),
+            'created_at': '2022-11-10T16:53:25.584Z',
+            'balance': '1.5',
+            'meta': '{"foo": [1, null]}',
+            'tags': ['a'],
+            'age': None if index == 1 else index,
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture(name='no_numpy')
+def no_numpy_fixture(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr('prisma._columns.numpy', None)
+
+
+@pytest.mark.usefixtures('no_numpy')
+def test_find_many_columns() -> None:
+    columns = find_many_columns(User, rows(3))
+    assert list(columns) == [
+        'id',
+        'name',
+        'role',
+        'active',
+        'score',
+        'bigint',
+        'created_at',
+        'balance',
+        'meta',
+        'tags',
+        'age',
+    ]
+    assert columns['id'] == array.array('q', [0, 1, 2])
+    assert columns['score'] == array.array('d', [0.0, 0.5, 1.0])
+    assert columns['bigint'] == array.array('q', [2**40, 2**40 + 1, 2**40 + 2])
+    assert columns['name'] == ['User 0', 'User 1', 'User 2']
+    assert columns['role'] == ['USER', 'ADMIN', 'USER']
+    assert columns['active'] == [True, False, True]
+    assert (
+        columns['created_at'] == [datetime.datetime(2022, 11, 10, 16, 53, 25, 584000, tzinfo=datetime.timezone.utc)] * 3
+    )
+    assert columns['balance'] == [Decimal('1.5')] * 3
+    assert columns['meta'] == [{'foo': [1, None]}] * 3
+    assert columns['tags'] == [['a']] * 3
+
+    # columns with null values cannot be stored in an array
+    assert columns['age'] == [0, None, 2]
+
+
+@pytest.mark.usefixtures('no_numpy')
+def test_find_many_columns_empty() -> None:
+    columns = find_many_columns(User, [])
+    assert columns['id'] == array.array('q')
+    assert columns['name'] == []
+
+
+def test_find_many_columns_numpy() -> None:
+    numpy = pytest.importorskip('numpy')
+
+    columns = find_many_columns(User, rows(3))
+    assert isinstance(columns['id'], numpy.ndarray)
+    assert columns['id'].dtype == numpy.int64
+    assert columns['score'].dtype == numpy.float64
+    assert columns['active'].dtype == numpy.bool_
+    assert columns['active'].tolist() == [True, False, True]
+    assert columns['name'] == ['User 0', 'User 1', 'User 2']
+
+
+@pytest.mark.usefixtures('no_numpy')
+def test_group_by_columns() -> None:
+    columns = group_by_columns(
+        User,
+        [
+            {
+                'role': 'USER',
+                '_avg': {'score': 1, 'balance': '2.5'},
+                '_sum': {'score': 2.5, 'id': 4},
+                '_min': {'created_at': '2022-11-10T16:53:25.584Z'},
+                '_count': {'_all': 3},
+            },
+            {
+                'role': 'ADMIN',
+                '_avg': {'score': 0.5, 'balance': '1'},
+                '_sum': {'score': None, 'id': 1},
+                '_min': {'created_at': '2022-11-10T16:53:25.584Z'},
+                '_count': {'_all': 1},
+            },
+        ],
+        by=['role'],
+        avg={'score': True, 'balance': True},
+        sum={'score': True, 'id': True},
+        min={'created_at': True},
+        count=True,
+    )
+    assert columns == {
+        'role': ['USER', 'ADMIN'],
+        '_avg': {
+            'score': array.array('d', [1.0, 0.5]),
+            'balance': [Decimal('2.5'), Decimal('1')],
+        },
+        '_sum': {
+            'score': [2.5, None],
+            'id': array.array('q', [4, 1]),
+        },
+        '_min': {
+            'created_at': [datetime.datetime(2022, 11, 10, 16, 53, 25, 584000, tzinfo=datetime.timezone.utc)] * 2,
+        },
+        '_count': {
+            '_all': array.array('q', [3, 1]),
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_find_many_as_columns(client: Prisma) -> None:
+    await client.post.create_many(
+        data=[
+            {'title': 'Foo', 'published': True, 'views': 1},
+            {'title': 'Bar', 'published': False, 'views': 2},
+        ]
+    )
+
+    columns = await client.post.find_many(order={'views': 'asc'}, as_columns=True)
+    assert list(columns['title']) == ['Foo', 'Bar']
+    assert list(columns['views']) == [1, 2]
+    assert list(columns['published']) == [True, False]
+    assert all(isinstance(value, datetime.datetime) for value in columns['created_at'])
+
+    with pytest.raises(TypeError):
+        await client.post.find_many(include={'author': True}, as_columns=True)  # type: ignore[call-overload]
+
+
+@pytest.mark.asyncio
+async def test_group_by_as_columns(client: Prisma) -> None:
+    await client.post.create_many(
+        data=[
+            {'title': 'Foo', 'published': True, 'views': 1},
+            {'title': 'Foo', 'published': False, 'views': 2},
+            {'title': 'Bar', 'published': False, 'views': 5},
+        ]
+    )
+
+    columns = await client.post.group_by(
+        ['title'],
+        sum={'views': True},
+        count=True,
+        order={'title': 'asc'},
+        as_columns=True,
+    )
+    assert columns['title'] == ['Bar', 'Foo']
+    assert list(columns['_sum']['views']) == [5, 3]
+    assert list(columns['_count']['_all']) == [1, 2]
@@ -37,6 +37,14 @@ def no_event_loop() -> Iterator[None]:
             asyncio.set_event_loop(current)
 
 
+@pytest.fixture(autouse=True)
+def version_cache(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    """Ensure the query engine version is always checked unless a test explicitly populates the cache"""
+    path = tmp_path / 'version-cache.json'
+    monkeypatch.setattr(utils, 'version_cache_path', lambda: path)
+    return path
+
+
 @pytest.mark.asyncio
 async def test_engine_connects() -> None:
     """Can connect to engine"""
@@ -49,6 +57,27 @@ async def test_engine_connects() -> None:
     await db.disconnect()
 
 
+@pytest.mark.asyncio
+@skipif_windows
+async def test_engine_connects_unix_socket() -> None:
+    """Can connect to the engine over a unix domain socket"""
+    db = Prisma(engine_transport='uds')
+    await db.connect()
+
+    engine = db._engine
+    assert isinstance(engine, QueryEngine)
+
+    unix_path = engine.unix_path
+    assert unix_path is not None
+    assert unix_path.exists()
+    assert engine.session.uds == str(unix_path)
+
+    await db.user.find_first()
+
+    await db.disconnect()
+    assert not unix_path.exists()
+
+
 @pytest.mark.asyncio
 @skipif_windows
 async def test_engine_process_sigint_mask() -> None:
@@ -181,3 +210,32 @@ def test_ensure_env_override_does_not_exist() -> None:
             utils.ensure(BINARY_PATHS.query_engine)
 
     assert exc.match(r'PRISMA_QUERY_ENGINE_BINARY was provided, but no query engine was found at foo')
+
+
+def test_ensure_caches_version(testdir: Testdir, fake_process: FakeProcess, version_cache: Path) -> None:
+    """The version check is skipped if the binary has already been checked"""
+    fake_engine = testdir.path / platform.check_for_extension(f'prisma-query-engine-{platform.binary_platform()}')
+    fake_engine.touch()
+
+    fake_process.register_subprocess(
+        [str(fake_engine), '--version'],
+        stdout=f'query-engine {config.expected_engine_version}',
+    )
+    assert utils.ensure(BINARY_PATHS.query_engine) == fake_engine
+    assert fake_process.call_count([str(fake_engine), '--version']) == 1
+    assert version_cache.exists()
+
+    # no subprocess is registered so this would fail if the binary was executed
+    assert utils.ensure(BINARY_PATHS.query_engine) == fake_engine
+    assert fake_process.call_count([str(fake_engine), '--version']) == 1
+
+    # modifying the binary invalidates the cache
+    fake_engine.write_text('foo')
+    fake_process.register_subprocess(
+        [str(fake_engine), '--version'],
+        stdout='query-engine a-different-hash',
+    )
+    with pytest.raises(errors.MismatchedVersionsError):
+        utils.ensure(BINARY_PATHS.query_engine)
+
+    assert fake_process.call_count([str(fake_engine), '--version']) == 2
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List, AsyncIterator, cast
+from pathlib import Path
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from prisma._types import TransactionId
+from prisma.engine import AsyncQueryEngine, AsyncQueryEnginePool, errors
+from prisma.limits import AIMDLimit
+from prisma._limiter import ConcurrencyLimiter
+from prisma.engine._pool import merge_metrics
+
+
+class FakeProcess:
+    def __init__(self) -> None:
+        self.returncode: int | None = None
+
+    def poll(self) -> int | None:
+        return self.returncode
+
+
+class FakeEngine:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.process = FakeProcess()
+        self.requests: List[tuple[str, str, Any]] = []
+        self.error: Exception | None = None
+        self.event: asyncio.Event | None = None
+        self.closed = False
+
+    async def connect(self, **kwargs: Any) -> None:
+        if self.error is not None:
+            raise self.error
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> Any:
+        self.requests.append((method, path, kwargs.get('headers')))
+        if self.event is not None:
+            await self.event.wait()
+
+        if self.error is not None:
+            raise self.error
+
+        if path == '/transaction/start':
+            return {'id': f'{self.name}-tx'}
+
+        return {'data': {'result': self.name}}
+
+    async def query(self, content: str, *, tx_id: TransactionId | None) -> Any:
+        headers = {} if tx_id is None else {'X-transaction-id': tx_id}
+        return await self.request('POST', '/', content=content, headers=headers)
+
+    async def stream_query(self, content: str, *, tx_id: TransactionId | None) -> AsyncIterator[Any]:
+        yield await self.query(content, tx_id=tx_id)
+
+    async def metrics(self, *, format: str, global_labels: Any) -> Any:
+        if format == 'prometheus':
+            return self.name
+
+        return {
+            'counters': [{'key': 'queries_total', 'labels': {}, 'value': 1, 'description': ''}],
+            'gauges': [],
+            'histograms': [],
+        }
+
+    def close(self, *, timeout: timedelta | None = None) -> None:
+        self.closed = True
+
+    async def aclose(self, *, timeout: timedelta | None = None) -> None:
+        self.closed = True
+
+
+def make_pool(count: int, **kwargs: Any) -> tuple[AsyncQueryEnginePool, List[FakeEngine]]:
+    engines = [FakeEngine(str(i)) for i in range(count)]
+    return AsyncQueryEnginePool(cast(List[AsyncQueryEngine], engines), **kwargs), engines
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_routing() -> None:
+    """Queries are sent to the engine with the fewest in-flight requests"""
+    pool, engines = make_pool(2)
+
+    # idle engines are used in turn
+    assert (await pool.query('{}', tx_id=None))['data']['result'] == '0'
+    assert (await pool.query('{}', tx_id=None))['data']['result'] == '1'
+
+    # block the first engine so that it has an outstanding request
+    engines[0].event = asyncio.Event()
+    task = asyncio.ensure_future(pool.query('{}', tx_id=None))
+    while not engines[0].requests[1:]:
+        await asyncio.sleep(0)
+
+    assert [h.outstanding for h in pool.health()] == [1, 0]
+    for _ in range(3):
+        assert (await pool.query('{}', tx_id=None))['data']['result'] == '1'
+
+    engines[0].event.set()
+    await task
+    assert [h.outstanding for h in pool.health()] == [0, 0]
+    assert [h.requests for h in pool.health()] == [2, 4]
+
+
+@pytest.mark.asyncio
+async def test_transaction_pinning() -> None:
+    """Queries within a transaction are always sent to the engine that started it"""
+    pool, engines = make_pool(3)
+
+    tx_id = await pool.start_transaction(content='{}')
+    assert tx_id == '0-tx'
+    assert pool.health()[0].transactions == 1
+
+    for _ in range(3):
+        result = await pool.query('{}', tx_id=tx_id)
+        assert result['data']['result'] == '0'
+
+    assert engines[0].requests[-1] == ('POST', '/', {'X-transaction-id': '0-tx'})
+
+    await pool.commit_transaction(tx_id)
+    assert engines[0].requests[-1][1] == '/transaction/0-tx/commit'
+    assert pool.health()[0].transactions == 0
+
+    with pytest.raises(errors.EngineError, match='was not started by this engine pool'):
+        await pool.query('{}', tx_id=TransactionId('unknown'))
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_engines_are_skipped() -> None:
+    """Engines that fail with connection errors or have exited stop receiving queries"""
+    pool, engines = make_pool(2, retry_after=timedelta(hours=1))
+
+    engines[0].error = httpx.ConnectError('refused')
+    with pytest.raises(httpx.ConnectError):
+        await pool.query('{}', tx_id=None)
+
+    health = pool.health()[0]
+    assert not health.healthy
+    assert health.failures == 1
+    assert isinstance(health.last_error, httpx.ConnectError)
+
+    for _ in range(3):
+        assert (await pool.query('{}', tx_id=None))['data']['result'] == '1'
+
+    engines[1].process.returncode = 1
+    with pytest.raises(errors.EngineConnectionError, match='None of the query engines'):
+        await pool.query('{}', tx_id=None)
+
+    # a successful health check makes the engine available again
+    engines[0].error = None
+    health = await pool.check_health()
+    assert [h.healthy for h in health] == [True, False]
+    assert (await pool.query('{}', tx_id=None))['data']['result'] == '0'
+
+
+@pytest.mark.asyncio
+async def test_connect_and_close() -> None:
+    """All engines are closed if any of them fail to connect"""
+    pool, engines = make_pool(3)
+    engines[1].error = errors.EngineConnectionError('failed')
+
+    with pytest.raises(errors.EngineConnectionError):
+        await pool.connect()
+
+    assert all(engine.closed for engine in engines)
+
+    pool, engines = make_pool(2)
+    await pool.connect()
+    await pool.aclose()
+    assert all(engine.closed for engine in engines)
+
+
+@pytest.mark.asyncio
+async def test_metrics() -> None:
+    """JSON metrics are merged across the engines in the pool"""
+    pool, _ = make_pool(2)
+    metrics = await pool.metrics(format='json', global_labels=None)
+    assert metrics['counters'] == [{'key': 'queries_total', 'labels': {}, 'value': 2, 'description': ''}]
+    assert await pool.metrics(format='prometheus', global_labels=None) == '0'
+
+
+def make_limited_pool(count: int, limiter: ConcurrencyLimiter) -> tuple[AsyncQueryEnginePool, List[int]]:
+    """Create a pool of engines that share the given limiter, returning the number of queries in flight over time"""
+    in_flight: List[int] = [0]
+
+    async def request(method: str, path: str, **kwargs: Any) -> Any:
+        in_flight.append(in_flight[-1] + 1)
+        await asyncio.sleep(0.01)
+        in_flight.append(in_flight[-1] - 1)
+        return {'data': {'result': None}}
+
+    async def stream_request(method: str, path: str, **kwargs: Any) -> AsyncIterator[Any]:
+        yield await request(method, path, **kwargs)
+
+    engines: List[AsyncQueryEngine] = []
+    for _ in range(count):
+        engine = AsyncQueryEngine(dml_path=Path('schema.prisma'), limiter=limiter)
+        engine.request = request  # type: ignore[method-assign]
+        engine.stream_request = stream_request  # type: ignore[method-assign]
+        engines.append(engine)
+
+    return AsyncQueryEnginePool(engines), in_flight
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit() -> None:
+    """The concurrency limiter is shared between every engine in the pool"""
+    limiter = ConcurrencyLimiter({'max_in_flight': 1})
+    pool, in_flight = make_limited_pool(3, limiter)
+
+    async def stream() -> List[Any]:
+        return [item async for item in pool.stream_query('{}', tx_id=None)]
+
+    await asyncio.gather(*[pool.query('{}', tx_id=None) for _ in range(4)], stream(), stream())
+
+    assert max(in_flight) == 1
+    assert [h.requests for h in pool.health()] == [2, 2, 2]
+
+    stats = limiter.stats()
+    assert stats.acquired == 6
+    assert stats.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_limit() -> None:
+    """The limit algorithm is given the latency of queries that are sent to any engine in the pool"""
+    limiter = ConcurrencyLimiter({'algorithm': AIMDLimit(initial_limit=2, max_limit=10)})
+    pool, _ = make_limited_pool(2, limiter)
+
+    await asyncio.gather(*[pool.query('{}', tx_id=None) for _ in range(4)])
+
+    # the limit grows while queries are successful
+    stats = limiter.stats()
+    assert stats.acquired == 4
+    assert stats.max_in_flight > 2
+
+
+def test_merge_histograms() -> None:
+    """Histogram buckets are summed by their upper bound"""
+    first = {'histograms': [{'key': 'h', 'labels': {}, 'value': {'sum': 1.0, 'count': 1, 'buckets': [[0, 1]]}}]}
+    second = {
+        'histograms': [{'key': 'h', 'labels': {}, 'value': {'sum': 2.0, 'count': 3, 'buckets': [[0, 1], [5, 2]]}}]
+    }
+    merged = merge_metrics([first, second])
+    assert merged['histograms'][0]['value'] == {'sum': 3.0, 'count': 4, 'buckets': [[0, 2], [5, 2]]}
+
+    # the inputs are not mutated
+    assert first['histograms'][0]['value']['buckets'] == [[0, 1]]
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+import asyncio
+import threading
+import subprocess
+from typing import TYPE_CHECKING, Any
+from pathlib import Path
+
+import pytest
+
+from prisma.engine import _shared
+from prisma._config import Config
+from prisma.engine._query import BaseQueryEngine
+
+if TYPE_CHECKING:
+    from _pytest.monkeypatch import MonkeyPatch
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='Shared engines are not supported on Windows')
+
+
+class FakeQueryEngine(BaseQueryEngine):
+    """Spawns a long running Python process instead of the actual query engine"""
+
+    spawned: int = 0
+
+    def _spawn_process(
+        self,
+        *,
+        file: Path,
+        datasources: Any,
+        detached: bool = False,
+    ) -> tuple[str, subprocess.Popen[bytes]]:
+        FakeQueryEngine.spawned += 1
+        self.url = f'http://localhost:{FakeQueryEngine.spawned}'
+        self.process = process = subprocess.Popen(
+            [sys.executable, '-c', 'import time; time.sleep(60)'],
+            start_new_session=detached,
+        )
+        return self.url, process
+
+
+@pytest.fixture(name='schema')
+def schema_fixture(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    monkeypatch.setattr(_shared, 'config', Config.parse(engine_lock_dir=str(tmp_path / 'locks')))
+
+    schema = tmp_path / 'schema.prisma'
+    schema.write_text('datasource db {}')
+    return schema
+
+
+def make_engine(schema: Path) -> FakeQueryEngine:
+    return FakeQueryEngine(dml_path=schema, shared=True)
+
+
+def test_reference_counting(schema: Path) -> None:
+    """The engine is only stopped once every client has detached"""
+    first = make_engine(schema)
+    second = make_engine(schema)
+
+    first._start_process(file=schema, datasources=None)
+    second._start_process(file=schema, datasources=None)
+
+    assert first.process is not None
+    assert second.process is None
+    assert first.url == second.url
+
+    key = first.shared_key
+    assert key is not None
+    assert second.shared_key == key
+
+    with _shared.EngineLock(key) as lock:
+        state = lock.read()
+        assert state is not None
+        assert state['pid'] == first.process.pid
+        assert state['clients'] == [os.getpid(), os.getpid()]
+
+    # the spawning client can detach without stopping the engine
+    process = first.process
+    first._kill_process(timeout=None)
+    assert first.shared_key is None
+    assert process.poll() is None
+
+    second._kill_process(timeout=None)
+    assert process.wait(timeout=5) is not None
+    assert not _shared.EngineLock(key).path.exists()
+
+
+def test_dead_engine_is_replaced(schema: Path) -> None:
+    """A new engine is spawned if the engine in the lockfile is no longer running"""
+    first = make_engine(schema)
+    first._start_process(file=schema, datasources=None)
+    assert first.process is not None
+    first.process.kill()
+    first.process.wait()
+
+    second = make_engine(schema)
+    second._start_process(file=schema, datasources=None)
+    assert second.process is not None
+    assert second.url != first.url
+
+    second._kill_process(timeout=None)
+    first._kill_process(timeout=None)
+
+
+def test_keyed_on_schema(schema: Path) -> None:
+    """Engines for different schemas are not shared"""
+    first = make_engine(schema)
+    first._start_process(file=schema, datasources=None)
+
+    other = schema.with_name('other.prisma')
+    other.write_text('datasource other {}')
+    second = make_engine(other)
+    second._start_process(file=schema, datasources=None)
+
+    assert second.process is not None
+    assert first.shared_key != second.shared_key
+
+    first._kill_process(timeout=None)
+    second._kill_process(timeout=None)
+
+
+def test_dead_clients_are_pruned(schema: Path) -> None:
+    """Clients that exited without detaching do not keep the engine alive"""
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+
+    engine = make_engine(schema)
+    engine._start_process(file=schema, datasources=None)
+    assert engine.process is not None and engine.shared_key is not None
+
+    with _shared.EngineLock(engine.shared_key) as lock:
+        state = lock.read()
+        assert state is not None
+        state['clients'].append(dead.pid)
+        lock.write(state)
+
+    process = engine.process
+    engine._kill_process(timeout=None)
+    assert process.wait(timeout=5) is not None
+
+
+def test_orphaned_engine_is_adopted(schema: Path) -> None:
+    """An engine whose spawning process was killed before any other client attached is stopped by the next client"""
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+
+    first = make_engine(schema)
+    first._start_process(file=schema, datasources=None)
+    assert first.process is not None and first.shared_key is not None
+
+    # simulate the spawning process being killed without detaching
+    with _shared.EngineLock(first.shared_key) as lock:
+        state = lock.read()
+        assert state is not None
+        state['clients'] = [dead.pid]
+        lock.write(state)
+
+    process = first.process
+    first.shared_key = None
+    first.process = None
+
+    second = make_engine(schema)
+    second._start_process(file=schema, datasources=None)
+    assert second.process is None
+    assert second.url == first.url
+
+    second._kill_process(timeout=None)
+    assert process.wait(timeout=5) is not None
+
+
+@pytest.mark.asyncio
+async def test_async_attach_does_not_block(schema: Path) -> None:
+    """Waiting for the shared engine lock does not block the event loop"""
+    first = make_engine(schema)
+    first._start_process(file=schema, datasources=None)
+    key = first.shared_key
+    assert key is not None
+
+    locked = threading.Event()
+
+    def hold_lock() -> None:
+        with _shared.EngineLock(key):
+            locked.set()
+            time.sleep(0.3)
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    locked.wait()
+
+    second = make_engine(schema)
+    task = asyncio.ensure_future(second._start_process_async(file=schema, datasources=None))
+
+    ticks = 0
+    while not task.done():
+        await asyncio.sleep(0.01)
+        ticks += 1
+
+    await task
+    thread.join()
+    assert ticks > 5
+    assert second.url == first.url
+
+    await second._kill_process_async(timeout=None)
+    first._kill_process(timeout=None)
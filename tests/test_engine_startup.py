@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+from typing import TYPE_CHECKING, List, Iterator
+from pathlib import Path
+from datetime import timedelta
+
+import pytest
+
+from prisma.engine import SyncQueryEngine, errors
+from prisma.engine._startup import StartupTimings, EngineLogReader, iter_backoff
+
+if TYPE_CHECKING:
+    from _pytest.capture import CaptureFixture
+
+READY_LINE = json.dumps(
+    {
+        'level': 'INFO',
+        'target': 'query_engine::server',
+        'fields': {'message': 'Started query engine http server on http://127.0.0.1:1234'},
+    }
+)
+
+FAKE_ENGINE = """
+import sys
+import json
+import time
+import http.server
+
+# give the probe a chance to run before we start listening
+time.sleep(0.2)
+
+port = int(sys.argv[sys.argv.index('-p') + 1])
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = http.server.HTTPServer(('localhost', port), Handler)
+if LOG_READY:
+    message = {'message': f'Started query engine http server on http://127.0.0.1:{port}'}
+    print(json.dumps({'level': 'INFO', 'target': 'query_engine::server', 'fields': message}), flush=True)
+
+print('engine output', flush=True)
+server.serve_forever()
+"""
+
+
+def make_fake_engine(tmp_path: Path, *, log_ready: bool = True, body: str | None = None) -> Path:
+    path = tmp_path / 'query-engine'
+    source = body if body is not None else FAKE_ENGINE.replace('LOG_READY', str(log_ready))
+    path.write_text(f'#!{sys.executable}\n{source}')
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture(name='engine')
+def engine_fixture(tmp_path: Path) -> Iterator[SyncQueryEngine]:
+    engine = SyncQueryEngine(dml_path=tmp_path / 'schema.prisma')
+    yield engine
+    engine.close(timeout=timedelta(seconds=5))
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='Fake engine is not executable on Windows')
+def test_ready_from_logs(engine: SyncQueryEngine, tmp_path: Path, capfd: CaptureFixture[str]) -> None:
+    """The engine is considered ready as soon as it logs that it is listening"""
+    engine.spawn(make_fake_engine(tmp_path), timeout=timedelta(seconds=10))
+
+    timings = engine.startup_timings
+    assert timings is not None
+    assert timings.readiness == 'log'
+    assert timings.total == pytest.approx(timings.spawn + timings.ready + timings.probe)
+
+    # output from the engine is still shown, apart from the readiness message
+    deadline = time.monotonic() + 5
+    out = ''
+    while 'engine output' not in out and time.monotonic() < deadline:
+        out += capfd.readouterr().out
+    assert 'engine output' in out
+    assert 'Started query engine' not in out
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='Fake engine is not executable on Windows')
+def test_ready_from_probe(engine: SyncQueryEngine, tmp_path: Path) -> None:
+    """The engine is probed if it never logs that it is listening"""
+    engine.spawn(make_fake_engine(tmp_path, log_ready=False), timeout=timedelta(seconds=10))
+
+    timings = engine.startup_timings
+    assert timings is not None
+    assert timings.readiness == 'probe'
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='Fake engine is not executable on Windows')
+def test_engine_exits(engine: SyncQueryEngine, tmp_path: Path) -> None:
+    """An error is raised as soon as the engine exits instead of waiting for the timeout"""
+    start = time.monotonic()
+    with pytest.raises(errors.EngineConnectionError, match='exited with code 3'):
+        engine.spawn(make_fake_engine(tmp_path, body='raise SystemExit(3)'), timeout=timedelta(seconds=30))
+
+    assert time.monotonic() - start < 10
+
+
+def test_log_reader(capsys: CaptureFixture[str]) -> None:
+    """Output is forwarded and the ready message is detected"""
+    reader = EngineLogReader(io.BytesIO(f'foo\n{READY_LINE}\nbar\n'.encode()))
+    reader.start()
+
+    assert reader.wait(5)
+    assert reader.ready_at is not None
+    reader._thread.join(5)
+    assert capsys.readouterr().out == 'foo\nbar\n'
+
+    reader = EngineLogReader(io.BytesIO(b'{"level": "ERROR", "target": "query_engine::server"}\n'))
+    reader.start()
+    assert not reader.wait(5)
+    assert reader.done
+    reader._thread.join(5)
+    assert capsys.readouterr().out == '{"level": "ERROR", "target": "query_engine::server"}\n'
+
+
+@pytest.mark.asyncio
+async def test_log_reader_async() -> None:
+    """Async waiters are woken up as soon as the ready message is logged"""
+    read_fd, write_fd = os.pipe()
+    reader = EngineLogReader(os.fdopen(read_fd, 'rb'))
+    reader.start()
+
+    def write() -> None:
+        time.sleep(0.05)
+        os.write(write_fd, f'{READY_LINE}\n'.encode())
+
+    thread = threading.Thread(target=write)
+    thread.start()
+
+    start = time.monotonic()
+    assert await reader.wait_async(10)
+    assert time.monotonic() - start < 5
+    assert reader.ready
+
+    # waiting again returns immediately
+    assert await asyncio.wait_for(reader.wait_async(10), 1)
+
+    thread.join()
+    os.close(write_fd)
+
+
+def test_iter_backoff() -> None:
+    """Delays double up to the maximum"""
+    delays: List[float] = []
+    for delay in iter_backoff(10, initial=0.001, maximum=0.004):
+        delays.append(delay)
+        if len(delays) == 5:
+            break
+
+    assert delays == [0.001, 0.002, 0.004, 0.004, 0.004]
+    assert list(iter_backoff(0)) == []
+
+
+def test_startup_timings_str() -> None:
+    """Timings are formatted for logging"""
+    timings = StartupTimings(ensure=0.001, spawn=0.002, ready=0.05, probe=0.003, readiness='log')
+    assert str(timings) == ('ensure=0.0010s spawn=0.0020s ready=0.0500s probe=0.0030s total=0.0560s readiness=log')
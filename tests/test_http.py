@@ -81,3 +81,28 @@ async def test_httpx_default_config(monkeypatch: 'MonkeyPatch') -> None:
             'timeout': httpx.Timeout(30),
         },
     )
+
+
+@pytest.mark.asyncio
+async def test_httpx_unix_socket_transport(monkeypatch: 'MonkeyPatch') -> None:
+    """Connection options are passed to the transport when connecting over a unix socket"""
+    http = HTTP(limits=httpx.Limits(max_connections=10), http1=True)
+    http.uds = '/tmp/prisma-test/query-engine.sock'
+
+    getter = patch_method(
+        monkeypatch, httpx.AsyncHTTPTransport, '__init__', callback=lambda meth, *a, **kw: meth(*a, **kw)
+    )
+
+    http.open()
+    assert_session_state(http, 'open')
+
+    captured = getter()
+    assert captured == (
+        (),
+        {
+            'uds': '/tmp/prisma-test/query-engine.sock',
+            'limits': httpx.Limits(max_connections=10),
+            'http1': True,
+        },
+    )
+    await http.close()
@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import enum
+import datetime
+from typing import Any, Dict, List, Optional
+from decimal import Decimal
+
+import pytest
+from pydantic import BaseModel
+
+from prisma import Prisma, fields, models
+from prisma._compat import (
+    PYDANTIC_V2,
+    ConfigDict,
+    model_copy,
+    model_dict,
+    model_json,
+    model_parse,
+    field_validator,
+    model_field_annotations,
+)
+from prisma.hydrators import HYDRATORS
+from prisma._hydration import get_hydrator, get_model_parser
+
+
+class _Model(BaseModel):
+    # mirrors the configuration of the generated models
+    if PYDANTIC_V2:
+        model_config = ConfigDict(
+            use_enum_values=True,
+            arbitrary_types_allowed=True,
+            populate_by_name=True,
+        )
+    else:
+
+        class Config:
+            use_enum_values = True
+            arbitrary_types_allowed = True
+            allow_population_by_field_name = True
+
+
+class Role(str, enum.Enum):
+    USER = 'USER'
+    ADMIN = 'ADMIN'
+
+
+class Category(_Model):
+    id: int
+    name: str
+    posts: Optional[List['Post']] = None
+
+
+class Post(_Model):
+    id: str
+    title: str
+    published: bool
+    views: int
+    created_at: datetime.datetime
+    desc: Optional[str] = None
+    author: Optional['User'] = None
+    author_id: Optional[str] = None
+    categories: Optional[List[Category]] = None
+
+
+class User(_Model):
+    id: str
+    name: str
+    role: Role
+    email: Optional[str] = None
+    posts: Optional[List[Post]] = None
+
+
+class Types(_Model):
+    id: int
+    bool_: bool
+    string: str
+    bytes: fields.Base64
+    bigint: int
+    float_: float
+    datetime_: datetime.datetime
+    decimal_: Decimal
+    json_: fields.Json
+    optional_bytes: Optional[fields.Base64] = None
+    optional_bigint: Optional[int] = None
+    optional_float: Optional[float] = None
+    optional_datetime: Optional[datetime.datetime] = None
+    optional_decimal: Optional[Decimal] = None
+    optional_json: Optional[fields.Json] = None
+
+
+class Lists(_Model):
+    id: str
+    strings: List[str]
+    dates: List[datetime.datetime]
+    bigints: List[int]
+    decimals: List[Decimal]
+    roles: List[Role]
+
+    @field_validator('strings', 'dates', 'bigints', 'decimals', 'roles', pre=True, allow_reuse=True)
+    @classmethod
+    def _transform_required_list_fields(cls, value: object) -> object:
+        if value is None:
+            return []
+        return value
+
+
+class Custom(_Model):
+    id: str
+    name: str
+
+    @field_validator('name', allow_reuse=True)
+    @classmethod
+    def uppercase_name(cls, value: str) -> str:
+        return value.upper()
+
+
+if PYDANTIC_V2:
+    Category.model_rebuild()
+    Post.model_rebuild()
+else:
+    Category.update_forward_refs(Post=Post)
+    Post.update_forward_refs(User=User)
+
+
+def assert_matches(model: type[BaseModel], data: Dict[str, Any]) -> None:
+    hydrated = get_hydrator(model)(data)
+    validated = model_parse(model, data)
+    assert_same_model(hydrated, validated)
+
+
+def assert_same_model(hydrated: BaseModel, validated: BaseModel) -> None:
+    """The hydrated model is indistinguishable from the validated model, including nested relations"""
+    assert type(hydrated) is type(validated)
+    assert hydrated == validated
+    assert get_fields_set(hydrated) == get_fields_set(validated)
+    assert model_dict(hydrated) == model_dict(validated)
+    assert model_json(hydrated) == model_json(validated)
+    assert model_copy(hydrated, deep=True) == validated
+
+    for name in model_field_annotations(type(validated)):
+        hydrated_value = getattr(hydrated, name)
+        validated_value = getattr(validated, name)
+        assert type(hydrated_value) is type(validated_value), name
+
+        if isinstance(validated_value, BaseModel):
+            assert_same_model(hydrated_value, validated_value)
+        elif isinstance(validated_value, list):
+            for hydrated_item, validated_item in zip(hydrated_value, validated_value):
+                assert type(hydrated_item) is type(validated_item), name
+                if isinstance(validated_item, BaseModel):
+                    assert_same_model(hydrated_item, validated_item)
+
+
+def get_fields_set(model: BaseModel) -> set[str]:
+    if PYDANTIC_V2:
+        return model.model_fields_set
+
+    return model.__fields_set__
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        {
+            'id': 1,
+            'bool_': True,
+            'string': 'foo',
+            'bytes': 'aGVsbG8=',
+            'bigint': '9223372036854775807',
+            'float_': 1,
+            'datetime_': '2022-11-10T16:53:25.584Z',
+            'decimal_': '1.2345678901234567890',
+            'json_': '{"foo": [1, "bar", null]}',
+            'optional_bytes': 'd29ybGQ=',
+            'optional_bigint': '-12',
+            'optional_float': 1.5,
+            'optional_datetime': '2022-11-10T16:53:25+02:00',
+            'optional_decimal': '0.1',
+            'optional_json': '"baz"',
+        },
+        {
+            'id': 2,
+            'bool_': False,
+            'string': '',
+            'bytes': '',
+            'bigint': 0,
+            'float_': 0.0,
+            'datetime_': '2022-01-01T00:00:00.000000001Z',
+            'decimal_': '1E+2',
+            'json_': 'null',
+            'optional_bytes': None,
+            'optional_bigint': None,
+            'optional_float': None,
+            'optional_datetime': None,
+            'optional_decimal': None,
+            'optional_json': None,
+        },
+        {
+            'id': 3,
+            'bool_': False,
+            'string': 'omitted optional fields',
+            'bytes': 'aGVsbG8=',
+            'bigint': 1,
+            'float_': -1.0,
+            'datetime_': '2022-11-10 16:53:25',
+            'decimal_': '-0',
+            'json_': '{}',
+        },
+    ],
+)
+def test_scalar_types(data: Dict[str, Any]) -> None:
+    """Every scalar type is converted to the same value as pydantic would"""
+    assert_matches(Types, data)
+
+
+def test_relations() -> None:
+    data = {
+        'id': 'u1',
+        'name': 'Robert',
+        'role': 'ADMIN',
+        'email': None,
+        'posts': [
+            {
+                'id': f'p{index}',
+                'title': 'Hello',
+                'published': bool(index % 2),
+                'views': index,
+                'created_at': '2022-11-10T16:53:25.584Z',
+                'desc': None,
+                'author_id': 'u1',
+                'author': {'id': 'u1', 'name': 'Robert', 'role': 'USER'},
+                'categories': [{'id': index, 'name': 'foo', 'posts': []}],
+            }
+            for index in range(3)
+        ],
+    }
+    assert_matches(User, data)
+
+    user = get_hydrator(User)(data)
+    assert user.role == 'ADMIN'
+    assert user.posts is not None
+    assert isinstance(user.posts[0], Post)
+    assert isinstance(user.posts[0].created_at, datetime.datetime)
+    assert user.posts[0].categories is not None
+    assert isinstance(user.posts[0].categories[0], Category)
+
+
+def test_required_lists() -> None:
+    """Required list fields are set to an empty list when they are returned as `None`"""
+    data = {
+        'id': 'l1',
+        'strings': ['a', 'b'],
+        'dates': ['2022-11-10T16:53:25.584Z'],
+        'bigints': ['1', '2'],
+        'decimals': ['1.5'],
+        'roles': ['USER', 'ADMIN'],
+    }
+    assert_matches(Lists, data)
+
+    empty = {
+        'id': 'l2',
+        'strings': None,
+        'dates': None,
+        'bigints': None,
+        'decimals': None,
+        'roles': None,
+    }
+    assert_matches(Lists, empty)
+    assert get_hydrator(Lists)(empty).strings == []
+
+
+def test_fields_set() -> None:
+    """Fields that were not returned are not marked as set"""
+    user = get_hydrator(User)({'id': 'u1', 'name': 'Robert', 'role': 'USER'})
+    assert user.posts is None
+    assert user.email is None
+
+    assert get_fields_set(user) == {'id', 'name', 'role'}
+
+
+def test_custom_validators() -> None:
+    """Models with custom validators are always validated"""
+    custom = get_hydrator(Custom)({'id': 'c1', 'name': 'robert'})
+    assert custom.name == 'ROBERT'
+
+
+def test_data_is_trusted() -> None:
+    user = get_hydrator(User)({'id': 'u1', 'name': 'Robert', 'role': 'foo'})
+    assert user.role == 'foo'
+
+
+def test_get_model_parser() -> None:
+    data = {'id': 'u1', 'name': 'Robert', 'role': 'foo'}
+
+    with pytest.raises(Exception):  # noqa: B017
+        get_model_parser(User, validate=True)(data)
+
+    assert get_model_parser(User, validate=False)(data).role == 'foo'
+
+
+def test_client_uses_generated_hydrators() -> None:
+    assert Prisma()._hydrators is HYDRATORS
+
+
+def test_generated_hydrators_are_preferred() -> None:
+    def hydrate(data: Any) -> User:
+        raise NotImplementedError()
+
+    assert get_model_parser(User, validate=False, hydrators={User: hydrate}) is hydrate
+
+    # subclasses do not use the hydrator for the generated model
+    class Subclass(User):
+        pass
+
+    assert get_model_parser(Subclass, validate=False, hydrators={User: hydrate}) is not hydrate
+
+
+@pytest.mark.parametrize(
+    'model,data',
+    [
+        (
+            models.Types,
+            {
+                'id': 1,
+                'bool_': True,
+                'string': 'foo',
+                'bytes': 'aGVsbG8=',
+                'bigint': '9223372036854775807',
+                'integer': 3,
+                'float_': 1,
+                'datetime_': '2022-11-10T16:53:25.584Z',
+                'decimal_': '1.2345678901234567890',
+                'optional_int': None,
+                'optional_bool': False,
+                'optional_string': None,
+                'optional_bytes': 'd29ybGQ=',
+                'optional_bigint': None,
+                'optional_integer': 2,
+                'optional_float': 1.5,
+                'optional_datetime': None,
+                'optional_decimal': '0.1',
+            },
+        ),
+        (
+            models.User,
+            {
+                'id': 'u1',
+                'name': 'Robert',
+                'email': None,
+                'created_at': '2022-11-10T16:53:25.584Z',
+                'profile': None,
+                'posts': [
+                    {
+                        'id': 'p1',
+                        'created_at': '2022-11-10T16:53:25.584Z',
+                        'updated_at': '2022-11-10T16:53:25+02:00',
+                        'title': 'Hello',
+                        'published': True,
+                        'views': 0,
+                        'desc': None,
+                        'author_id': 'u1',
+                        'categories': [{'id': 1, 'name': 'foo'}],
+                    },
+                ],
+            },
+        ),
+    ],
+)
+def test_generated_hydrators(model: type[BaseModel], data: Dict[str, Any]) -> None:
+    """The functions generated for each model create the same models as pydantic"""
+    assert_same_model(HYDRATORS[model](data), model_parse(model, data))
+
+
+def test_hydrator_is_cached() -> None:
+    assert get_hydrator(User) is get_hydrator(User)
+
+
+@pytest.mark.asyncio
+async def test_find_many_without_validation(client: Prisma) -> None:
+    """The results of queries are the same whether or not they are validated"""
+    user = await client.user.create(
+        data={
+            'name': 'Robert',
+            'posts': {
+                'create': [
+                    {'title': 'Hello', 'published': True},
+                    {'title': 'World', 'published': False, 'desc': 'foo'},
+                ],
+            },
+        },
+    )
+
+    validated = await client.user.find_many(include={'posts': True})
+    hydrated = await client.user.find_many(include={'posts': True}, validate=False)
+    assert hydrated == validated
+
+    found = await client.user.find_unique(where={'id': user.id}, include={'posts': True}, validate=False)
+    assert found == validated[0]
+
+    trusted = client._copy()
+    trusted._validate_results = False
+    assert await trusted.user.find_many(include={'posts': True}) == validated
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import decimal
+import datetime
+from typing import Any
+
+import pytest
+from inline_snapshot import snapshot
+
+from prisma import PrismaMethod, fields, models
+from prisma.metadata import PRISMA_MODELS, RELATIONAL_FIELD_MAPPINGS
+from prisma._json_builder import JsonQueryBuilder, deserialize_json_response
+
+
+def build_request(
+    method: PrismaMethod,
+    arguments: dict[str, Any],
+    **kwargs: Any,
+) -> dict[str, Any]:
+    return JsonQueryBuilder(
+        method=method,
+        arguments=arguments,
+        **kwargs,
+        prisma_models=PRISMA_MODELS,
+        relational_field_mappings=RELATIONAL_FIELD_MAPPINGS,
+    ).build_request()
+
+
+def test_basic_building() -> None:
+    """Standard builder usage with and without a model"""
+    request = build_request(
+        method='find_unique',
+        model=models.User,
+        arguments={'where': {'id': '1'}, 'take': None},
+    )
+    assert request == snapshot(
+        {
+            'modelName': 'User',
+            'action': 'findUnique',
+            'query': {
+                'arguments': {'where': {'id': '1'}},
+                'selection': {'id': True, 'name': True, 'email': True, 'created_at': True},
+            },
+        }
+    )
+
+    request = build_request(
+        method='query_raw',
+        arguments={'query': 'SELECT * FROM User where id = $1', 'parameters': ['1263526']},
+    )
+    assert request == snapshot(
+        {
+            'action': 'queryRaw',
+            'query': {
+                'arguments': {'query': 'SELECT * FROM User where id = $1', 'parameters': '["1263526"]'},
+                'selection': {},
+            },
+        }
+    )
+
+
+def test_include() -> None:
+    """Included relations are nested selections with their own arguments"""
+    request = build_request(
+        method='find_many',
+        model=models.User,
+        arguments={
+            'include': {
+                'profile': True,
+                'posts': {
+                    'where': {'published': True},
+                    'take': None,
+                    'include': {'categories': True, 'author': False},
+                },
+            },
+        },
+    )
+    assert request['query']['selection'] == snapshot(
+        {
+            'id': True,
+            'name': True,
+            'email': True,
+            'created_at': True,
+            'profile': {
+                'selection': {
+                    'id': True,
+                    'user_id': True,
+                    'bio': True,
+                    'city': True,
+                    'country': True,
+                    'views': True,
+                },
+            },
+            'posts': {
+                'arguments': {'where': {'published': True}},
+                'selection': {
+                    'id': True,
+                    'created_at': True,
+                    'updated_at': True,
+                    'title': True,
+                    'published': True,
+                    'views': True,
+                    'desc': True,
+                    'author_id': True,
+                    'categories': {'selection': {'id': True, 'name': True}},
+                },
+            },
+        }
+    )
+
+    with pytest.raises(TypeError, match='Expected `bool` or `dict` include value'):
+        build_request(method='find_many', model=models.User, arguments={'include': {'posts': 1}})
+
+
+def test_root_selection() -> None:
+    """GraphQL style root selections are converted to nested selections"""
+    request = build_request(
+        method='group_by',
+        model=models.Post,
+        arguments={'by': ['title']},
+        root_selection=['title', '_sum { views }', '_count { _all }'],
+    )
+    assert request['query'] == snapshot(
+        {
+            'arguments': {'by': ['title']},
+            'selection': {
+                'title': True,
+                '_sum': {'selection': {'views': True}},
+                '_count': {'selection': {'_all': True}},
+            },
+        }
+    )
+
+
+def test_tagged_values() -> None:
+    """Values that are not natively supported by JSON are tagged with their type"""
+    request = build_request(
+        method='create',
+        model=models.Post,
+        arguments={
+            'data': {
+                'created_at': datetime.datetime(2022, 1, 1, 10, 0, 0, 123456),
+                'desc': fields.Json({'foo': [1, None]}),
+                'title': fields.Base64.encode(b'foo'),
+                'views': decimal.Decimal('1.5'),
+                'published': None,
+            },
+        },
+    )
+    assert request['query']['arguments'] == snapshot(
+        {
+            'data': {
+                'created_at': {'$type': 'DateTime', 'value': '2022-01-01T10:00:00.123000+00:00'},
+                'desc': {'$type': 'Json', 'value': '{"foo": [1, null]}'},
+                'title': {'$type': 'Bytes', 'value': 'Zm9v'},
+                'views': {'$type': 'Decimal', 'value': '1.5'},
+                'published': None,
+            }
+        }
+    )
+
+
+def test_build_batch() -> None:
+    """Batched requests only include a transaction when requested"""
+    assert JsonQueryBuilder.build_batch_payload([{'action': 'findMany'}]) == {
+        'batch': [{'action': 'findMany'}],
+        'transaction': {},
+    }
+    assert JsonQueryBuilder.build_batch_payload([], transaction=False) == {'batch': []}
+
+
+def test_deserialize_response() -> None:
+    """Responses are unpacked to the GraphQL response shape and tagged values are replaced"""
+    data = {
+        'data': {
+            'findManyUser': [
+                {
+                    'id': '1',
+                    'created_at': {'$type': 'DateTime', 'value': '2022-01-01T10:00:00.000Z'},
+                    'posts': [{'views': {'$type': 'BigInt', 'value': '1'}}],
+                },
+            ],
+        },
+    }
+    assert deserialize_json_response(data) == snapshot(
+        {
+            'data': {
+                'result': [
+                    {
+                        'id': '1',
+                        'created_at': '2022-01-01T10:00:00.000Z',
+                        'posts': [{'views': '1'}],
+                    },
+                ],
+            },
+        }
+    )
+
+    # raw results describe their own types and are left as-is
+    raw = {'columns': ['foo'], 'types': ['json'], 'rows': [[{'$type': 'Json', 'value': 1}]]}
+    assert deserialize_json_response({'data': {'queryRaw': raw}}, raw=True) == {'data': {'result': raw}}
+    assert deserialize_json_response({'data': {'queryRaw': json.dumps(raw)}}, raw=True) == {'data': {'result': raw}}
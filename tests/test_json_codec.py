@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import decimal
+import datetime
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from prisma import fields
+from prisma._builder import dumps
+from prisma._json_codec import (
+    JsonCodec,
+    OrjsonJsonCodec,
+    StdlibJsonCodec,
+    MsgspecJsonCodec,
+    get_json_codec,
+)
+
+if TYPE_CHECKING:
+    from _pytest.monkeypatch import MonkeyPatch
+
+PAYLOAD: dict[str, Any] = {
+    'query': 'query{result:findUniqueUser(where:{id:"1"}){id name}}',
+    'variables': {},
+    'values': [1, 2.5, None, True, '❤'],
+    'decimal': decimal.Decimal('1.123456789123456789'),
+    'json': fields.Json({'foo': ['bar', 1]}),
+    'bytes': fields.Base64.encode(b'foo'),
+}
+
+
+def test_stdlib_output_unchanged() -> None:
+    """The stdlib codec produces the exact same output as the builder"""
+    payload = {**PAYLOAD, 'datetime': datetime.datetime(2022, 1, 1, 10, 0, 0, 123456)}
+    codec = StdlibJsonCodec()
+    assert codec.dumps(payload) == dumps(payload)
+    assert codec.loads(dumps(payload).encode('utf-8')) == json.loads(dumps(payload))
+
+
+@pytest.mark.parametrize('name', ['orjson', 'msgspec'])
+def test_codec_equivalent(name: str) -> None:
+    """Optional codecs serialize our custom types the same as the stdlib codec"""
+    pytest.importorskip(name)
+
+    codec = get_json_codec(name)  # type: ignore[arg-type]
+    data = codec.dumps(PAYLOAD)
+    assert isinstance(data, bytes)
+    assert json.loads(data) == json.loads(dumps(PAYLOAD))
+    assert codec.loads(data) == json.loads(dumps(PAYLOAD))
+    assert codec.loads(dumps(PAYLOAD)) == json.loads(dumps(PAYLOAD))
+
+
+@pytest.mark.parametrize('name', ['stdlib', 'orjson', 'msgspec'])
+@pytest.mark.parametrize(
+    'value',
+    [
+        datetime.datetime(2022, 1, 1, 10, 0, 0, 123456),
+        datetime.datetime(2022, 1, 1, 10, 0, 0, 123456, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        decimal.Decimal('1.123456789123456789'),
+        fields.Json({'foo': ['bar', 1]}),
+        2**70,
+        -(2**70),
+    ],
+    ids=['datetime', 'datetime-tz', 'decimal', 'json', 'bigint', 'negative-bigint'],
+)
+def test_codec_identical_output(name: str, value: Any) -> None:
+    """Every codec produces the same output as the stdlib codec for the types that we serialize ourselves"""
+    if name != 'stdlib':
+        pytest.importorskip(name)
+
+    codec = get_json_codec(name)  # type: ignore[arg-type]
+    data = codec.dumps(value)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    assert data == dumps(value).encode('utf-8')
+
+    # values within containers are serialized the same but whitespace may differ
+    nested = {'data': {'values': [value, (value,)]}}
+    assert json.loads(codec.dumps(nested)) == json.loads(dumps(nested))
+
+
+def test_orjson_datetime() -> None:
+    """Datetimes are formatted by our own serializer when using orjson"""
+    pytest.importorskip('orjson')
+
+    dt = datetime.datetime(2022, 1, 1, 10, 0, 0, 123456)
+    codec = OrjsonJsonCodec()
+    assert json.loads(codec.dumps({'dt': dt})) == json.loads(dumps({'dt': dt}))
+
+
+def test_get_json_codec() -> None:
+    """Codecs can be resolved by name or passed through directly"""
+    assert isinstance(get_json_codec('stdlib'), StdlibJsonCodec)
+
+    codec = StdlibJsonCodec()
+    assert get_json_codec(codec) is codec
+
+    auto = get_json_codec('auto')
+    assert isinstance(auto, JsonCodec)
+    assert isinstance(auto, (StdlibJsonCodec, OrjsonJsonCodec, MsgspecJsonCodec))
+
+    with pytest.raises(ValueError, match='Unknown JSON codec'):
+        get_json_codec('foo')  # type: ignore[arg-type]
+
+
+def test_missing_dependency(monkeypatch: MonkeyPatch) -> None:
+    """An error is raised when the codec library is not installed"""
+    monkeypatch.setattr('prisma._json_codec.orjson', None)
+    monkeypatch.setattr('prisma._json_codec.msgspec', None)
+
+    with pytest.raises(RuntimeError, match='requires the `orjson` package'):
+        get_json_codec('orjson')
+
+    with pytest.raises(RuntimeError, match='requires the `msgspec` package'):
+        get_json_codec('msgspec')
+
+    assert isinstance(get_json_codec('auto'), StdlibJsonCodec)
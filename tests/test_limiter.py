@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List
+from pathlib import Path
+from datetime import timedelta
+
+import pytest
+
+from prisma import Prisma
+from prisma.engine import AsyncQueryEngine
+from prisma.errors import QueryQueueFullError, QueryQueueTimeoutError
+from prisma.limits import AIMDLimit, FixedLimit
+from prisma._limiter import ConcurrencyLimiter
+
+
+async def hold(limiter: ConcurrencyLimiter, order: List[int], index: int, event: asyncio.Event) -> None:
+    await limiter.acquire()
+    order.append(index)
+    try:
+        await event.wait()
+    finally:
+        limiter.release()
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight() -> None:
+    """Queries are sent in the order that they were made once there is capacity"""
+    limiter = ConcurrencyLimiter({'max_in_flight': 2})
+    order: List[int] = []
+    event = asyncio.Event()
+
+    tasks = [asyncio.ensure_future(hold(limiter, order, index, event)) for index in range(5)]
+    await asyncio.sleep(0.01)
+    assert order == [0, 1]
+
+    stats = limiter.stats()
+    assert stats.in_flight == 2
+    assert stats.queued == 3
+
+    event.set()
+    await asyncio.gather(*tasks)
+    assert order == [0, 1, 2, 3, 4]
+
+    stats = limiter.stats()
+    assert stats.in_flight == 0
+    assert stats.queued == 0
+    assert stats.acquired == 5
+
+
+@pytest.mark.asyncio
+async def test_queue_full() -> None:
+    limiter = ConcurrencyLimiter({'max_in_flight': 1, 'max_queue_length': 1})
+    event = asyncio.Event()
+    order: List[int] = []
+
+    tasks = [asyncio.ensure_future(hold(limiter, order, index, event)) for index in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(QueryQueueFullError) as exc:
+        await limiter.acquire()
+
+    assert exc.value.max_queue_length == 1
+    assert limiter.stats().rejected == 1
+
+    event.set()
+    await asyncio.gather(*tasks)
+    assert order == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout() -> None:
+    limiter = ConcurrencyLimiter({'max_in_flight': 1, 'queue_timeout': timedelta(milliseconds=10)})
+    await limiter.acquire()
+
+    with pytest.raises(QueryQueueTimeoutError) as exc:
+        await limiter.acquire()
+
+    assert exc.value.timeout == 0.01
+
+    stats = limiter.stats()
+    assert stats.timed_out == 1
+    assert stats.queued == 0
+    assert stats.in_flight == 1
+
+    # the slot is not lost
+    limiter.release()
+    await limiter.acquire()
+    assert limiter.stats().in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter() -> None:
+    """Cancelled queries are removed from the queue and do not take a slot"""
+    limiter = ConcurrencyLimiter({'max_in_flight': 1})
+    await limiter.acquire()
+
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.stats().queued == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.stats().queued == 0
+    limiter.release()
+    assert limiter.stats().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_after_handoff() -> None:
+    """A slot that was handed to a cancelled query is passed on to the next query"""
+    limiter = ConcurrencyLimiter({'max_in_flight': 1})
+    await limiter.acquire()
+
+    first = asyncio.ensure_future(limiter.acquire())
+    second = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.release()
+    first.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    await second
+    stats = limiter.stats()
+    assert stats.in_flight == 1
+    assert stats.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_histograms() -> None:
+    limiter = ConcurrencyLimiter({'max_in_flight': 1})
+    event = asyncio.Event()
+    order: List[int] = []
+
+    tasks = [asyncio.ensure_future(hold(limiter, order, index, event)) for index in range(3)]
+    await asyncio.sleep(0.01)
+    event.set()
+    await asyncio.gather(*tasks)
+
+    stats = limiter.stats()
+    assert stats.queue_depth.count == 3
+    assert stats.queue_depth.sum == 0 + 0 + 1
+    assert [bucket.total_count for bucket in stats.queue_depth.buckets][:2] == [2, 1]
+
+    assert stats.wait_time.count == 3
+    assert stats.wait_time.buckets[0].total_count >= 1
+    assert stats.wait_time.buckets[-1].max_value == float('inf')
+    assert sum(bucket.total_count for bucket in stats.wait_time.buckets) == 3
+
+
+def test_invalid_config() -> None:
+    with pytest.raises(ValueError, match='max_in_flight'):
+        ConcurrencyLimiter({'max_in_flight': 0})
+
+    with pytest.raises(ValueError, match='max_queue_length'):
+        ConcurrencyLimiter({'max_in_flight': 1, 'max_queue_length': -1})
+
+    with pytest.raises(ValueError, match='Expected either'):
+        ConcurrencyLimiter({})
+
+    with pytest.raises(ValueError, match='cannot be used together'):
+        ConcurrencyLimiter({'max_in_flight': 1, 'algorithm': FixedLimit(1)})
+
+
+@pytest.mark.asyncio
+async def test_limit_increase_wakes_waiters() -> None:
+    """Every query that fits within a raised limit is sent straight away"""
+    limiter = ConcurrencyLimiter({'algorithm': AIMDLimit(initial_limit=1, max_limit=10)})
+    await limiter.acquire()
+
+    waiters = [asyncio.ensure_future(limiter.acquire()) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    # the first query is always used to grow the limit
+    limiter.release(rtt=0.01)
+    await asyncio.gather(*waiters)
+    assert limiter.stats().in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_gauges() -> None:
+    limiter = ConcurrencyLimiter({'max_in_flight': 2})
+    await limiter.acquire()
+
+    gauges = {gauge.key: gauge for gauge in limiter.gauges({'service': 'api'})}
+    assert gauges['prisma_client_queries_limit'].value == 2
+    assert gauges['prisma_client_queries_in_flight'].value == 1
+    assert gauges['prisma_client_queries_queued'].value == 0
+    assert gauges['prisma_client_queries_limit'].labels == {'service': 'api'}
+
+    text = limiter.prometheus_gauges({'service': 'api'})
+    assert '# TYPE prisma_client_queries_limit gauge\n' in text
+    assert 'prisma_client_queries_in_flight{service="api"} 1\n' in text
+    assert limiter.prometheus_gauges().splitlines()[2] == 'prisma_client_queries_limit 2'
+
+
+@pytest.mark.asyncio
+async def test_engine_transactions_are_not_limited() -> None:
+    """Queries within a transaction bypass the limiter so that they cannot deadlock"""
+    limiter = ConcurrencyLimiter({'max_in_flight': 1})
+    engine = AsyncQueryEngine(dml_path=Path('schema.prisma'), limiter=limiter)
+    event = asyncio.Event()
+    sent: List[Any] = []
+
+    async def request(method: str, path: str, **kwargs: Any) -> Any:
+        sent.append(kwargs['headers'])
+        await event.wait()
+        return {'data': {'result': None}}
+
+    engine.request = request  # type: ignore[method-assign]
+
+    first = asyncio.ensure_future(engine.query('{}', tx_id=None))
+    second = asyncio.ensure_future(engine.query('{}', tx_id=None))
+    in_tx = asyncio.ensure_future(engine.query('{}', tx_id='tx'))  # type: ignore[arg-type]
+    await asyncio.sleep(0.01)
+
+    assert sent == [{}, {'X-transaction-id': 'tx'}]
+    assert limiter.stats().queued == 1
+
+    event.set()
+    await asyncio.gather(first, second, in_tx)
+    assert len(sent) == 3
+    assert limiter.stats().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_client_concurrency_limit(client: Prisma) -> None:
+    limited = Prisma(concurrency_limit=2)
+    assert client.get_limiter_stats() is None
+    await limited.connect()
+
+    try:
+        await asyncio.gather(*[limited.user.create({'name': 'Robert'}) for _ in range(5)])
+        assert await limited.user.count() == 5
+
+        stats = limited.get_limiter_stats()
+        assert stats is not None
+        assert stats.max_in_flight == 2
+        assert stats.acquired == 6
+        assert stats.in_flight == 0
+    finally:
+        await limited.disconnect()
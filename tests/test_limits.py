@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List, Callable
+from pathlib import Path
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from prisma.engine import AsyncQueryEngine
+from prisma.limits import AIMDLimit, FixedLimit, LimitSample, GradientLimit, LimitAlgorithm
+from prisma._limiter import ConcurrencyLimiter
+
+
+class FakeEngine:
+    """Simulates a database with a fixed number of connections.
+
+    Queries take `latency` seconds until there are more queries in flight than connections,
+    after which the latency grows in proportion as queries have to wait for a connection.
+    """
+
+    def __init__(self, *, connections: int = 10, latency: float = 0.01, timeout: float | None = None) -> None:
+        self.connections = connections
+        self.latency = latency
+        self.timeout = timeout
+        self.slowdown = 1.0
+
+    def rtt(self, in_flight: int) -> float:
+        return self.latency * self.slowdown * max(1, in_flight / self.connections)
+
+    def sample(self, in_flight: int) -> LimitSample:
+        rtt = self.rtt(in_flight)
+        if self.timeout is not None and rtt > self.timeout:
+            return LimitSample(rtt=self.timeout, in_flight=in_flight, dropped=True)
+        return LimitSample(rtt=rtt, in_flight=in_flight, dropped=False)
+
+
+def simulate(
+    algorithm: LimitAlgorithm,
+    engine: FakeEngine,
+    *,
+    steps: int,
+    demand: int = 1000,
+    on_step: Callable[[int], None] | None = None,
+) -> List[int]:
+    """Send a query whenever the limit allows it, with `demand` queries always waiting to be sent"""
+    limits: List[int] = []
+    for step in range(steps):
+        if on_step is not None:
+            on_step(step)
+
+        algorithm.update(engine.sample(min(demand, algorithm.limit)))
+        limits.append(algorithm.limit)
+
+    return limits
+
+
+def test_fixed_limit() -> None:
+    limit = FixedLimit(5)
+    assert simulate(limit, FakeEngine(timeout=0.02), steps=100)[-1] == 5
+
+
+def test_aimd_grows_while_healthy() -> None:
+    """The limit grows by one for every successful query up to the maximum"""
+    limit = AIMDLimit(initial_limit=5, max_limit=50)
+    limits = simulate(limit, FakeEngine(), steps=100)
+    assert limits[:3] == [6, 7, 8]
+    assert limits[-1] == 50
+
+
+def test_aimd_backs_off_on_timeouts() -> None:
+    """The limit oscillates just below the point where queries start timing out"""
+    engine = FakeEngine(connections=10, latency=0.01)
+    limit = AIMDLimit(initial_limit=5, max_limit=100, timeout=timedelta(milliseconds=30))
+    limits = simulate(limit, engine, steps=500)
+
+    # queries take longer than 30ms once there are more than 30 in flight
+    assert max(limits[100:]) <= 31
+    assert min(limits[100:]) >= 27
+
+
+def test_aimd_dropped_queries() -> None:
+    engine = FakeEngine(connections=10, latency=0.01, timeout=0.02)
+    limit = AIMDLimit(initial_limit=100, max_limit=100, backoff_ratio=0.5)
+    limits = simulate(limit, engine, steps=10)
+    assert limits[:3] == [50, 25, 12]
+    assert max(limits[3:]) <= 20
+
+
+def test_aimd_app_limited() -> None:
+    """The limit does not grow when it isn't being used"""
+    limit = AIMDLimit(initial_limit=20, max_limit=100)
+    assert simulate(limit, FakeEngine(), steps=100, demand=5)[-1] == 20
+
+
+def test_gradient_latency_spike() -> None:
+    """The limit is reduced when the database slows down and grows again once it recovers"""
+    engine = FakeEngine(connections=10, latency=0.01)
+    limit = GradientLimit(initial_limit=20, max_limit=200)
+
+    before = simulate(limit, engine, steps=500)[-1]
+    assert before > 20
+
+    def slowdown(step: int) -> None:
+        engine.slowdown = 4 if step < 100 else 1
+
+    limits = simulate(limit, engine, steps=1100, on_step=slowdown)
+    during = limits[99]
+    assert during < before / 2
+    assert limits[-1] > during * 2
+
+
+def test_gradient_dropped_queries() -> None:
+    engine = FakeEngine(connections=10, latency=0.01, timeout=0.05)
+    limit = GradientLimit(initial_limit=20, max_limit=200)
+    limits = simulate(limit, engine, steps=2000)
+
+    # queries time out once there are more than 50 in flight
+    assert max(limits[500:]) <= 55
+
+
+def test_gradient_app_limited() -> None:
+    limit = GradientLimit(initial_limit=20, max_limit=200)
+    assert simulate(limit, FakeEngine(), steps=100, demand=5)[-1] == 20
+
+
+def test_gradient_bounds() -> None:
+    engine = FakeEngine(connections=1, latency=0.01)
+    limit = GradientLimit(initial_limit=10, min_limit=5, max_limit=10)
+    engine.slowdown = 100
+    assert min(simulate(limit, engine, steps=200)) >= 5
+
+
+def test_invalid_options() -> None:
+    with pytest.raises(ValueError, match='min_limit'):
+        AIMDLimit(min_limit=0)
+
+    with pytest.raises(ValueError, match='max_limit'):
+        AIMDLimit(min_limit=10, max_limit=5, initial_limit=10)
+
+    with pytest.raises(ValueError, match='initial_limit'):
+        GradientLimit(initial_limit=500, max_limit=200)
+
+    with pytest.raises(ValueError, match='backoff_ratio'):
+        AIMDLimit(backoff_ratio=1.5)
+
+    with pytest.raises(ValueError, match='smoothing'):
+        GradientLimit(smoothing=0)
+
+    with pytest.raises(ValueError, match='limit'):
+        FixedLimit(0)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_engine() -> None:
+    """The limit is adjusted from the latency of queries sent through the query engine"""
+    connections = 5
+    active = 0
+    peak_after_warmup = 0
+    sent = 0
+
+    async def request(method: str, path: str, **kwargs: Any) -> Any:
+        nonlocal active, sent, peak_after_warmup
+        active += 1
+        sent += 1
+        if sent > 100:
+            peak_after_warmup = max(peak_after_warmup, active)
+
+        try:
+            await asyncio.sleep(0.001)
+            if active > connections:
+                raise httpx.ReadTimeout('Timed out')
+            return {'data': {'result': None}}
+        finally:
+            active -= 1
+
+    limiter = ConcurrencyLimiter({'algorithm': AIMDLimit(initial_limit=20, backoff_ratio=0.5)})
+    engine = AsyncQueryEngine(dml_path=Path('schema.prisma'), limiter=limiter)
+    engine.request = request  # type: ignore[method-assign]
+
+    async def query() -> None:
+        for _ in range(20):
+            try:
+                await engine.query('{}', tx_id=None)
+            except httpx.ReadTimeout:
+                pass
+
+    await asyncio.gather(*[query() for _ in range(20)])
+
+    stats = limiter.stats()
+    assert stats.dropped > 0
+    assert stats.in_flight == 0
+    assert stats.max_in_flight <= connections + 1
+    assert peak_after_warmup <= connections * 2
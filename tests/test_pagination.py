@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import time
+import asyncio
+import threading
+from typing import Any, Dict, List, Mapping, Optional
+
+import pytest
+
+from prisma._pagination import iter_pages, aiter_pages
+
+
+class Record:
+    def __init__(self, id: int) -> None:
+        self.id = id
+
+    def __repr__(self) -> str:
+        return f'Record({self.id})'
+
+
+class FakeTable:
+    """Mimics `find_many()` for a table of records with ids from 1 to `size`"""
+
+    def __init__(self, size: int, *, latency: float = 0) -> None:
+        self.records = [Record(i) for i in range(1, size + 1)]
+        self.latency = latency
+        self.calls: List[Optional[Mapping[str, Any]]] = []
+
+    def _find(self, where: Optional[Mapping[str, Any]], order: Dict[str, Any], take: int) -> List[Record]:
+        self.calls.append(where)
+
+        records = self.records
+        if order == {'id': 'desc'}:
+            records = list(reversed(records))
+        else:
+            assert order == {'id': 'asc'}
+
+        conditions = where['AND'] if where and 'AND' in where else [where] if where else []
+        for condition in conditions:
+            if 'id' not in condition:
+                assert condition == {'published': True}
+                continue
+
+            bounds = condition['id']
+            if 'gt' in bounds:
+                records = [r for r in records if r.id > bounds['gt']]
+            else:
+                records = [r for r in records if r.id < bounds['lt']]
+
+        return records[:take]
+
+    def find(self, where: Optional[Mapping[str, Any]], order: Dict[str, Any], take: int) -> List[Record]:
+        time.sleep(self.latency)
+        return self._find(where, order, take)
+
+    async def afind(self, where: Optional[Mapping[str, Any]], order: Dict[str, Any], take: int) -> List[Record]:
+        await asyncio.sleep(self.latency)
+        return self._find(where, order, take)
+
+
+@pytest.mark.parametrize('prefetch', [0, 1, 3])
+@pytest.mark.parametrize('size', [0, 9, 10, 11])
+def test_iter_pages(size: int, prefetch: int) -> None:
+    """Every record is yielded exactly once in key order"""
+    table = FakeTable(size)
+    records = list(iter_pages(table.find, where=None, key='id', page_size=5, prefetch=prefetch))
+    assert [r.id for r in records] == list(range(1, size + 1))
+
+    # an extra query is only required when the last page is full
+    assert len(table.calls) == size // 5 + 1
+    assert table.calls[0] is None
+    if size > 5:
+        assert table.calls[1] == {'id': {'gt': 5}}
+
+
+def test_iter_pages_where_and_order() -> None:
+    """The given filter is combined with the keyset filter"""
+    table = FakeTable(7)
+    records = list(iter_pages(table.find, where={'published': True}, key='id', order='desc', page_size=3))
+    assert [r.id for r in records] == [7, 6, 5, 4, 3, 2, 1]
+    assert table.calls == [
+        {'published': True},
+        {'AND': [{'published': True}, {'id': {'lt': 5}}]},
+        {'AND': [{'published': True}, {'id': {'lt': 2}}]},
+    ]
+
+
+def test_iter_pages_prefetches() -> None:
+    """The next page is fetched while the current page is being processed"""
+    table = FakeTable(20, latency=0.05)
+    start = time.monotonic()
+    for _ in iter_pages(table.find, where=None, key='id', page_size=5, prefetch=1):
+        time.sleep(0.01)
+
+    # 5 queries + 20 * 0.01s of processing would take at least 0.45s without overlapping
+    assert time.monotonic() - start < 0.4
+
+
+def test_iter_pages_stops_early() -> None:
+    """The background thread stops fetching when the iterator is closed"""
+    table = FakeTable(1000)
+    iterator = iter_pages(table.find, where=None, key='id', page_size=5, prefetch=2)
+    assert next(iterator).id == 1
+    iterator.close()  # type: ignore[attr-defined]
+
+    time.sleep(0.3)
+    calls = len(table.calls)
+    assert calls <= 4
+    assert not any(t.name == 'prisma-page-prefetch' for t in threading.enumerate())
+
+
+def test_iter_pages_error() -> None:
+    """Errors raised while fetching are raised to the caller"""
+
+    def fetch(where: Any, order: Any, take: int) -> List[Record]:
+        if where is not None:
+            raise RuntimeError('boom')
+        return [Record(1), Record(2)]
+
+    iterator = iter_pages(fetch, where=None, key='id', page_size=2)
+    assert [next(iterator).id, next(iterator).id] == [1, 2]
+    with pytest.raises(RuntimeError, match='boom'):
+        next(iterator)
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match='page_size'):
+        next(iter_pages(FakeTable(1).find, where=None, key='id', page_size=0))
+
+    with pytest.raises(ValueError, match='prefetch'):
+        next(iter_pages(FakeTable(1).find, where=None, key='id', prefetch=-1))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('prefetch', [0, 1, 3])
+async def test_aiter_pages(prefetch: int) -> None:
+    table = FakeTable(11)
+    records = [r async for r in aiter_pages(table.afind, where=None, key='id', page_size=5, prefetch=prefetch)]
+    assert [r.id for r in records] == list(range(1, 12))
+    assert table.calls == [None, {'id': {'gt': 5}}, {'id': {'gt': 10}}]
+
+
+@pytest.mark.asyncio
+async def test_aiter_pages_prefetches() -> None:
+    table = FakeTable(20, latency=0.05)
+    start = time.monotonic()
+    async for _ in aiter_pages(table.afind, where=None, key='id', page_size=5, prefetch=1):
+        await asyncio.sleep(0.01)
+
+    assert time.monotonic() - start < 0.4
+
+
+@pytest.mark.asyncio
+async def test_aiter_pages_stops_early() -> None:
+    """The background task is cancelled when the iterator is closed"""
+    table = FakeTable(1000, latency=0.01)
+    iterator = aiter_pages(table.afind, where=None, key='id', page_size=5, prefetch=2)
+    assert (await iterator.__anext__()).id == 1
+    await iterator.aclose()  # type: ignore[attr-defined]
+
+    calls = len(table.calls)
+    await asyncio.sleep(0.1)
+    assert len(table.calls) == calls
+
+
+@pytest.mark.asyncio
+async def test_aiter_pages_error() -> None:
+    async def fetch(where: Any, order: Any, take: int) -> List[Record]:
+        if where is not None:
+            raise RuntimeError('boom')
+        return [Record(1), Record(2)]
+
+    with pytest.raises(RuntimeError, match='boom'):
+        async for _ in aiter_pages(fetch, where=None, key='id', page_size=2):
+            pass
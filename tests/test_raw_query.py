@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from prisma.fields import Json
+from prisma._raw_query import _get_row_deserializer, deserialize_raw_results
+
+
+class Row(BaseModel):
+    id: int
+    total: int
+    meta: Json
+    scores: Optional[List[int]] = None
+
+
+def test_deserialize() -> None:
+    results = deserialize_raw_results(
+        {
+            'columns': ['id', 'total', 'balance', 'meta', 'scores', 'tags'],
+            'types': ['int', 'bigint', 'decimal', 'json', 'bigint-array', 'string-array'],
+            'rows': [
+                [1, '9223372036854775807', '1.5', {'foo': 1}, ['1', '2'], ['a']],
+                [2, None, None, None, None, None],
+            ],
+        }
+    )
+    assert results == [
+        {
+            'id': 1,
+            'total': 9223372036854775807,
+            'balance': 1.5,
+            'meta': {'foo': 1},
+            'scores': [1, 2],
+            'tags': ['a'],
+        },
+        {
+            'id': 2,
+            'total': None,
+            'balance': None,
+            'meta': None,
+            'scores': None,
+            'tags': None,
+        },
+    ]
+
+
+def test_deserialize_model() -> None:
+    results = deserialize_raw_results(
+        {
+            'columns': ['id', 'total', 'meta', 'scores'],
+            'types': ['int', 'bigint', 'json', 'bigint-array'],
+            'rows': [[1, '2', {'foo': [1]}, ['3']]],
+        },
+        Row,
+    )
+    assert len(results) == 1
+    assert isinstance(results[0], Row)
+    assert results[0].total == 2
+    assert results[0].meta == {'foo': [1]}
+    assert results[0].scores == [3]
+
+
+def test_duplicate_columns() -> None:
+    """The last value of a column that is returned more than once is used"""
+    results = deserialize_raw_results(
+        {
+            'columns': ['id', 'id'],
+            'types': ['bigint', 'string'],
+            'rows': [['1', 'foo']],
+        }
+    )
+    assert results == [{'id': 'foo'}]
+
+
+def test_invalid_array() -> None:
+    with pytest.raises(TypeError, match='Expected array data for scores column with internal type int-array'):
+        deserialize_raw_results(
+            {
+                'columns': ['scores'],
+                'types': ['int-array'],
+                'rows': [[1]],
+            }
+        )
+
+
+def test_deserializer_is_cached() -> None:
+    columns = ('id', 'total')
+    types = ('int', 'bigint')
+    assert _get_row_deserializer(columns, types, for_model=False) is _get_row_deserializer(
+        columns, types, for_model=False
+    )
+    assert _get_row_deserializer(columns, types, for_model=False) is not _get_row_deserializer(
+        columns, types, for_model=True
+    )
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import enum
+import datetime
+from typing import Any, Dict, List, Optional
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from prisma import Prisma
+from prisma._compat import PYDANTIC_V2, ConfigDict, root_validator, field_validator
+from prisma._records import LazyRecord, get_record_class
+
+
+class _Model(BaseModel):
+    # mirrors the configuration of the generated models
+    if PYDANTIC_V2:
+        model_config = ConfigDict(
+            use_enum_values=True,
+            arbitrary_types_allowed=True,
+            populate_by_name=True,
+        )
+    else:
+
+        class Config:
+            use_enum_values = True
+            arbitrary_types_allowed = True
+            allow_population_by_field_name = True
+
+
+class Role(str, enum.Enum):
+    USER = 'USER'
+    ADMIN = 'ADMIN'
+
+
+class Post(_Model):
+    id: str
+    title: str
+    created_at: datetime.datetime
+
+
+class User(_Model):
+    id: str
+    name: str
+    role: Role
+    email: Optional[str] = None
+    tags: List[str]
+    posts: Optional[List[Post]] = None
+
+    @field_validator('tags', pre=True, allow_reuse=True)
+    @classmethod
+    def _transform_required_list_fields(cls, value: object) -> object:
+        if value is None:
+            return []
+        return value
+
+
+class Custom(_Model):
+    id: str
+    name: str
+
+    @field_validator('name', allow_reuse=True)
+    @classmethod
+    def uppercase_name(cls, value: str) -> str:
+        return value.upper()
+
+
+class Combined(_Model):
+    first: str
+    last: str
+
+    @root_validator(pre=True, allow_reuse=True)
+    @classmethod
+    def swap(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        return {'first': values['last'], 'last': values['first']}
+
+
+def test_fields_are_validated() -> None:
+    record = get_record_class(User)(
+        {
+            'id': 'u1',
+            'name': 'Robert',
+            'role': 'ADMIN',
+            'tags': None,
+            'posts': [{'id': 'p1', 'title': 'Hello', 'created_at': '2022-11-10T16:53:25.584Z'}],
+        }
+    )
+    assert isinstance(record, LazyRecord)
+    assert record.id == 'u1'
+    assert record.role == 'ADMIN'
+    assert record.email is None
+    assert record.tags == []
+    assert record.posts is not None
+    assert isinstance(record.posts[0], Post)
+    assert isinstance(record.posts[0].created_at, datetime.datetime)
+
+
+def test_fields_are_only_validated_once() -> None:
+    record = get_record_class(User)({'id': 'u1', 'name': 'Robert', 'role': 'USER', 'tags': ['a']})
+    assert record.tags is record.tags
+    assert not hasattr(record, '__dict__')
+
+
+def test_invalid_field() -> None:
+    """Invalid values only raise an error when the field is accessed"""
+    record = get_record_class(User)({'id': 'u1', 'name': 'Robert', 'role': 'foo', 'tags': []})
+    assert record.name == 'Robert'
+
+    with pytest.raises(ValidationError):
+        record.role  # noqa: B018
+
+
+def test_to_model() -> None:
+    data = {'id': 'u1', 'name': 'Robert', 'role': 'USER', 'tags': ['a']}
+    record = get_record_class(User)(data)
+    assert record.raw_data is data
+
+    model = record.to_model()
+    assert isinstance(model, User)
+    assert model.tags == ['a']
+    assert record.to_model() is model
+
+    # fields that have not been accessed yet are taken from the model
+    assert record.name is model.name
+
+
+def test_field_validators() -> None:
+    record = get_record_class(Custom)({'id': 'c1', 'name': 'robert'})
+    assert record.name == 'ROBERT'
+
+
+def test_root_validators() -> None:
+    """Models with validators for every field are validated at once"""
+    record = get_record_class(Combined)({'first': 'Robert', 'last': 'Craigie'})
+    assert record.first == 'Craigie'
+    assert record.last == 'Robert'
+
+
+def test_unknown_attribute() -> None:
+    record = get_record_class(Custom)({'id': 'c1', 'name': 'robert'})
+    with pytest.raises(AttributeError):
+        record.foo  # noqa: B018
+
+
+def test_record_class_is_cached() -> None:
+    assert get_record_class(User) is get_record_class(User)
+    assert get_record_class(User).__name__ == 'LazyUser'
+
+
+@pytest.mark.asyncio
+async def test_find_many_lazy(client: Prisma) -> None:
+    await client.user.create(
+        data={
+            'name': 'Robert',
+            'posts': {
+                'create': [
+                    {'title': 'Hello', 'published': True},
+                    {'title': 'World', 'published': False},
+                ],
+            },
+        },
+    )
+
+    users = await client.user.find_many(include={'posts': True})
+    records = await client.user.find_many_lazy(include={'posts': True})
+    assert len(records) == 1
+    assert records[0].name == 'Robert'
+    assert isinstance(records[0].created_at, datetime.datetime)
+    assert records[0].to_model() == users[0]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from prisma import Prisma
+from prisma._types import DeduplicationStats
+from prisma._single_flight import SingleFlight
+
+
+class FakeEngine:
+    def __init__(self) -> None:
+        self.requests: List[str] = []
+        self.error: Exception | None = None
+
+    async def query(self, content: str) -> Dict[str, Any]:
+        self.requests.append(content)
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return {'data': {'result': [{'id': 1}]}}
+
+
+@pytest.mark.asyncio
+async def test_identical_queries_are_deduplicated() -> None:
+    """Identical queries made while a query is in flight wait for its response"""
+    single_flight = SingleFlight()
+    engine = FakeEngine()
+
+    results = await asyncio.gather(*[single_flight.execute('foo', lambda: engine.query('foo')) for _ in range(10)])
+    assert engine.requests == ['foo']
+    assert all(result == {'data': {'result': [{'id': 1}]}} for result in results)
+    assert single_flight.stats() == DeduplicationStats(requests=1, deduplicated=9)
+
+
+@pytest.mark.asyncio
+async def test_callers_receive_copies() -> None:
+    """Modifying the result of one caller does not affect any other callers"""
+    single_flight = SingleFlight()
+    engine = FakeEngine()
+
+    first, second = await asyncio.gather(
+        single_flight.execute('foo', lambda: engine.query('foo')),
+        single_flight.execute('foo', lambda: engine.query('foo')),
+    )
+    assert first is not second
+    first['data']['result'].clear()
+    assert second == {'data': {'result': [{'id': 1}]}}
+
+
+@pytest.mark.asyncio
+async def test_different_keys() -> None:
+    single_flight = SingleFlight()
+    engine = FakeEngine()
+
+    await asyncio.gather(
+        single_flight.execute(('foo', None), lambda: engine.query('foo')),
+        single_flight.execute(('foo', 'tx'), lambda: engine.query('foo')),
+        single_flight.execute(('bar', None), lambda: engine.query('bar')),
+    )
+    assert len(engine.requests) == 3
+    assert single_flight.stats().deduplicated == 0
+
+
+@pytest.mark.asyncio
+async def test_finished_queries_are_not_shared() -> None:
+    """Queries are only deduplicated while they are in flight"""
+    single_flight = SingleFlight()
+    engine = FakeEngine()
+
+    await single_flight.execute('foo', lambda: engine.query('foo'))
+    await single_flight.execute('foo', lambda: engine.query('foo'))
+    assert engine.requests == ['foo', 'foo']
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared() -> None:
+    single_flight = SingleFlight()
+    engine = FakeEngine()
+    engine.error = RuntimeError('boom')
+
+    results = await asyncio.gather(
+        single_flight.execute('foo', lambda: engine.query('foo')),
+        single_flight.execute('foo', lambda: engine.query('foo')),
+        return_exceptions=True,
+    )
+    assert [str(result) for result in results] == ['boom', 'boom']
+    assert len(engine.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader() -> None:
+    """Cancelling the caller that sent the query does not affect the other callers"""
+    single_flight = SingleFlight()
+    engine = FakeEngine()
+
+    leader = asyncio.ensure_future(single_flight.execute('foo', lambda: engine.query('foo')))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(single_flight.execute('foo', lambda: engine.query('foo')))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == {'data': {'result': [{'id': 1}]}}
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert engine.requests == ['foo']
+
+
+@pytest.mark.asyncio
+async def test_client_deduplication(client: Prisma) -> None:
+    """Only read queries are deduplicated by the client"""
+    deduplicated = Prisma(deduplicate_queries=True)
+    await deduplicated.connect()
+
+    try:
+        users = await asyncio.gather(*[deduplicated.user.create({'name': 'Robert'}) for _ in range(3)])
+        assert len({user.id for user in users}) == 3
+
+        results = await asyncio.gather(*[deduplicated.user.find_many(order={'name': 'asc'}) for _ in range(5)])
+        assert all(len(result) == 3 for result in results)
+        assert results[0][0] is not results[1][0]
+
+        stats = deduplicated.get_deduplication_stats()
+        assert stats.requests == 1
+        assert stats.deduplicated == 4
+    finally:
+        await deduplicated.disconnect()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from typing import Any, List
+
+import pytest
+
+from prisma._streaming import ResultStreamParser
+
+
+def feed_all(parser: ResultStreamParser, data: bytes, chunk_size: int) -> List[Any]:
+    items: List[Any] = []
+    for i in range(0, len(data), chunk_size):
+        items.extend(parser.feed(data[i : i + chunk_size]))
+    return items
+
+
+RESULTS = [
+    {'id': '1', 'title': 'Hello, [world]', 'nested': {'data': [1, 2, 3]}},
+    {'id': '2', 'title': 'Quote " and backslash \\ and unicode é☃', 'nested': None},
+    {'id': '3', 'title': '', 'nested': {'list': [{}, []]}},
+]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 1024])
+def test_chunked(chunk_size: int) -> None:
+    """Items are parsed correctly regardless of where the response is split"""
+    body = json.dumps({'data': {'result': RESULTS}}, ensure_ascii=False).encode('utf-8')
+
+    parser = ResultStreamParser()
+    assert feed_all(parser, body, chunk_size) == RESULTS
+    assert parser.items == len(RESULTS)
+    assert parser.close() is None
+
+
+def test_items_yielded_incrementally() -> None:
+    """Each item is returned as soon as it has been fully received"""
+    parser = ResultStreamParser()
+    assert parser.feed(b'{"data": {"result": [{"id": 1}, {"id"') == [{'id': 1}]
+    assert parser.feed(b': 2}') == [{'id': 2}]
+    assert parser.feed(b']}}') == []
+    assert parser.close() is None
+
+
+def test_empty_result() -> None:
+    parser = ResultStreamParser()
+    assert parser.feed(b'{"data":{"result":[]}}') == []
+    assert parser.items == 0
+    assert parser.close() is None
+
+
+def test_result_key_not_required() -> None:
+    """The result array is found regardless of the key it is stored under"""
+    parser = ResultStreamParser()
+    assert parser.feed(b'{"data": {"findManyUser": [{"id": 1}]}}') == [{'id': 1}]
+    assert parser.close() is None
+
+
+def test_tagged_values() -> None:
+    """Items using the JSON protocol encoding are returned as is"""
+    item = {'id': 1, 'createdAt': {'$type': 'DateTime', 'value': '2024-01-01T00:00:00Z'}}
+    parser = ResultStreamParser()
+    assert parser.feed(json.dumps({'data': {'result': [item]}}).encode()) == [item]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1024])
+def test_error_response(chunk_size: int) -> None:
+    """Responses without a result array are returned in full by close()"""
+    response = {'errors': [{'error': 'Something went wrong', 'user_facing_error': {'data': ['foo']}}]}
+    parser = ResultStreamParser()
+    assert feed_all(parser, json.dumps(response).encode(), chunk_size) == []
+    assert parser.close() == response
+
+
+def test_incomplete_response() -> None:
+    parser = ResultStreamParser()
+    assert parser.feed(b'{"data": {"result": [{"id": 1}, {"id": 2') == [{'id': 1}]
+
+    with pytest.raises(ValueError, match='ended unexpectedly'):
+        parser.close()
+
+
+def test_large_item_decoded_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An element split across many chunks is only decoded once it has been fully received"""
+    decoded: List[str] = []
+    decoder = json.JSONDecoder()
+
+    def decode(data: str) -> Any:
+        decoded.append(data)
+        return decoder.decode(data)
+
+    monkeypatch.setattr('prisma._streaming._decoder.decode', decode)
+
+    item = {
+        'id': '1',
+        'content': 'a "quoted" \\ value ☃ ' * 2000,
+        'tags': [{'name': f'tag {i}', 'ids': [i, [i]]} for i in range(500)],
+    }
+    body = json.dumps({'data': {'result': [item, 'foo', 12.5, None]}}, ensure_ascii=False).encode('utf-8')
+    assert len(body) > 50_000
+
+    parser = ResultStreamParser()
+    assert feed_all(parser, body, 7) == [item, 'foo', 12.5, None]
+    assert parser.close() is None
+    assert len(decoded) == 4
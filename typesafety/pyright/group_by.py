@@ -1,6 +1,5 @@
 from prisma.models import Profile
 
-
 # TODO: more tests
 
 
@@ -33,7 +32,7 @@ async def order() -> None:
     )
 
     # case: can only order by grouped fields
-    await Profile.prisma().group_by(
+    await Profile.prisma().group_by(  # E: No overloads for "group_by" match the provided arguments
         ['city'],
         order={  # E: Argument of type "dict[str, str]" cannot be assigned to parameter "order" of type "Mapping[ProfileScalarFieldKeysT@group_by, SortOrder] | List[Mapping[ProfileScalarFieldKeysT@group_by, SortOrder]] | None" in function "group_by"
             'country': 'desc',
@@ -41,9 +40,19 @@ async def order() -> None:
     )
 
     # case: invalid sort order
-    await Profile.prisma().group_by(
+    await Profile.prisma().group_by(  # E: No overloads for "group_by" match the provided arguments
         ['country'],
         order={  # E: Argument of type "dict[str, str]" cannot be assigned to parameter "order" of type "Mapping[ProfileScalarFieldKeysT@group_by, SortOrder] | List[Mapping[ProfileScalarFieldKeysT@group_by, SortOrder]] | None" in function "group_by"
             'country': 'foo',
         },
     )
+
+
+async def as_columns() -> None:
+    # case: default
+    results = await Profile.prisma().group_by(['country'])
+    reveal_type(results)  # T: List[ProfileGroupByOutput]
+
+    # case: columns
+    columns = await Profile.prisma().group_by(['country'], count=True, as_columns=True)
+    reveal_type(columns)  # T: Dict[str, Any]